@@ -1,20 +1,42 @@
 """Set up main entity."""
 
 # pylint: disable=duplicate-code
+import asyncio
 import logging
 from dataclasses import dataclass
+from functools import partial
 
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, ATTR_PRESET_MODE, HVACMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.const import ATTR_TEMPERATURE, CONF_HOST, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.const import Platform
-from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.device_registry import DeviceEntry, DeviceInfo
+from homeassistant.helpers.service import async_extract_config_entry_ids
 
 from pyrinnaitouch import RinnaiSystem
 
-from .const import DOMAIN
+from .const import (
+    CONF_DEBOUNCE,
+    CONNECT_TIMEOUT,
+    DATA_CONNECTIONS,
+    DEFAULT_DEBOUNCE,
+    DOMAIN,
+    PRESET_AUTO,
+    PRESET_MANUAL,
+    STATE_ZONES,
+    ZONE_ENABLED,
+    ZONE_IDS,
+)
+from .cache import RinnaiStatusCache
+from .coordinator import RinnaiCoordinator
+from .planner import RinnaiDesiredState, async_apply_desired_state
+from .transport import RinnaiAsyncSystem
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,48 +49,128 @@ PLATFORMS = [
     Platform.SELECT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_APPLY_STATE = "apply_state"
+PRESET_SCHEMA = vol.In([PRESET_AUTO, PRESET_MANUAL])
+ZONE_STATE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ZONE_ENABLED): cv.boolean,
+        vol.Optional(ATTR_PRESET_MODE): PRESET_SCHEMA,
+        vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+    }
+)
+APPLY_STATE_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_HVAC_MODE): vol.Coerce(HVACMode),
+        vol.Optional(ATTR_PRESET_MODE): PRESET_SCHEMA,
+        vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+        vol.Optional(STATE_ZONES): {
+            vol.All(cv.string, vol.Upper, vol.In(ZONE_IDS)): ZONE_STATE_SCHEMA
+        },
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Register the services of the integration."""
+    # pylint: disable=unused-argument
+
+    async def async_apply_state(call: ServiceCall) -> None:
+        """Bring each targeted system to the desired state, one plan per controller.
+
+        Any entity or device of a controller names it, targeting the unit
+        and its zones still applies the state once.
+        """
+        desired = RinnaiDesiredState.from_service_data(call.data)
+        entries = hass.data.get(DOMAIN, {})
+        entry_ids = [
+            entry_id
+            for entry_id in await async_extract_config_entry_ids(hass, call)
+            if entry_id in entries
+        ]
+        if not entry_ids:
+            raise HomeAssistantError("No Rinnai Touch controller targeted")
+        for entry_id in entry_ids:
+            data: RinnaiData = entries[entry_id]
+            await async_apply_desired_state(data.coordinator, desired)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_STATE, async_apply_state, schema=APPLY_STATE_SCHEMA
+    )
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up the rinnaitouch integration from a config entry."""
 
     ip_address = entry.data.get(CONF_HOST)
     _LOGGER.debug("Get controller with IP: %s", ip_address)
-    try:
-        system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        # scenes = await system.getSupportedScenes()
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, system.shutdown)
-        scenes = []
-        await hass.async_add_executor_job(system.get_status)
-    except (
-        Exception,
-        ConnectionError,
-        ConnectionRefusedError,
-    ) as err:
-        _LOGGER.error("Get controller error: %s", err)
-        raise ConfigEntryNotReady from err
+    connections = async_get_connections(hass)
+    cache = RinnaiStatusCache(hass, entry.entry_id)
+    # scenes = await system.getSupportedScenes()
+    scenes = []
+    restored = False
+    if (frame := await cache.async_load()) is None:
+        try:
+            system = await connections.async_get(ip_address)
+        except (OSError, TimeoutError) as err:
+            _LOGGER.error("Get controller error: %s", err)
+            raise ConfigEntryNotReady from err
+    else:
+        # set up from the last known state, the controller connects meanwhile
+        system = connections.async_get_background(ip_address)
+        if not system.transport.received:
+            system.transport.handle_frame(frame)
+            restored = True
 
+    coordinator = RinnaiCoordinator(
+        hass,
+        system,
+        entry_option(entry, CONF_DEBOUNCE, DEFAULT_DEBOUNCE),
+        restored=restored,
+    )
+    coordinator.start()
+    cache.start(system.transport)
+    entry.async_on_unload(cache.stop)
+    # options are applied in place by the platforms and entities, no reload
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = RinnaiData(
-        system=system, scenes=scenes
+        system=system, coordinator=coordinator, scenes=scenes
     )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     # hass.config_entries.async_setup_platforms(entry, PLATFORMS)
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply the new debounce delay to the commands sent from now on."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    data.coordinator.commands.debounce = entry_option(
+        entry, CONF_DEBOUNCE, DEFAULT_DEBOUNCE
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     ip_address = entry.data.get(CONF_HOST)
     _LOGGER.debug("Removing controller with IP: %s", ip_address)
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data: RinnaiData = hass.data[DOMAIN].pop(entry.entry_id)
+        data.coordinator.stop()
 
-    RinnaiSystem.remove_instance(ip_address)
+    async_get_connections(hass).async_release(ip_address)
     _LOGGER.debug("Controller with IP: %s removed", ip_address)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved status of a removed config entry."""
+    await RinnaiStatusCache(hass, entry.entry_id).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry
 ) -> bool:
@@ -77,16 +179,187 @@ async def async_remove_config_entry_device(
     return True
 
 
+@callback
+def async_get_connections(hass: HomeAssistant) -> "RinnaiConnectionManager":
+    """Return the connection manager, created with the first config entry."""
+    if DATA_CONNECTIONS not in hass.data:
+        hass.data[DATA_CONNECTIONS] = RinnaiConnectionManager(hass)
+    return hass.data[DATA_CONNECTIONS]
+
+
+class RinnaiConnectionManager:
+    """Own the connection to every configured controller.
+
+    Home Assistant sets config entries up one after the other while each
+    waits for its controller. The first call to ``async_get`` therefore
+    starts connecting to all enabled controllers at once, each with its own
+    timeout, so the later entries find their connection started or already
+    up and startup takes as long as the slowest controller.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._systems: dict[str, RinnaiAsyncSystem] = {}
+        self._starts: dict[str, asyncio.Future] = {}
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    async def async_get(
+        self, ip_address: str, timeout: float = CONNECT_TIMEOUT
+    ) -> RinnaiAsyncSystem:
+        """Return the connected system for the address, raise if it can't be reached."""
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            host = entry.data.get(CONF_HOST)
+            if entry.disabled_by is None and host not in self._systems:
+                self._async_start(host, timeout)
+        self._async_start(ip_address, timeout)
+        try:
+            await self._starts[ip_address]
+        except (OSError, TimeoutError):
+            self.async_release(ip_address)
+            raise
+        return self._systems[ip_address]
+
+    @callback
+    def async_get_background(self, ip_address: str) -> RinnaiAsyncSystem:
+        """Return the system for the address, connecting in the background until reached."""
+        if ip_address not in self._systems:
+            system = self._systems[ip_address] = RinnaiAsyncSystem(self.hass, ip_address)
+            system.start()
+            self.async_add(ip_address, system)
+            return system
+        system = self._systems[ip_address]
+        self._starts[ip_address].add_done_callback(partial(self._async_retry, system))
+        return system
+
+    @callback
+    def _async_retry(self, system: RinnaiAsyncSystem, start: asyncio.Future) -> None:
+        """Keep connecting in the background when starting the connection failed."""
+        if not start.cancelled() and start.exception() is not None:
+            system.start()
+
+    @callback
+    def _async_start(self, ip_address: str, timeout: float) -> None:
+        """Start connecting to a controller unless it already is."""
+        if ip_address in self._systems:
+            return
+        system = self._systems[ip_address] = RinnaiAsyncSystem(self.hass, ip_address)
+        self._starts[ip_address] = self.hass.async_create_task(
+            system.async_start(timeout), f"rinnaitouch connect {ip_address}"
+        )
+
+    @callback
+    def async_add(self, ip_address: str, system: RinnaiAsyncSystem) -> None:
+        """Use a system which is fed some other way, e.g. with a replayed capture."""
+        self._systems[ip_address] = system
+        started = self.hass.loop.create_future()
+        started.set_result(None)
+        self._starts[ip_address] = started
+
+    @callback
+    def async_release(self, ip_address: str) -> None:
+        """Close the connection to a controller."""
+        if (start := self._starts.pop(ip_address, None)) is not None and not start.done():
+            start.cancel()
+        if self._systems.pop(ip_address, None) is not None:
+            RinnaiSystem.remove_instance(ip_address)
+
+    @callback
+    def _async_stop(self, _event: Event) -> None:
+        """Close all connections when Home Assistant stops."""
+        for ip_address in list(self._systems):
+            self.async_release(ip_address)
+
+
 @dataclass
 class RinnaiData:
     """Data for the Rinnai Touch integration."""
 
     system: RinnaiSystem
+    coordinator: RinnaiCoordinator
     scenes: list
 
 
+def entry_option(entry: ConfigEntry, key: str, default=None):
+    """Return an option of the entry, the options flow overrides the setup values.
+
+    Options cleared in the options flow are stored as None, so they don't
+    fall back to the value entered when the entry was added.
+    """
+    if key in entry.options:
+        value = entry.options[key]
+    else:
+        value = entry.data.get(key)
+    return default if value is None else value
+
+
+def zone_name(zone: str) -> str:
+    """Name of a zone as shown in entity names."""
+    if zone == "U":
+        return "Common Zone"
+    return "Zone " + zone
+
+
 class RinnaiEntity(Entity):
-    """Base entity."""
+    """Base entity of a controller, updated by the coordinator.
+
+    Unique id, name, device info and static icons don't change, they are set
+    as ``_attr_`` values once in the constructor. The unique id is the lower
+    case class name followed by the zone, if any, and the address.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: RinnaiCoordinator,
+        ip_address: str,
+        name: str,
+        zone: str | None = None,
+    ) -> None:
+        self._coordinator = coordinator
+        self._system: RinnaiSystem = coordinator.system
+        self._host = ip_address
+        self._attr_zone = zone
+        self._attr_unique_id = (
+            str.lower(self.__class__.__name__)
+            + "_"
+            + (zone or "")
+            + str.replace(ip_address, ".", "_")
+        )
+        self._attr_name = name
+        self._attr_device_info = DeviceInfo(
+            identifiers={("rinnai_touch", ip_address)},
+            model="Rinnai Touch Wifi",
+            name=name,
+            manufacturer="Rinnai/Brivis",
+        )
+
+    async def async_added_to_hass(self):
+        """Register with the coordinator once added to hass."""
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self.system_updated, self.status_fields)
+        )
+
+    @property
+    def status_fields(self) -> tuple[str, ...] | None:
+        """Snapshot fields the state depends on, None to update on every frame."""
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Flag the state as restored or stale until the controller sent a frame."""
+        fields = self.status_fields
+        # entities not fed by frames (no fields) report live values
+        if fields is not None and not fields:
+            return None
+        attributes = {}
+        if self._coordinator.restored:
+            attributes["restored"] = True
+        if self._coordinator.stale:
+            attributes["stale"] = True
+        return attributes or None
 
-    def __init__(self):
-        pass
+    @callback
+    def system_updated(self):
+        """After system is updated write the new state to HA."""
+        self.async_write_ha_state()
@@ -1,333 +1,270 @@
-"""Binary sensors for prewetting and preheating"""
+"""Binary sensors for the flags of the unit and the zones and the connection"""
 # import logging
 
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from dataclasses import dataclass
+from functools import partial
+
+from homeassistant.components.binary_sensor import (
+    DOMAIN as BINARY_SENSOR_DOMAIN,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
 from homeassistant.const import CONF_NAME, CONF_HOST
+from homeassistant.core import callback
 
-from pyrinnaitouch import RinnaiSystem, RinnaiSystemMode, RinnaiSystemStatus
+from pyrinnaitouch import RinnaiCapabilities
+from . import RinnaiData, RinnaiEntity, zone_name
 from .const import (
-    CONF_ZONE_A,
-    CONF_ZONE_B,
-    CONF_ZONE_C,
-    CONF_ZONE_D,
-    CONF_ZONE_COMMON,
     DEFAULT_NAME,
+    DOMAIN,
 )
+from .snapshot import RinnaiSnapshot, UNIT_FLAG_BITS, ZONE_FLAG_BITS
 
 # _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class RinnaiFlagDescription(BinarySensorEntityDescription):
+    """Binary sensor for a flag of the snapshot.
+
+    ``key`` is the unique id prefix, ``flag`` the key in UNIT_FLAGS or
+    ZONE_FLAGS. The sensor is only created when the system has the
+    capability, None creates it on every system.
+    """
+
+    flag: str
+    suffix: str
+    capability: RinnaiCapabilities | None = None
+
+
+# keys are the names of the sensor classes these replaced, keeping unique ids
+# pylint: disable=unexpected-keyword-arg
+UNIT_FLAG_SENSORS = (
+    RinnaiFlagDescription(
+        key="rinnaipreheatbinarysensorentity",
+        flag="preheating",
+        suffix="Preheating Sensor",
+        icon="mdi:fire-alert",
+        capability=RinnaiCapabilities.HEATER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaigasvalvebinarysensorentity",
+        flag="gas_valve_active",
+        suffix="Gas Valve Active Sensor",
+        icon="mdi:gas-burner",
+        capability=RinnaiCapabilities.HEATER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaicallingheatbinarysensorentity",
+        flag="calling_for_heat",
+        suffix="Calling Heat Sensor",
+        icon="mdi:thermometer-alert",
+        capability=RinnaiCapabilities.HEATER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaicompressorbinarysensorentity",
+        flag="compressor_active",
+        suffix="Compressor Active Sensor",
+        icon="mdi:cog-clockwise",
+        capability=RinnaiCapabilities.COOLER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaicallingcoolbinarysensorentity",
+        flag="calling_for_cool",
+        suffix="Calling Cool Sensor",
+        icon="mdi:thermometer-alert",
+        capability=RinnaiCapabilities.COOLER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaiprewetbinarysensorentity",
+        flag="prewetting",
+        suffix="Evap Prewetting Sensor",
+        icon="mdi:snowflake-melt",
+        capability=RinnaiCapabilities.EVAP,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaipumpoperatingbinarysensorentity",
+        flag="pump_operating",
+        suffix="Pump Operating Sensor",
+        icon="mdi:water-alert",
+        capability=RinnaiCapabilities.EVAP,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaicoolerbusybinarysensorentity",
+        flag="cooler_busy",
+        suffix="Cooler Busy Sensor",
+        icon="mdi:cog-clockwise",
+        capability=RinnaiCapabilities.EVAP,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaifanoperatingbinarysensorentity",
+        flag="fan_operating",
+        suffix="Fan Active Sensor",
+        icon="mdi:fan-alert",
+    ),
+)
+ZONE_FLAG_SENSORS = (
+    RinnaiFlagDescription(
+        key="rinnaizonepreheatbinarysensorentity",
+        flag="preheating",
+        suffix="Preheating Sensor",
+        icon="mdi:fire-alert",
+        capability=RinnaiCapabilities.HEATER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaizonegasvalvebinarysensorentity",
+        flag="gas_valve_active",
+        suffix="Gas Valve Active Sensor",
+        icon="mdi:gas-burner",
+        capability=RinnaiCapabilities.HEATER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaizonecallingheatbinarysensorentity",
+        flag="calling_for_heat",
+        suffix="Calling Heat Sensor",
+        icon="mdi:thermometer-alert",
+        capability=RinnaiCapabilities.HEATER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaizonecompressorbinarysensorentity",
+        flag="compressor_active",
+        suffix="Compressor Active Sensor",
+        icon="mdi:cog-clockwise",
+        capability=RinnaiCapabilities.COOLER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaizonecallingcoolbinarysensorentity",
+        flag="calling_for_cool",
+        suffix="Calling Cool Sensor",
+        icon="mdi:thermometer-alert",
+        capability=RinnaiCapabilities.COOLER,
+    ),
+    RinnaiFlagDescription(
+        key="rinnaizonefanoperatingbinarysensorentity",
+        flag="fan_operating",
+        suffix="Fan Active Sensor",
+        icon="mdi:fan-alert",
+    ),
+)
+# pylint: enable=unexpected-keyword-arg
+
+
 async def async_setup_entry(hass, entry, async_add_entities):  # pylint: disable=unused-argument
     """Set up the binary sensor entities."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
     ip_address = entry.data.get(CONF_HOST)
     name = entry.data.get(CONF_NAME)
     if name == "":
         name = DEFAULT_NAME
-    async_add_entities(
-        [
-            RinnaiConnectedBinarySensorEntity(ip_address, name),
-            RinnaiPreheatBinarySensorEntity(ip_address, name),
-            RinnaiGasValveBinarySensorEntity(ip_address, name),
-            RinnaiCallingHeatBinarySensorEntity(ip_address, name),
-            RinnaiCompressorBinarySensorEntity(ip_address, name),
-            RinnaiCallingCoolBinarySensorEntity(ip_address, name),
-            RinnaiPrewetBinarySensorEntity(ip_address, name),
-            RinnaiPumpOperatingBinarySensorEntity(ip_address, name),
-            RinnaiCoolerBusyBinarySensorEntity(ip_address, name),
-            RinnaiFanOperatingBinarySensorEntity(ip_address, name),
-            RinnaiTimeSettingSensorEntity(ip_address, name),
-        ]
-    )
-    if entry.data.get(CONF_ZONE_A):
-        async_add_entities(
-            [
-                RinnaiZonePreheatBinarySensorEntity(ip_address, "A", name),
-                RinnaiZoneGasValveBinarySensorEntity(ip_address, "A", name),
-                RinnaiZoneCallingHeatBinarySensorEntity(ip_address, "A", name),
-                RinnaiZoneCompressorBinarySensorEntity(ip_address, "A", name),
-                RinnaiZoneCallingCoolBinarySensorEntity(ip_address, "A", name),
-                RinnaiZoneFanOperatingBinarySensorEntity(ip_address, "A", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_B):
-        async_add_entities(
-            [
-                RinnaiZonePreheatBinarySensorEntity(ip_address, "B", name),
-                RinnaiZoneGasValveBinarySensorEntity(ip_address, "B", name),
-                RinnaiZoneCallingHeatBinarySensorEntity(ip_address, "B", name),
-                RinnaiZoneCompressorBinarySensorEntity(ip_address, "B", name),
-                RinnaiZoneCallingCoolBinarySensorEntity(ip_address, "B", name),
-                RinnaiZoneFanOperatingBinarySensorEntity(ip_address, "B", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_C):
-        async_add_entities(
-            [
-                RinnaiZonePreheatBinarySensorEntity(ip_address, "C", name),
-                RinnaiZoneGasValveBinarySensorEntity(ip_address, "C", name),
-                RinnaiZoneCallingHeatBinarySensorEntity(ip_address, "C", name),
-                RinnaiZoneCompressorBinarySensorEntity(ip_address, "C", name),
-                RinnaiZoneCallingCoolBinarySensorEntity(ip_address, "C", name),
-                RinnaiZoneFanOperatingBinarySensorEntity(ip_address, "C", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_D):
-        async_add_entities(
-            [
-                RinnaiZonePreheatBinarySensorEntity(ip_address, "D", name),
-                RinnaiZoneGasValveBinarySensorEntity(ip_address, "D", name),
-                RinnaiZoneCallingHeatBinarySensorEntity(ip_address, "D", name),
-                RinnaiZoneCompressorBinarySensorEntity(ip_address, "D", name),
-                RinnaiZoneCallingCoolBinarySensorEntity(ip_address, "D", name),
-                RinnaiZoneFanOperatingBinarySensorEntity(ip_address, "D", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_COMMON):
-        async_add_entities(
-            [
-                RinnaiZonePreheatBinarySensorEntity(ip_address, "U", name),
-                RinnaiZoneGasValveBinarySensorEntity(ip_address, "U", name),
-                RinnaiZoneCallingHeatBinarySensorEntity(ip_address, "U", name),
-                RinnaiZoneCompressorBinarySensorEntity(ip_address, "U", name),
-                RinnaiZoneCallingCoolBinarySensorEntity(ip_address, "U", name),
-                RinnaiZoneFanOperatingBinarySensorEntity(ip_address, "U", name),
-            ]
-        )
+    # reports the connection, also while no frame was received
+    async_add_entities([RinnaiConnectedBinarySensorEntity(coordinator, ip_address, name)])
+
+    @callback
+    def add_sensors(snapshot: RinnaiSnapshot):
+        """Add the binary sensors for the capabilities and zones of the system."""
+        entities = [RinnaiTimeSettingSensorEntity(coordinator, ip_address, name)]
+        stale = []
+        for description in UNIT_FLAG_SENSORS:
+            if _has_capability(snapshot, description):
+                entities.append(
+                    RinnaiFlagBinarySensor(coordinator, ip_address, name, description)
+                )
+            else:
+                stale.append(description.key)
+        for description in ZONE_FLAG_SENSORS:
+            if _has_capability(snapshot, description):
+                entities.extend(
+                    RinnaiZoneFlagBinarySensor(
+                        coordinator, ip_address, zone, name, description
+                    )
+                    for zone in snapshot.reported_zones
+                )
+            else:
+                stale.append(description.key)
+        async_add_entities(entities)
+        coordinator.async_remove_stale_entities(entry, BINARY_SENSOR_DOMAIN, stale)
+
+    entry.async_on_unload(coordinator.async_add_ready_listener(add_sensors))
     return True
 
 
-class RinnaiBinarySensorEntity(BinarySensorEntity):
-    """Base class for all binary sensor entities setting up names and system instance."""
-
-    def __init__(self, ip_address, name) -> None:
-        self._host = ip_address
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = (
-            str.lower(self.__class__.__name__) + "_" + str.replace(ip_address, ".", "_")
-        )
-
-        self._attr_unique_id = device_id
-        self._attr_name = name + " Binary Sensor"
-        self._attr_device_name = name
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
+def _has_capability(snapshot: RinnaiSnapshot, description: RinnaiFlagDescription) -> bool:
+    return description.capability is None or description.capability in snapshot.capabilities
 
-    @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
-    @property
-    def name(self) -> str:
-        """Name of the entity."""
-        return self._attr_name.replace("Zone U", "Common Zone")
-
-    @property
-    def is_on(self) -> bool:
-        return False
 
+class RinnaiFlagBinarySensor(RinnaiEntity, BinarySensorEntity):
+    """Binary sensor for a flag of the unit, read from the snapshot bitfields."""
 
-class RinnaiUnitStateBinarySensorEntity(RinnaiBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
+    entity_description: RinnaiFlagDescription
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_unit_mode = None
-        self._attr_check_multi = True
-        self._attr_status_attr = None
+    def __init__(self, coordinator, ip_address, name, description: RinnaiFlagDescription):
+        super().__init__(coordinator, ip_address, name)
+        self.entity_description = description
+        self._bit = UNIT_FLAG_BITS[description.flag]
+        self._attr_unique_id = description.key + "_" + str.replace(ip_address, ".", "_")
+        self._attr_name = f"{name} {description.suffix}"
 
     @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        if not self.available:
-            return "mdi:eye"
-        if self.is_on:
-            return "mdi:eye-check"
-        return "mdi:eye-remove"
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("flags." + self.entity_description.flag,)
 
     @property
     def is_on(self):
-        """If the switch is currently on or off."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if self.available:
-            return getattr(state.unit_status, self._attr_status_attr, False)
-        return False
+        """If the flag is set."""
+        return bool(self._coordinator.data.flags & self._bit)
 
     @property
     def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if self._attr_check_multi:
-            if state.is_multi_set_point:
-                return False
-        return state.mode == self._attr_unit_mode
-
-
-class RinnaiPreheatBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Preheating Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.HEATING
-        self._attr_status_attr = "preheating"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:fire-alert"
-
-
-class RinnaiGasValveBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Gas Valve Active Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.HEATING
-        self._attr_status_attr = "gas_valve_active"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:gas-burner"
-
-
-class RinnaiCallingHeatBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Calling Heat Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.HEATING
-        self._attr_status_attr = "calling_for_heat"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:thermometer-alert"
-
-
-class RinnaiCompressorBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Compressor Active Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.COOLING
-        self._attr_status_attr = "compressor_active"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:cog-clockwise"
-
-
-class RinnaiCallingCoolBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Calling Cool Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.COOLING
-        self._attr_status_attr = "calling_for_cool"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:thermometer-alert"
-
-
-class RinnaiPrewetBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Evap Prewetting Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.EVAP
-        self._attr_check_multi = False
-        self._attr_status_attr = "prewetting"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:snowflake-melt"
-
+        return bool(self._coordinator.data.available_flags & self._bit)
 
-class RinnaiPumpOperatingBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Pump Operating Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.EVAP
-        self._attr_check_multi = False
-        self._attr_status_attr = "pump_operating"
+class RinnaiZoneFlagBinarySensor(RinnaiEntity, BinarySensorEntity):
+    """Binary sensor for a flag of a zone, read from the snapshot bitfields."""
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:water-alert"
-
-
-class RinnaiCoolerBusyBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
+    entity_description: RinnaiFlagDescription
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Cooler Busy Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.EVAP
-        self._attr_check_multi = False
-        self._attr_status_attr = "cooler_busy"
+    def __init__(
+        self, coordinator, ip_address, zone, name, description: RinnaiFlagDescription
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        super().__init__(coordinator, ip_address, name, zone)
+        self.entity_description = description
+        self._bit = ZONE_FLAG_BITS[description.flag]
+        self._attr_unique_id = (
+            description.key + "_" + zone + str.replace(ip_address, ".", "_")
+        )
+        self._attr_name = f"{name} {zone_name(zone)} {description.suffix}"
 
     @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:cog-clockwise"
-
-
-class RinnaiFanOperatingBinarySensorEntity(RinnaiUnitStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Fan Active Sensor"
-        self._attr_status_attr = "fan_operating"
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (f"zones.{self._attr_zone}.flags.{self.entity_description.flag}",)
 
     @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:fan-alert"
+    def is_on(self):
+        """If the flag is set."""
+        return bool(self._coordinator.data.zones[self._attr_zone].flags & self._bit)
 
     @property
     def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.mode == RinnaiSystemMode.EVAP:
-            return True
-        if state.is_multi_set_point:
-            return False
-        return True
+        return bool(
+            self._coordinator.data.zones[self._attr_zone].available_flags & self._bit
+        )
 
 
-class RinnaiTimeSettingSensorEntity(RinnaiBinarySensorEntity):
+class RinnaiTimeSettingSensorEntity(RinnaiEntity, BinarySensorEntity):
     """Binary sensor for signaling the system is in time setting mode."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Time Setting Sensor"
-        self._attr_status_attr = "is_timesetting"
+
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("is_timesetting", "has_fault")
 
     @property
     def icon(self):
@@ -339,185 +276,51 @@ class RinnaiTimeSettingSensorEntity(RinnaiBinarySensorEntity):
     @property
     def is_on(self):
         """If the sensor is currently on or off."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if self.available:
-            return state.is_timesetting
+            return state.status.is_timesetting
         return False
 
     @property
     def available(self):
         """If the sensor is currently available."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if not state.has_fault:
-            return True
-        return False
-
-
-class RinnaiZoneStateBinarySensorEntity(RinnaiBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, name)
-        self._attr_zone = zone
-        device_id = (
-            str.lower(self.__class__.__name__)
-            + "_"
-            + zone
-            + str.replace(ip_address, ".", "_")
-        )
-        self._attr_unique_id = device_id
-        self._attr_unit_mode = None
-        self._attr_status_attr = None
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        if not self.available:
-            return "mdi:eye"
-        if self.is_on:
-            return "mdi:eye-check"
-        return "mdi:eye-remove"
-
-    @property
-    def is_on(self):
-        """If the switch is currently on or off."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if self.available:
-            return getattr(
-                state.unit_status.zones[self._attr_zone], self._attr_status_attr, False
-            )
-        return False
-
-    @property
-    def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.is_multi_set_point:
-            return (
-                state.mode == self._attr_unit_mode
-                and self._attr_zone in state.unit_status.zones
-            )
-        return False
-
-
-class RinnaiZonePreheatBinarySensorEntity(RinnaiZoneStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, zone, name)
-        self._attr_name = name + " Zone " + zone + " Preheating Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.HEATING
-        self._attr_status_attr = "preheating"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:fire-alert"
-
-
-class RinnaiZoneGasValveBinarySensorEntity(RinnaiZoneStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, zone, name)
-        self._attr_name = name + " Zone " + zone + " Gas Valve Active Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.HEATING
-        self._attr_status_attr = "gas_valve_active"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:gas-burner"
-
-
-class RinnaiZoneCallingHeatBinarySensorEntity(RinnaiZoneStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, zone, name)
-        self._attr_name = name + " Zone " + zone + " Calling Heat Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.HEATING
-        self._attr_status_attr = "calling_for_work"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:thermometer-alert"
-
-
-class RinnaiZoneCompressorBinarySensorEntity(RinnaiZoneStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, zone, name)
-        self._attr_name = name + " Zone " + zone + " Compressor Active Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.COOLING
-        self._attr_status_attr = "compressor_active"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:cog-clockwise"
-
-
-class RinnaiZoneCallingCoolBinarySensorEntity(RinnaiZoneStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, zone, name)
-        self._attr_name = name + " Zone " + zone + " Calling Cool Sensor"
-        self._attr_unit_mode = RinnaiSystemMode.COOLING
-        self._attr_status_attr = "calling_for_work"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:thermometer-alert"
-
-
-class RinnaiZoneFanOperatingBinarySensorEntity(RinnaiZoneStateBinarySensorEntity):
-    """Binary sensor for preheating on/off during heater operation."""
-
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, zone, name)
-        self._attr_name = name + " Zone " + zone + " Fan Active Sensor"
-        self._attr_status_attr = "fan_operating"
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:fan-alert"
-
-    @property
-    def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.mode == RinnaiSystemMode.EVAP:
-            return False
-        if state.is_multi_set_point:
+        state: RinnaiSnapshot = self._coordinator.data
+        if not state.status.has_fault:
             return True
         return False
 
 
-class RinnaiConnectedBinarySensorEntity(RinnaiBinarySensorEntity):
+class RinnaiConnectedBinarySensorEntity(RinnaiEntity, BinarySensorEntity):
     """Binary sensor for Rinnai connection state."""
 
-    def __init__(self, ip_address, name) -> None:
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name) -> None:
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Connected Sensor"
         self._attr_unique_id = "connected_" + str.replace(ip_address, ".", "_")
         self._connected = None
 
-        # Subscribe to connection state changes
+    async def async_added_to_hass(self):
+        """Subscribe to connection state changes while added to hass."""
+        await super().async_added_to_hass()
         self._system.register_socket_state_handler(self._connection_state_handler)
+        self.async_on_remove(
+            partial(
+                self._system.unregister_socket_state_handler,
+                self._connection_state_handler,
+            )
+        )
 
+    @callback
     def _connection_state_handler(self, state):
         """Handle connection state updates from pyrinnaitouch."""
-        # Connected if state is CONNECTED, else not
-        try:
-            # Enum value 3 is CONNECTED, but use name for clarity
-            self._connected = getattr(state, "name", None) == "CONNECTED"
-            self.schedule_update_ha_state()
-        except Exception:  # pylint: disable=broad-except
-            pass
+        # Enum value 3 is CONNECTED, but use name for clarity
+        self._connected = getattr(state, "name", None) == "CONNECTED"
+        self.async_write_ha_state()
+
+    @property
+    def status_fields(self):
+        """Connection state is pushed by the socket handler, not by frames."""
+        return ()
 
     @property
     def is_on(self) -> bool:
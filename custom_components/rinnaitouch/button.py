@@ -3,22 +3,19 @@
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.const import CONF_NAME, CONF_HOST
+from homeassistant.core import callback
 
 from pyrinnaitouch import (
-    RinnaiSystem,
     RinnaiSystemMode,
     RinnaiOperatingMode,
-    RinnaiSystemStatus,
 )
 
+from . import RinnaiData, RinnaiEntity, zone_name
 from .const import (
-    CONF_ZONE_A,
-    CONF_ZONE_B,
-    CONF_ZONE_C,
-    CONF_ZONE_D,
-    CONF_ZONE_COMMON,
     DEFAULT_NAME,
+    DOMAIN,
 )
+from .snapshot import RinnaiSnapshot
 
 # _LOGGER = logging.getLogger(__name__)
 
@@ -27,88 +24,60 @@ async def async_setup_entry(
     hass, entry, async_add_entities
 ):  # pylint: disable=unused-argument
     """Set up the advance button entities."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
     ip_address = entry.data.get(CONF_HOST)
     name = entry.data.get(CONF_NAME)
     if name == "":
         name = DEFAULT_NAME
-    async_add_entities([RinnaiAdvanceButton(ip_address, name)])
-    if entry.data.get(CONF_ZONE_A):
-        async_add_entities([RinnaiZoneAdvanceButton(ip_address, "A", name)])
-    if entry.data.get(CONF_ZONE_B):
-        async_add_entities([RinnaiZoneAdvanceButton(ip_address, "B", name)])
-    if entry.data.get(CONF_ZONE_C):
-        async_add_entities([RinnaiZoneAdvanceButton(ip_address, "C", name)])
-    if entry.data.get(CONF_ZONE_D):
-        async_add_entities([RinnaiZoneAdvanceButton(ip_address, "D", name)])
-    if entry.data.get(CONF_ZONE_COMMON):
-        async_add_entities(
-            [
+
+    @callback
+    def add_buttons(snapshot: RinnaiSnapshot):
+        """Add the advance buttons for the unit and the zones of the system."""
+        entities = [RinnaiAdvanceButton(coordinator, ip_address, name)]
+        for zone in snapshot.reported_zones:
+            entities.append(
                 RinnaiZoneAdvanceButton(
-                    ip_address, "U", name + " Common Zone Advance Button"
+                    coordinator,
+                    ip_address,
+                    zone,
+                    name + " Common Zone Advance Button" if zone == "U" else name,
                 )
-            ]
-        )
-    return True
-
-
-class RinnaiButtonEntity(ButtonEntity):
-    """Base class button entity to set up naming and system."""
-
-    def __init__(self, ip_address, name):
-        self._host = ip_address
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = (
-            str.lower(self.__class__.__name__) + "_" + str.replace(ip_address, ".", "_")
-        )
-
-        self._attr_unique_id = device_id
-        self._attr_name = name
-        self._attr_device_name = name
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
-
-    @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
+            )
+        async_add_entities(entities)
 
-    @property
-    def name(self):
-        """Name of the entity."""
-        return self._attr_name.replace("Zone U", "Common Zone")
+    entry.async_on_unload(coordinator.async_add_ready_listener(add_buttons))
+    return True
 
 
-class RinnaiAdvanceButton(RinnaiButtonEntity):
+class RinnaiAdvanceButton(RinnaiEntity, ButtonEntity):
     """Main advance button entity."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Advance Button"
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            "mode",
+            "system_on",
+            "unit_status.operating_mode",
+            "unit_status.advanced",
+        )
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
         if self.available:
-            if self._system.get_stored_status().unit_status.advanced:
+            if self._coordinator.data.unit_status.advanced:
                 return "mdi:close-circle-outline"
         return "mdi:location-exit"
 
     @property
     def available(self) -> bool:
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if (
             state.mode in (RinnaiSystemMode.HEATING, RinnaiSystemMode.COOLING)
             and state.unit_status.operating_mode == RinnaiOperatingMode.AUTO
@@ -118,38 +87,35 @@ class RinnaiAdvanceButton(RinnaiButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if state.mode in (RinnaiSystemMode.HEATING, RinnaiSystemMode.COOLING):
             if state.unit_status.advanced:
-                await self._system.unit_advance_cancel()
+                sent = await self._system.unit_advance_cancel()
             else:
-                await self._system.unit_advance()
+                sent = await self._system.unit_advance()
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {"unit_status.advanced": not state.unit_status.advanced}
+                )
 
 
-class RinnaiZoneAdvanceButton(RinnaiButtonEntity):
+class RinnaiZoneAdvanceButton(RinnaiEntity, ButtonEntity):
     """Advance button entity for a zone."""
 
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, name)
-        self._attr_zone = zone
-        self._attr_name = name + " Zone " + zone + " Advance Button"
-        device_id = (
-            str.lower(self.__class__.__name__)
-            + "_"
-            + zone
-            + str.replace(ip_address, ".", "_")
-        )
+    _attr_icon = "mdi:location-exit"
 
-        self._attr_unique_id = device_id
+    def __init__(self, coordinator, ip_address, zone, name):
+        super().__init__(coordinator, ip_address, name, zone)
+        self._attr_name = f"{name} {zone_name(zone)} Advance Button"
 
     @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:location-exit"
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("mode", f"zones.{self._attr_zone}.auto_mode")
 
     @property
     def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if state.mode in (RinnaiSystemMode.HEATING, RinnaiSystemMode.COOLING):
             return (
                 self._attr_zone in state.unit_status.zones.keys()
@@ -159,12 +125,17 @@ class RinnaiZoneAdvanceButton(RinnaiButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if (
             state.mode in (RinnaiSystemMode.HEATING, RinnaiSystemMode.COOLING)
             and self._attr_zone in state.unit_status.zones.keys()
         ):
-            if state.unit_status.zones[self._attr_zone].advanced:
-                await self._system.unit_zone_advance_cancel(self._attr_zone)
+            advanced = state.unit_status.zones[self._attr_zone].advanced
+            if advanced:
+                sent = await self._system.set_unit_zone_advance_cancel(self._attr_zone)
             else:
-                await self._system.set_unit_zone_advance(self._attr_zone)
+                sent = await self._system.set_unit_zone_advance(self._attr_zone)
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.advanced": not advanced}
+                )
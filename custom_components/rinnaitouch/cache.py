@@ -0,0 +1,75 @@
+"""Last status frame of a controller, kept across restarts.
+
+After a restart the entities are set up from the frame saved here, before
+the controller is connected, and show the last known state until the
+first frame arrives. The frame JSON is kept as received, capabilities and
+zones are derived from it like from any other frame.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CACHE_SAVE_DELAY, DOMAIN
+from .transport import RinnaiTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class RinnaiStatusCache:
+    """Save the latest status frame of a config entry to the storage.
+
+    The frame is saved CACHE_SAVE_DELAY after the first frame following
+    a save, so frames arriving every few seconds cause one write per delay,
+    and on Home Assistant stop.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._frame: bytes | None = None
+        self._save_scheduled = False
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> bytes | None:
+        """Return the saved frame, None if there is none."""
+        data = await self._store.async_load()
+        if not data or not data.get("frame"):
+            return None
+        return data["frame"].encode()
+
+    @callback
+    def start(self, transport: RinnaiTransport) -> None:
+        """Save the frames the transport receives from now on."""
+        self._remove_listener = transport.add_frame_listener(self._frame_received)
+
+    @callback
+    def stop(self) -> None:
+        """Stop saving frames, a pending save is still written."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+
+    async def async_remove(self) -> None:
+        """Delete the saved frame."""
+        await self._store.async_remove()
+
+    @callback
+    def _frame_received(self, frame: bytes) -> None:
+        if b'"STM"' in frame:
+            # only echoes the time being set, not the full status
+            return
+        self._frame = frame
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_scheduled = False
+        _LOGGER.debug("Saving the last status frame")
+        return {"frame": self._frame.decode(errors="replace") if self._frame else None}
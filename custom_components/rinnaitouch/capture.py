@@ -0,0 +1,102 @@
+"""Capture of the raw status frames received from a controller.
+
+A capture is a gzip compressed text file, a header line followed by one
+line per frame with the seconds since the start of the capture and the
+frame JSON as received:
+
+    # rinnaitouch capture 192.168.1.20 2024-05-01T10:00:00+00:00
+    0.000 [{"SYST": ...}, {"HGOM": ...}]
+    4.012 [{"SYST": ...}, {"HGOM": ...}]
+
+``tools/replay.py`` feeds a capture back through the integration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+import gzip
+import logging
+import time
+from typing import TextIO
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import CAPTURE_FLUSH_INTERVAL
+from .transport import RinnaiTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+HEADER = "# rinnaitouch capture"
+
+
+class RinnaiFrameCapture:
+    """Record the frames a transport receives to a capture file for a while.
+
+    Frames are collected on the event loop and written to the file in the
+    executor every CAPTURE_FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(self, hass: HomeAssistant, transport: RinnaiTransport, path: str) -> None:
+        self.hass = hass
+        self.transport = transport
+        self.path = path
+        self._lines: list[str] = []
+        self._start = 0.0
+        self._remove_listener: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def start(self, duration: float) -> None:
+        """Start recording frames for the duration in seconds."""
+        self._start = time.monotonic()
+        self._lines = [f"{HEADER} {self.transport.host} {dt_util.utcnow().isoformat()}\n"]
+        self._remove_listener = self.transport.add_frame_listener(self._frame_received)
+        self._task = self.hass.async_create_background_task(
+            self._async_record(duration), f"rinnaitouch capture {self.path}"
+        )
+        _LOGGER.info("Capturing frames from %s to %s", self.transport.host, self.path)
+
+    @callback
+    def stop(self) -> None:
+        """Stop recording, the frames received so far are written."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def _frame_received(self, frame: bytes) -> None:
+        self._lines.append(
+            f"{time.monotonic() - self._start:.3f} {frame.decode(errors='replace')}\n"
+        )
+
+    async def _async_record(self, duration: float) -> None:
+        file = await self.hass.async_add_executor_job(gzip.open, self.path, "wt")
+        try:
+            end = self._start + duration
+            while (remaining := end - time.monotonic()) > 0:
+                await asyncio.sleep(min(CAPTURE_FLUSH_INTERVAL, remaining))
+                await self._async_flush(file)
+        finally:
+            if self._remove_listener is not None:
+                self._remove_listener()
+                self._remove_listener = None
+            await self._async_flush(file)
+            await self.hass.async_add_executor_job(file.close)
+            _LOGGER.info("Frame capture %s finished", self.path)
+
+    async def _async_flush(self, file: TextIO) -> None:
+        lines, self._lines = self._lines, []
+        if lines:
+            await self.hass.async_add_executor_job(file.writelines, lines)
+
+
+def read_capture(path: str) -> Iterator[tuple[float, bytes]]:
+    """Yield the receive time offset and frame JSON of every frame in a capture."""
+    with gzip.open(path, "rt") as file:
+        for line in file:
+            if line.startswith("#") or not line.strip():
+                continue
+            offset, frame = line.rstrip("\n").split(" ", 1)
+            yield float(offset), frame.encode()
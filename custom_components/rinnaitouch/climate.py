@@ -20,8 +20,8 @@ COOLING_COOL -> Refrigerated mode
 
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 
 import voluptuous as vol
@@ -29,52 +29,39 @@ import voluptuous as vol
 from homeassistant.components.climate import (
     ClimateEntity,
     ClimateEntityFeature,
-    HVACAction,
     HVACMode,
 )
 from homeassistant.const import (
     ATTR_TEMPERATURE,
     CONF_HOST,
     CONF_NAME,
-    UnitOfTemperature,
-)
-from homeassistant.helpers import (
-    config_validation as cv,
-    device_registry as dr,
-    entity_platform,
-    entity_registry as er,
-)
-from homeassistant.helpers.entity_registry import async_entries_for_device
-
-from pyrinnaitouch import (
-    TEMP_FAHRENHEIT,
-    RinnaiCapabilities,
-    RinnaiOperatingMode,
-    RinnaiSystem,
-    RinnaiSystemMode,
-    RinnaiSystemStatus,
 )
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_platform
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
 
+from pyrinnaitouch import RinnaiOperatingMode, RinnaiSystemMode
+
+from . import RinnaiData, RinnaiEntity, entry_option, zone_name
+from .capture import RinnaiFrameCapture
 from .const import (
+    CAPTURE_DURATION,
     CONF_TEMP_SENSOR,
-    CONF_TEMP_SENSOR_A,
-    CONF_TEMP_SENSOR_B,
-    CONF_TEMP_SENSOR_C,
-    CONF_TEMP_SENSOR_COMMON,
-    CONF_TEMP_SENSOR_D,
-    CONF_ZONE_A,
-    CONF_ZONE_B,
-    CONF_ZONE_C,
-    CONF_ZONE_COMMON,
-    CONF_ZONE_D,
     COOLING_COOL,
     COOLING_EVAP,
     COOLING_NONE,
+    DEFAULT_CAPTURE_DURATION,
     DEFAULT_NAME,
+    DOMAIN,
     PRESET_AUTO,
     PRESET_MANUAL,
     SET_DATETIME,
+    ZONE_TEMP_SENSORS,
 )
+from .coordinator import RinnaiCoordinator
+from .snapshot import RinnaiSnapshot, RinnaiZoneSnapshot
 
 
 SUPPORT_FLAGS_MAIN = (
@@ -95,41 +82,37 @@ _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = timedelta(seconds=5)
 
 SERVICE_SET_TIME = "rinnai_set_time"
+SERVICE_CAPTURE_FRAMES = "rinnai_capture_frames"
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up climate entities."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
     ip_address = entry.data.get(CONF_HOST)
     name = entry.data.get(CONF_NAME)
     if name == "":
         name = DEFAULT_NAME
-    temperature_entity = entry.data.get(CONF_TEMP_SENSOR)
-    temperature_entity_a = entry.data.get(CONF_TEMP_SENSOR_A)
-    temperature_entity_b = entry.data.get(CONF_TEMP_SENSOR_B)
-    temperature_entity_c = entry.data.get(CONF_TEMP_SENSOR_C)
-    temperature_entity_d = entry.data.get(CONF_TEMP_SENSOR_D)
-    temperature_entity_common = entry.data.get(CONF_TEMP_SENSOR_COMMON)
-    async_add_entities([RinnaiTouch(hass, ip_address, name, temperature_entity)])
-    if entry.data.get(CONF_ZONE_A):
-        async_add_entities(
-            [RinnaiTouchZone(hass, ip_address, name, "A", temperature_entity_a)]
-        )
-    if entry.data.get(CONF_ZONE_B):
-        async_add_entities(
-            [RinnaiTouchZone(hass, ip_address, name, "B", temperature_entity_b)]
-        )
-    if entry.data.get(CONF_ZONE_C):
-        async_add_entities(
-            [RinnaiTouchZone(hass, ip_address, name, "C", temperature_entity_c)]
-        )
-    if entry.data.get(CONF_ZONE_D):
-        async_add_entities(
-            [RinnaiTouchZone(hass, ip_address, name, "D", temperature_entity_d)]
-        )
-    if entry.data.get(CONF_ZONE_COMMON):
-        async_add_entities(
-            [RinnaiTouchZone(hass, ip_address, name, "U", temperature_entity_common)]
+
+    @callback
+    def add_climate_entities(snapshot: RinnaiSnapshot):
+        """Add the climate entities for the unit and the zones of the system."""
+        entities = [
+            RinnaiTouch(coordinator, ip_address, name, entry_option(entry, CONF_TEMP_SENSOR))
+        ]
+        entities.extend(
+            RinnaiTouchZone(
+                coordinator,
+                ip_address,
+                name,
+                zone,
+                entry_option(entry, ZONE_TEMP_SENSORS[zone]),
+            )
+            for zone in snapshot.reported_zones
         )
+        async_add_entities(entities)
+
+    entry.async_on_unload(coordinator.async_add_ready_listener(add_climate_entities))
     platform = entity_platform.async_get_current_platform()
     platform.async_register_entity_service(
         SERVICE_SET_TIME,
@@ -138,247 +121,150 @@ async def async_setup_entry(hass, entry, async_add_entities):
         },
         "set_system_time",
     )
+    platform.async_register_entity_service(
+        SERVICE_CAPTURE_FRAMES,
+        {
+            vol.Optional(CAPTURE_DURATION, default=DEFAULT_CAPTURE_DURATION): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=86400)
+            ),
+        },
+        "async_capture_frames",
+    )
     return True
 
 
-class RinnaiTouch(ClimateEntity):
+# snapshot fields of the unit read by the unit and the zone climate entities
+_SYSTEM_FIELDS = (
+    "cooling_mode",
+    "preferred_cooling_mode",
+    "temperature_unit",
+    "hvac_modes",
+)
+# snapshot fields both the unit and each zone have their own value of
+_CLIMATE_FIELDS = (
+    "available",
+    "hvac_mode",
+    "hvac_action",
+    "preset_mode",
+    "target_temperature",
+    "min_temp",
+    "max_temp",
+    "current_temperature",
+)
+
+
+def _icon(hvac_mode, cooling_mode):
+    """Return the icon to use in the frontend for a mode."""
+    if hvac_mode == HVACMode.OFF:
+        return "mdi:hvac-off"
+
+    if hvac_mode == HVACMode.FAN_ONLY:
+        return "mdi:fan"
+
+    if hvac_mode == HVACMode.COOL:
+        if cooling_mode == COOLING_EVAP:
+            return "mdi:snowflake-melt"
+        return "mdi:snowflake"
+
+    if hvac_mode == HVACMode.HEAT:
+        return "mdi:fire"
+
+    return "mdi:hvac"
+
+
+class RinnaiTouch(RinnaiEntity, ClimateEntity):
     """Main climate entity for the unit."""
 
     # pylint: disable=too-many-instance-attributes,too-many-public-methods
-    def __init__(self, hass, ip_address, name="Rinnai Touch", temperature_entity=None):
-        self._host = ip_address
+    def __init__(
+        self,
+        coordinator: RinnaiCoordinator,
+        ip_address,
+        name="Rinnai Touch",
+        temperature_entity=None,
+    ):
+        super().__init__(coordinator, ip_address, name)
         _LOGGER.info("Set up RinnaiTouch entity %s", ip_address)
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = "rinnaitouch_" + str.replace(ip_address, ".", "_")
-
-        self._attr_unique_id = device_id
-        self._attr_name = name
-        self._attr_device_name = name
+        self._attr_unique_id = "rinnaitouch_" + str.replace(ip_address, ".", "_")
 
-        self._hass = hass
-        self._attr_first_update = True
+        self._temperature_option = CONF_TEMP_SENSOR
         self._temerature_entity_name = temperature_entity
         self._sensor_temperature = 0
-        self.update_external_temperature()
+        self._cancel_temperature_tracking: CALLBACK_TYPE | None = None
 
         self._support_flags = SUPPORT_FLAGS_MAIN
         self._enable_turn_on_off_backwards_compatibility = False
 
         self._TEMPERATURE_STEP = 1
-        self._TEMPERATURE_LIMITS = {"min": 8, "max": 30}
-        self._COMFORT_LIMITS = {"min": 19, "max": 34}
-        self._FAN_LIMITS = {"min": 0, "max": 16}
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        self.update_external_temperature()
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            if self._attr_first_update:
-                self.remove_irrelevant_entities()
-
-            self._attr_first_update = False
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
-
-    def remove_irrelevant_entities(self):
-        """After first update remove irrelevant entities."""
-        device_registry = dr.async_get(self.hass)
-        entity_registry = er.async_get(self.hass)
 
-        device = device_registry.async_get_device({("rinnai_touch", self._host)}, set())
+    async def async_added_to_hass(self):
+        """Register with the coordinator and the external sensor once added to hass."""
+        await super().async_added_to_hass()
+        self._track_external_temperature()
+        self.async_on_remove(self._untrack_external_temperature)
+        self.async_on_remove(
+            self.platform.config_entry.add_update_listener(self._async_options_updated)
+        )
 
-        if device is None:
-            _LOGGER.warning("Got entities for unknown device : %s", self._host)
+    async def _async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry):
+        """Follow the external sensor chosen in the options."""
+        # pylint: disable=unused-argument
+        entity_id = entry_option(entry, self._temperature_option)
+        if entity_id != self._temerature_entity_name:
+            self._temerature_entity_name = entity_id
+            self._track_external_temperature()
+            self.async_write_ha_state()
+
+    @callback
+    def _track_external_temperature(self):
+        """Cache the reading of the external sensor and track its changes."""
+        self._untrack_external_temperature()
+        self._sensor_temperature = 0
+        if self._temerature_entity_name is None:
             return
-
-        devices_to_remove = []
-
-        for entry in async_entries_for_device(
-            entity_registry, device.id, include_disabled_entities=True
-        ):
-            if (
-                RinnaiCapabilities.COOLER
-                not in self._system.get_stored_status().capabilities
-            ):  # pylint: disable=too-many-boolean-expressions
-                if (
-                    (
-                        entry.domain == "switch"
-                        and "cooling_mode" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "calling_cool" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "compressor_active" in entry.entity_id.lower()
-                    )
-                ):
-                    devices_to_remove.append(entry)
-
-            if (
-                RinnaiCapabilities.HEATER
-                not in self._system.get_stored_status().capabilities
-            ):  # pylint: disable=too-many-boolean-expressions
-                if (
-                    (
-                        entry.domain == "switch"
-                        and "heater_mode" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "calling_heat" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "gas_valve_active" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "preheating" in entry.entity_id.lower()
-                    )
-                ):
-                    devices_to_remove.append(entry)
-
-            if (
-                RinnaiCapabilities.EVAP
-                not in self._system.get_stored_status().capabilities
-            ):  # pylint: disable=too-many-boolean-expressions
-                if (
-                    (
-                        entry.domain == "switch"
-                        and "evap_mode" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "switch"
-                        and "evap_fan" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "switch"
-                        and "water_pump" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "cooler_busy" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "pump_operating" in entry.entity_id.lower()
-                    )
-                    or (
-                        entry.domain == "binary_sensor"
-                        and "prewetting" in entry.entity_id.lower()
-                    )
-                ):
-                    devices_to_remove.append(entry)
-
-        asyncio.run_coroutine_threadsafe(
-            self.remove_devices(entity_registry, devices_to_remove), self.hass.loop
+        self.update_external_temperature(self.hass.states.get(self._temerature_entity_name))
+        self._cancel_temperature_tracking = async_track_state_change_event(
+            self.hass,
+            [self._temerature_entity_name],
+            self._external_temperature_changed,
         )
 
-    async def remove_devices(self, entity_registry, devices_to_remove):
-        """Async helper to remove entities from registry."""
-        for entry in devices_to_remove:
-            _LOGGER.debug("Removing entity: %s %s", entry.platform, entry.entity_id)
-            entity_registry.async_remove(entry.entity_id)
+    @callback
+    def _untrack_external_temperature(self):
+        """Stop tracking the external sensor."""
+        if self._cancel_temperature_tracking is not None:
+            self._cancel_temperature_tracking()
+            self._cancel_temperature_tracking = None
+
+    @property
+    def status_fields(self) -> tuple[str, ...] | None:
+        """Snapshot fields the state depends on, None to update on every frame."""
+        return _SYSTEM_FIELDS + _CLIMATE_FIELDS
 
     @property
     def supported_features(self):
         """Return the list of supported features."""
         return self._support_flags
 
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
-
-    @property
-    def name(self):
-        """Return the name of the climate device."""
-        return self._attr_name
-
-    @property
-    def unique_id(self):
-        """Return the unique id for this heater."""
-        return self._attr_unique_id
-
-    @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
-        hvac_mode = self.hvac_mode
-
-        if hvac_mode == HVACMode.OFF:
-            return "mdi:hvac-off"
-
-        if hvac_mode == HVACMode.FAN_ONLY:
-            return "mdi:fan"
-
-        if hvac_mode == HVACMode.COOL:
-            if self.cooling_mode == COOLING_EVAP:
-                return "mdi:snowflake-melt"
-            return "mdi:snowflake"
-
-        if hvac_mode == HVACMode.HEAT:
-            return "mdi:fire"
-
-        return "mdi:hvac"
+        return _icon(self._coordinator.data.hvac_mode, self._coordinator.data.cooling_mode)
 
     @property
     def cooling_mode(self):
         """Return the cooling mode we're in mode."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.mode == RinnaiSystemMode.COOLING:
-            return COOLING_COOL
-        if state.mode == RinnaiSystemMode.EVAP:
-            return COOLING_EVAP
-        return COOLING_NONE
+        return self._coordinator.data.cooling_mode
 
     @property
     def temperature_unit(self):
         """Return the unit of measurement."""
-        if self._system.get_stored_status().temp_unit == TEMP_FAHRENHEIT:
-            return UnitOfTemperature.FAHRENHEIT
-        return UnitOfTemperature.CELSIUS
+        return self._coordinator.data.temperature_unit
 
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
-        # pylint: disable=too-many-return-statements
-        if self.hvac_mode == HVACMode.OFF:
-            return 0
-
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if self.cooling_mode == COOLING_COOL:
-            if self.hvac_mode == HVACMode.FAN_ONLY:
-                return state.unit_status.fan_speed
-            return state.unit_status.set_temp
-
-        if self.cooling_mode == COOLING_EVAP:
-            if self.preset_mode == PRESET_AUTO:
-                return int(state.unit_status.comfort)
-            if self.preset_mode == PRESET_MANUAL:
-                return int(state.unit_status.fan_speed)
-
-        if self.cooling_mode == COOLING_NONE:
-            if self.hvac_mode == HVACMode.FAN_ONLY:
-                return state.unit_status.fan_speed
-            return state.unit_status.set_temp
-
-        return 999
+        return self._coordinator.data.target_temperature
 
     @property
     def target_temperature_step(self):
@@ -388,29 +274,17 @@ class RinnaiTouch(ClimateEntity):
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        if self.cooling_mode == COOLING_EVAP and self.preset_mode == PRESET_AUTO:
-            return self._COMFORT_LIMITS["min"]
-        if self.cooling_mode != COOLING_EVAP and self.hvac_mode != HVACMode.FAN_ONLY:
-            return self._TEMPERATURE_LIMITS["min"]
-        return self._FAN_LIMITS["min"]
+        return self._coordinator.data.min_temp
 
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        if self.cooling_mode == COOLING_EVAP and self.preset_mode == PRESET_AUTO:
-            return self._COMFORT_LIMITS["max"]
-        if self.cooling_mode != COOLING_EVAP and self.hvac_mode != HVACMode.FAN_ONLY:
-            return self._TEMPERATURE_LIMITS["max"]
-        return self._FAN_LIMITS["max"]
+        return self._coordinator.data.max_temp
 
     @property
     def preferred_cooling_mode(self):
         """Return the preferred cooling mode, prioritising refrigerated over evap."""
-        if RinnaiCapabilities.COOLER in self._system.get_stored_status().capabilities:
-            return COOLING_COOL
-        if RinnaiCapabilities.EVAP in self._system.get_stored_status().capabilities:
-            return COOLING_EVAP
-        return COOLING_NONE
+        return self._coordinator.data.preferred_cooling_mode
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
@@ -419,37 +293,76 @@ class RinnaiTouch(ClimateEntity):
         if not hvac_mode == self.hvac_mode:
             if hvac_mode == HVACMode.HEAT:
                 # turn whatever the preset is on and put it into manual mode
-                await self._system.turn_heater_on()
-                await self._system.set_heater_mode()
+                switched_on = await self._system.turn_heater_on()
+                mode_set = await self._system.set_heater_mode()
+                self._set_optimistic_on(
+                    RinnaiSystemMode.HEATING, True, mode_set, switched_on
+                )
             elif hvac_mode == HVACMode.COOL:
                 # turn whatever the preset is on and put it into auto mode
                 if self.preferred_cooling_mode == COOLING_COOL:
-                    await self._system.turn_cooler_on()
-                    await self._system.set_cooling_mode()
+                    switched_on = await self._system.turn_cooler_on()
+                    mode_set = await self._system.set_cooling_mode()
+                    self._set_optimistic_on(
+                        RinnaiSystemMode.COOLING, True, mode_set, switched_on
+                    )
                 if self.preferred_cooling_mode == COOLING_EVAP:
-                    await self._system.set_evap_mode()
-                    await self._system.turn_evap_on()
+                    mode_set = await self._system.set_evap_mode()
+                    switched_on = await self._system.turn_evap_on()
+                    self._set_optimistic_on(
+                        RinnaiSystemMode.EVAP, True, mode_set, switched_on
+                    )
             elif hvac_mode == HVACMode.OFF:
                 # turn whatever the preset is off
                 if self.cooling_mode == COOLING_EVAP:
-                    await self._system.turn_evap_off()
+                    switched_off = await self._system.turn_evap_off()
                 else:
-                    await self._system.turn_unit_off()
+                    switched_off = await self._system.turn_unit_off()
+                if switched_off:
+                    self._coordinator.async_set_optimistic(
+                        {"system_on": False, "unit_status.is_on": False}
+                    )
             elif hvac_mode == HVACMode.FAN_ONLY:
                 # turn whatever the preset is off
                 await self._system.turn_unit_off()
-                if self.cooling_mode == COOLING_COOL:
-                    await self._system.turn_unit_fan_only()
-                if self.cooling_mode == COOLING_NONE:
-                    await self._system.turn_unit_fan_only()
+                if self.cooling_mode in (
+                    COOLING_COOL,
+                    COOLING_NONE,
+                ) and await self._system.turn_unit_fan_only():
+                    self._set_optimistic_on(self._coordinator.data.mode, False)
+
+    @callback
+    def _set_optimistic_on(
+        self,
+        mode: RinnaiSystemMode,
+        unit_on: bool,
+        mode_set: bool = True,
+        switched_on: bool = True,
+    ):
+        """Show the system on in the mode until the controller reports it.
+
+        Only the values of the commands the library accepted for the stored
+        mode are shown, a unit command for another mode is not sent.
+        """
+        values = {}
+        if mode_set:
+            values["mode"] = mode
+        if switched_on:
+            values.update({"system_on": True, "unit_status.is_on": unit_on})
+        if values:
+            self._coordinator.async_set_optimistic(values)
 
     async def async_set_preset_mode(self, preset_mode):
         """Set new target preset mode."""
         if not preset_mode == self.preset_mode:
-            if preset_mode == PRESET_AUTO:
-                await self._system.set_unit_auto()
-            if preset_mode == PRESET_MANUAL:
-                await self._system.set_unit_manual()
+            if preset_mode == PRESET_AUTO and await self._system.set_unit_auto():
+                self._coordinator.async_set_optimistic(
+                    {"unit_status.operating_mode": RinnaiOperatingMode.AUTO}
+                )
+            if preset_mode == PRESET_MANUAL and await self._system.set_unit_manual():
+                self._coordinator.async_set_optimistic(
+                    {"unit_status.operating_mode": RinnaiOperatingMode.MANUAL}
+                )
 
     def set_humidity(self, humidity):
         """Set new target humidity."""
@@ -463,6 +376,16 @@ class RinnaiTouch(ClimateEntity):
         """Set the system time."""
         await self._system.set_system_time(set_datetime)
 
+    async def async_capture_frames(self, duration: int = DEFAULT_CAPTURE_DURATION):
+        """Record the received frames to a capture file in the config directory."""
+        path = self.hass.config.path(
+            f"rinnaitouch_{str.replace(self._host, '.', '_')}_"
+            f"{dt_util.now():%Y%m%d_%H%M%S}.log.gz"
+        )
+        capture = RinnaiFrameCapture(self.hass, self._system.transport, path)
+        self.async_on_remove(capture.stop)
+        capture.start(duration)
+
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         if kwargs.get(ATTR_TEMPERATURE) is not None:
@@ -479,140 +402,71 @@ class RinnaiTouch(ClimateEntity):
             )
         if self.cooling_mode == COOLING_COOL:
             if self.hvac_mode == HVACMode.FAN_ONLY:
-                await self._system.set_unit_fanspeed(target_temperature)
+                self._debounce_target(
+                    self._system.set_unit_fanspeed, "fan_speed", target_temperature
+                )
             else:
-                await self._system.set_unit_temp(target_temperature)
+                self._debounce_target(
+                    self._system.set_unit_temp, "set_temp", target_temperature
+                )
         if self.cooling_mode == COOLING_NONE:
             if self.hvac_mode == HVACMode.FAN_ONLY:
-                await self._system.set_unit_fanspeed(target_temperature)
+                self._debounce_target(
+                    self._system.set_unit_fanspeed, "fan_speed", target_temperature
+                )
             else:
-                await self._system.set_unit_temp(target_temperature)
+                self._debounce_target(
+                    self._system.set_unit_temp, "set_temp", target_temperature
+                )
         if self.cooling_mode == COOLING_EVAP and self.preset_mode == PRESET_AUTO:
-            await self._system.set_evap_comfort(target_temperature)
+            self._debounce_target(
+                self._system.set_evap_comfort, "comfort", target_temperature
+            )
         if self.cooling_mode == COOLING_EVAP and self.preset_mode == PRESET_MANUAL:
-            await self._system.set_evap_fanspeed(target_temperature)
+            self._debounce_target(
+                self._system.set_evap_fanspeed, "fan_speed", target_temperature
+            )
+
+    @callback
+    def _debounce_target(self, setter, field, target_temperature):
+        """Show the new target right away, only send the last one of a burst."""
+        self._coordinator.async_set_optimistic(
+            {"unit_status." + field: target_temperature}
+        )
+        self._coordinator.commands.async_debounce(
+            (self._attr_unique_id, setter.__name__),
+            partial(setter, target_temperature),
+        )
 
     @property
     def current_temperature(self):
         """Return the current temperature."""
         # NC7 returns temp in XXX -> ZXS -> MT
         # implemented use of an external sensor (optional) which returns 0 if none selected
-        temp = self._system.get_stored_status().unit_status.temperature
-        _LOGGER.debug("Internal temperature sensor reports: %s", temp)
-
-        if int(temp) < 999:
-            _LOGGER.debug(
-                "Internal temperature sensor should be reported: %s", int(temp) < 999
-            )
-            return float(temp) / 10
+        temp = self._coordinator.data.current_temperature
+        if temp is not None:
+            return temp
         return self._sensor_temperature
 
     @property
     def hvac_mode(self):
         """Return current HVAC mode, ie Heat or Off."""
-        # pylint: disable=too-many-return-statements,too-many-branches
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if not state.system_on:
-            return HVACMode.OFF
-
-        if state.mode == RinnaiSystemMode.COOLING:
-            if state.unit_status.is_on:
-                return HVACMode.COOL
-            # system on, cooling mode, but cooling off indicates fan only
-            return HVACMode.FAN_ONLY
-
-        if state.mode == RinnaiSystemMode.HEATING:
-            if state.unit_status.is_on:
-                return HVACMode.HEAT
-            # system on, heater mode, but heater off indicates fan only
-            return HVACMode.FAN_ONLY
-
-        if state.mode == RinnaiSystemMode.EVAP:
-            return HVACMode.COOL
-        return HVACMode.OFF
+        return self._coordinator.data.hvac_mode
 
     @property
     def hvac_action(self):
         """Return current HVAC action."""
-        # pylint: disable=too-many-return-statements
-
-        state = self._system.get_stored_status()
-        if not state.system_on:
-            return HVACAction.OFF
-        if state.is_multi_set_point:
-            # return zone actions in zone unit
-            return HVACAction.IDLE
-        # logic to return the right action for main unit
-        if state.mode == RinnaiSystemMode.COOLING:
-            if state.unit_status.is_on:
-                if (
-                    state.unit_status.compressor_active
-                    or state.unit_status.calling_for_cool
-                    or state.unit_status.fan_operating
-                ):
-                    return HVACAction.COOLING
-                return HVACAction.IDLE
-            return HVACAction.FAN
-
-        if state.mode == RinnaiSystemMode.HEATING:
-            if state.unit_status.is_on:
-                if (
-                    state.unit_status.gas_valve_active
-                    or state.unit_status.calling_for_heat
-                    or state.unit_status.fan_operating
-                    or state.unit_status.preheating
-                ):
-                    return HVACAction.HEATING
-                return HVACAction.IDLE
-            return HVACAction.FAN
-
-        if state.mode == RinnaiSystemMode.EVAP:
-            if state.unit_status.is_on:
-                if (
-                    state.unit_status.prewetting
-                    or state.unit_status.cooler_busy
-                    or (
-                        state.unit_status.fan_operating
-                        and state.unit_status.pump_operating
-                    )
-                ):
-                    return HVACAction.COOLING
-                if state.unit_status.fan_operating and not (
-                    state.unit_status.cooler_busy
-                    or state.unit_status.prewetting
-                    or state.unit_status.pump_operating
-                ):
-                    return HVACAction.FAN
-                return HVACAction.IDLE
-        return HVACAction.OFF
+        return self._coordinator.data.hvac_action
 
     @property
     def hvac_modes(self):
         """Return the list of available HVAC modes."""
-        modes = [HVACMode.OFF]
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if (
-            RinnaiCapabilities.COOLER in state.capabilities
-            or RinnaiCapabilities.EVAP in state.capabilities
-        ):
-            modes.append(HVACMode.COOL)
-
-        if RinnaiCapabilities.HEATER in state.capabilities:
-            modes.append(HVACMode.HEAT)
-
-        if state.mode == RinnaiSystemMode.EVAP:
-            return modes
-
-        modes.append(HVACMode.FAN_ONLY)
-        return modes
+        return list(self._coordinator.data.hvac_modes)
 
     @property
     def preset_mode(self):
         """Return current HVAC mode, ie Heat or Off."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.unit_status.operating_mode == RinnaiOperatingMode.AUTO:
-            return PRESET_AUTO
-        return PRESET_MANUAL
+        return self._coordinator.data.preset_mode
 
     @property
     def preset_modes(self):
@@ -627,193 +481,141 @@ class RinnaiTouch(ClimateEntity):
         """Turn auxiliary heater off."""
         return False
 
-    def update_external_temperature(self):
-        """Update external temperature reading."""
-        _LOGGER.debug("Ext. temp sensor entity name: %s", self._temerature_entity_name)
-        if self._temerature_entity_name is not None:
-            temperature_entity = self._hass.states.get(self._temerature_entity_name)
-            # _LOGGER.debug("External temperature sensor entity: %s", temperature_entity)
-            if (
-                temperature_entity is not None
-                and temperature_entity.state != "unavailable"
-            ):
-                _LOGGER.debug("Ext. temp sensor reports: %s", temperature_entity.state)
-                try:
-                    self._sensor_temperature = float(temperature_entity.state)
-                except ValueError:
-                    self._sensor_temperature = 0
+    @callback
+    def _external_temperature_changed(self, event):
+        """Write the state when the external temperature sensor reading changed."""
+        if self.update_external_temperature(event.data["new_state"]):
+            self.async_write_ha_state()
+
+    def update_external_temperature(self, temperature_entity) -> bool:
+        """Cache the external temperature reading, return whether it changed."""
+        if temperature_entity is None or temperature_entity.state == "unavailable":
+            return False
+        _LOGGER.debug("Ext. temp sensor reports: %s", temperature_entity.state)
+        try:
+            temperature = float(temperature_entity.state)
+        except ValueError:
+            temperature = 0
+        if temperature == self._sensor_temperature:
+            return False
+        self._sensor_temperature = temperature
+        return True
 
     @property
     def available(self):
-        if self._system.get_stored_status().mode != RinnaiSystemMode.NONE:
-            return True
-        return False
-
-    async def async_will_remove_from_hass(self):
-        """Disconnect from the device."""
-        # Doesn't seem to be needed here, as the ha_stop event already shuts down the client
-        # self._system.shutdown(None)
-        _LOGGER.debug("removing entity from hass")
+        return self._coordinator.data.available
 
 
-class RinnaiTouchZone(ClimateEntity):
+class RinnaiTouchZone(RinnaiEntity, ClimateEntity):
     """Climate entity for a zone."""
 
     # pylint: disable=too-many-instance-attributes,too-many-public-methods
 
     # some common
-    def __init__(self, hass, ip_address, name, zone, temperature_entity=None):
+    def __init__(
+        self,
+        coordinator: RinnaiCoordinator,
+        ip_address,
+        name,
+        zone,
+        temperature_entity=None,
+    ):
         # pylint: disable=too-many-positional-arguments,too-many-arguments
 
+        super().__init__(coordinator, ip_address, name, zone)
         _LOGGER.debug("Set up RinnaiTouch zone %s entity %s", zone, ip_address)
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = "rinnaitouch_zone" + zone + "_" + str.replace(ip_address, ".", "_")
-        self._host = ip_address
-
-        self._attr_unique_id = device_id
-        self._attr_name = name + " Zone " + zone
-        if zone == "U":
-            self._attr_name = name + "Common Zone"
-        self._attr_zone = zone
-        self._attr_device_name = name
-
-        self._hass = hass
+        self._attr_unique_id = (
+            "rinnaitouch_zone" + zone + "_" + str.replace(ip_address, ".", "_")
+        )
+        self._attr_name = f"{name} {zone_name(zone)}"
 
+        self._temperature_option = ZONE_TEMP_SENSORS[zone]
         self._temerature_entity_name = temperature_entity
         self._sensor_temperature = 0
+        self._cancel_temperature_tracking: CALLBACK_TYPE | None = None
         self._last_set_temp = 20
-        self.update_external_temperature()
 
         self._support_flags = SUPPORT_FLAGS_ZONE
         self._enable_turn_on_off_backwards_compatibility = False
 
         self._TEMPERATURE_STEP = 1
-        self._TEMPERATURE_LIMITS = {"min": 8, "max": 30}
-        self._system.subscribe_updates(self.system_updated)
 
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
+    async def async_added_to_hass(self):
+        """Register with the coordinator and the external sensor once added to hass."""
+        await super().async_added_to_hass()
+        self._track_external_temperature()
+        self.async_on_remove(self._untrack_external_temperature)
+        self.async_on_remove(
+            self.platform.config_entry.add_update_listener(self._async_options_updated)
+        )
 
-    @property
-    def supported_features(self):
-        """Return the list of supported features."""
-        return self._support_flags
+    async def _async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry):
+        """Follow the external sensor chosen in the options."""
+        # pylint: disable=unused-argument
+        entity_id = entry_option(entry, self._temperature_option)
+        if entity_id != self._temerature_entity_name:
+            self._temerature_entity_name = entity_id
+            self._track_external_temperature()
+            self.async_write_ha_state()
+
+    @callback
+    def _track_external_temperature(self):
+        """Cache the reading of the external sensor and track its changes."""
+        self._untrack_external_temperature()
+        self._sensor_temperature = 0
+        if self._temerature_entity_name is None:
+            return
+        self.update_external_temperature(self.hass.states.get(self._temerature_entity_name))
+        self._cancel_temperature_tracking = async_track_state_change_event(
+            self.hass,
+            [self._temerature_entity_name],
+            self._external_temperature_changed,
+        )
 
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
+    @callback
+    def _untrack_external_temperature(self):
+        """Stop tracking the external sensor."""
+        if self._cancel_temperature_tracking is not None:
+            self._cancel_temperature_tracking()
+            self._cancel_temperature_tracking = None
 
     @property
-    def name(self):
-        """Return the name of the climate device."""
-        return self._attr_name
+    def status_fields(self) -> tuple[str, ...] | None:
+        """Snapshot fields the state depends on, None to update on every frame."""
+        return _SYSTEM_FIELDS + tuple(
+            f"zones.{self._attr_zone}.{field}" for field in _CLIMATE_FIELDS
+        )
 
     @property
-    def unique_id(self):
-        """Return the unique id for this heater."""
-        return self._attr_unique_id
+    def supported_features(self):
+        """Return the list of supported features."""
+        return self._support_flags
 
     @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
+    def _zone_data(self) -> RinnaiZoneSnapshot:
+        """Return the snapshot of this zone in the latest frame."""
+        return self._coordinator.data.zones[self._attr_zone]
 
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
-        hvac_mode = self.hvac_mode
-
-        if hvac_mode == HVACMode.OFF:
-            return "mdi:hvac-off"
-
-        if hvac_mode == HVACMode.FAN_ONLY:
-            return "mdi:fan"
-
-        if hvac_mode == HVACMode.COOL:
-            if self.cooling_mode == COOLING_EVAP:
-                return "mdi:snowflake-melt"
-            return "mdi:snowflake"
-
-        if hvac_mode == HVACMode.HEAT:
-            return "mdi:fire"
-
-        return "mdi:hvac"
+        return _icon(self._zone_data.hvac_mode, self._coordinator.data.cooling_mode)
 
     @property
     def cooling_mode(self):
         """Return the cooling mode we're in mode."""
-        if self._system.get_stored_status().mode == RinnaiSystemMode.COOLING:
-            return COOLING_COOL
-        if self._system.get_stored_status().mode == RinnaiSystemMode.EVAP:
-            return COOLING_EVAP
-        return COOLING_NONE
+        return self._coordinator.data.cooling_mode
 
     @property
     def temperature_unit(self):
         """Return the unit of measurement."""
-        if self._system.get_stored_status().temp_unit == TEMP_FAHRENHEIT:
-            return UnitOfTemperature.FAHRENHEIT
-        return UnitOfTemperature.CELSIUS
+        return self._coordinator.data.temperature_unit
 
     # not common
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
-        # pylint: disable=too-many-return-statements,too-many-branches
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if (
-            state.is_multi_set_point
-            and self._attr_zone in state.unit_status.zones.keys()
-        ):
-            if self.cooling_mode == COOLING_COOL:
-                if self.hvac_mode == HVACMode.FAN_ONLY:
-                    return state.unit_status.fan_speed
-                if int(state.unit_status.zones[self._attr_zone].set_temp) > 7:
-                    return float(state.unit_status.zones[self._attr_zone].set_temp)
-                return 0
-
-            if self.cooling_mode == COOLING_EVAP:
-                if self.preset_mode == PRESET_AUTO:
-                    return int(state.unit_status.comfort)
-                if self.preset_mode == PRESET_MANUAL:
-                    return int(state.unit_status.fan_speed)
-
-            if self.cooling_mode == COOLING_NONE:
-                if self.hvac_mode == HVACMode.FAN_ONLY:
-                    return state.unit_status.fan_speed
-                if int(state.unit_status.zones[self._attr_zone].set_temp) > 7:
-                    return float(state.unit_status.zones[self._attr_zone].set_temp)
-                return 0
-
-        if self.cooling_mode == COOLING_COOL:
-            if self.hvac_mode == HVACMode.FAN_ONLY:
-                return state.unit_status.fan_speed
-            return float(state.unit_status.set_temp)
-
-        if self.cooling_mode == COOLING_EVAP:
-            if self.preset_mode == PRESET_AUTO:
-                return int(state.unit_status.comfort)
-            if self.preset_mode == PRESET_MANUAL:
-                return int(state.unit_status.fan_speed)
-
-        if self.cooling_mode == COOLING_NONE:
-            if self.hvac_mode == HVACMode.FAN_ONLY:
-                return state.unit_status.fan_speed
-            return float(state.unit_status.set_temp)
-
-        return 999
+        return self._zone_data.target_temperature
 
     @property
     def target_temperature_step(self):
@@ -824,92 +626,110 @@ class RinnaiTouchZone(ClimateEntity):
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        if self._system.get_stored_status().is_multi_set_point:
-            if self.cooling_mode == COOLING_EVAP or self.hvac_mode == HVACMode.FAN_ONLY:
-                return self.target_temperature
-            return self._TEMPERATURE_LIMITS["min"]
-        return self.target_temperature
+        return self._zone_data.min_temp
 
     # not common
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        if self._system.get_stored_status().is_multi_set_point:
-            if self.cooling_mode == COOLING_EVAP or self.hvac_mode == HVACMode.FAN_ONLY:
-                return self.target_temperature
-            return self._TEMPERATURE_LIMITS["max"]
-        return self.target_temperature
+        return self._zone_data.max_temp
 
     @property
     def preferred_cooling_mode(self):
         """Return the preferred cooling mode, prioritising refrigerated over evap."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if RinnaiCapabilities.COOLER in state.capabilities:
-            return COOLING_COOL
-        if RinnaiCapabilities.EVAP in state.capabilities:
-            return COOLING_EVAP
-        return COOLING_NONE
+        return self._coordinator.data.preferred_cooling_mode
 
     # not common
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
         # pylint: disable=too-many-branches
         # _LOGGER.debug("Setting new HVAC mode from %s to %s", self.hvac_mode, hvac_mode)
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state = self._coordinator.data
+        zone = "zones." + self._attr_zone
         if not hvac_mode == self.hvac_mode:
             if hvac_mode == HVACMode.HEAT and self.cooling_mode == COOLING_NONE:
                 if state.is_multi_set_point:
-                    await self._system.set_unit_zone_temp(
+                    if await self._system.set_unit_zone_temp(
                         self._attr_zone, self._last_set_temp
-                    )
-                else:
-                    # turn whatever the preset is on and put it into manual mode
-                    await self._system.turn_unit_zone_on(self._attr_zone)
+                    ):
+                        self._coordinator.async_set_optimistic(
+                            {zone + ".set_temp": self._last_set_temp}
+                        )
+                # turn whatever the preset is on and put it into manual mode
+                elif await self._system.turn_unit_zone_on(self._attr_zone):
+                    self._coordinator.async_set_optimistic({zone + ".user_enabled": True})
             elif hvac_mode == HVACMode.COOL:
                 # turn whatever the preset is on and put it into auto mode
                 if self.preferred_cooling_mode == COOLING_COOL:
                     if state.is_multi_set_point:
-                        await self._system.set_unit_zone_temp(
+                        if await self._system.set_unit_zone_temp(
                             self._attr_zone, self._last_set_temp
+                        ):
+                            self._coordinator.async_set_optimistic(
+                                {zone + ".set_temp": self._last_set_temp}
+                            )
+                    # turn whatever the preset is on and put it into manual mode
+                    elif await self._system.turn_unit_zone_on(self._attr_zone):
+                        self._coordinator.async_set_optimistic(
+                            {zone + ".user_enabled": True}
                         )
-                    else:
-                        # turn whatever the preset is on and put it into manual mode
-                        await self._system.turn_unit_zone_on(self._attr_zone)
-                if self.preferred_cooling_mode == COOLING_EVAP:
-                    await self._system.turn_evap_zone_on(self._attr_zone)
+                if (
+                    self.preferred_cooling_mode == COOLING_EVAP
+                    and await self._system.turn_evap_zone_on(self._attr_zone)
+                ):
+                    self._coordinator.async_set_optimistic({zone + ".user_enabled": True})
             elif hvac_mode == HVACMode.OFF:
                 if state.is_multi_set_point:
                     # turn whatever the preset is off
                     if self.cooling_mode == COOLING_EVAP:
-                        await self._system.turn_evap_zone_off(self._attr_zone)
+                        if await self._system.turn_evap_zone_off(self._attr_zone):
+                            self._coordinator.async_set_optimistic(
+                                {zone + ".user_enabled": False}
+                            )
                     else:
                         self._last_set_temp = state.unit_status.set_temp
-                        await self._system.set_unit_zone_temp(self._attr_zone, 0)
+                        if await self._system.set_unit_zone_temp(self._attr_zone, 0):
+                            self._coordinator.async_set_optimistic(
+                                {zone + ".set_temp": 0}
+                            )
                 else:
                     # turn whatever the preset is off
                     if self.cooling_mode == COOLING_EVAP:
-                        await self._system.turn_evap_zone_off(self._attr_zone)
+                        switched_off = await self._system.turn_evap_zone_off(
+                            self._attr_zone
+                        )
                     else:
-                        await self._system.turn_unit_zone_off(self._attr_zone)
+                        switched_off = await self._system.turn_unit_zone_off(
+                            self._attr_zone
+                        )
+                    if switched_off:
+                        self._coordinator.async_set_optimistic(
+                            {zone + ".user_enabled": False}
+                        )
 
     # not common
     async def async_set_preset_mode(self, preset_mode):
         """Set new target preset mode."""
         if not preset_mode == self.preset_mode:
+            sent = False
             if preset_mode == PRESET_AUTO:
                 if self.cooling_mode == COOLING_COOL:
-                    await self._system.set_unit_zone_auto(self._attr_zone)
+                    sent = await self._system.set_unit_zone_auto(self._attr_zone)
                 if self.cooling_mode == COOLING_EVAP:
-                    await self._system.set_evap_zone_auto(self._attr_zone)
+                    sent = await self._system.set_evap_zone_auto(self._attr_zone)
                 if self.cooling_mode == COOLING_NONE:
-                    await self._system.set_unit_zone_auto(self._attr_zone)
+                    sent = await self._system.set_unit_zone_auto(self._attr_zone)
             if preset_mode == PRESET_MANUAL:
                 if self.cooling_mode == COOLING_COOL:
-                    await self._system.set_unit_zone_manual(self._attr_zone)
+                    sent = await self._system.set_unit_zone_manual(self._attr_zone)
                 if self.cooling_mode == COOLING_EVAP:
-                    await self._system.set_evap_zone_manual(self._attr_zone)
+                    sent = await self._system.set_evap_zone_manual(self._attr_zone)
                 if self.cooling_mode == COOLING_NONE:
-                    await self._system.set_unit_zone_manual(self._attr_zone)
+                    sent = await self._system.set_unit_zone_manual(self._attr_zone)
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.auto_mode": preset_mode == PRESET_AUTO}
+                )
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
@@ -919,7 +739,7 @@ class RinnaiTouchZone(ClimateEntity):
     # not common
     async def async_set_target_temperature(self, target_temperature):
         """Set the new target temperate in a zone."""
-        if self._system.get_stored_status().is_multi_set_point:
+        if self._coordinator.data.is_multi_set_point:
             target_temperature = int(round(target_temperature))
 
             if not self.min_temp <= target_temperature <= self.max_temp:
@@ -927,13 +747,17 @@ class RinnaiTouchZone(ClimateEntity):
                     f"Target temperature ({target_temperature}) must be between "
                     f"{self.min_temp} and {self.max_temp}."
                 )
-            if self.cooling_mode == COOLING_COOL:
-                await self._system.set_unit_zone_temp(
-                    self._attr_zone, target_temperature
+            if self.cooling_mode in (COOLING_COOL, COOLING_NONE):
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.set_temp": target_temperature}
                 )
-            if self.cooling_mode == COOLING_NONE:
-                await self._system.set_unit_zone_temp(
-                    self._attr_zone, target_temperature
+                self._coordinator.commands.async_debounce(
+                    (self._attr_unique_id, "set_unit_zone_temp"),
+                    partial(
+                        self._system.set_unit_zone_temp,
+                        self._attr_zone,
+                        target_temperature,
+                    ),
                 )
         else:
             return False
@@ -942,167 +766,32 @@ class RinnaiTouchZone(ClimateEntity):
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        temp = 1000
-        if self._attr_zone in state.unit_status.zones.keys():
-            temp = state.unit_status.zones[self._attr_zone].temperature
-
-        if int(temp) < 999:
-            return float(temp) / 10
+        temp = self._zone_data.current_temperature
+        if temp is not None:
+            return temp
         return self._sensor_temperature
 
     # not common
     @property
     def hvac_mode(self):
         """Return current HVAC mode, ie Heat or Off."""
-        # pylint: disable=too-many-return-statements
-        if self.hvac_action == HVACAction.OFF:
-            return HVACMode.OFF
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if self.cooling_mode == COOLING_COOL:
-            if self._attr_zone not in state.unit_status.zones.keys():
-                return HVACMode.OFF
-            return HVACMode.COOL
-        if self.cooling_mode == COOLING_NONE:
-            if self._attr_zone not in state.unit_status.zones.keys():
-                return HVACMode.OFF
-            if state.unit_status.is_on:
-                return HVACMode.HEAT
-            return HVACMode.FAN_ONLY
-        if self.cooling_mode == COOLING_EVAP:
-            if self._attr_zone not in state.unit_status.zones.keys():
-                return HVACMode.OFF
-            if state.unit_status.is_on:
-                return HVACMode.COOL
-            return HVACMode.FAN_ONLY
-        return HVACMode.OFF
+        return self._zone_data.hvac_mode
 
     @property
     def hvac_action(self):
         """Return current HVAC action."""
-        # pylint: disable=too-many-return-statements,too-many-branches
-
-        state = self._system.get_stored_status()
-        if not state.system_on:
-            return HVACAction.OFF
-        if state.is_multi_set_point:
-            # return zone actions in zone unit
-            if state.mode == RinnaiSystemMode.COOLING:
-                if (
-                    state.unit_status.is_on
-                    and self._attr_zone in state.unit_status.zones.keys()
-                ):
-                    if (
-                        state.unit_status.zones[self._attr_zone].compressor_active
-                        or state.unit_status.zones[self._attr_zone].calling_for_work
-                        or state.unit_status.zones[self._attr_zone].fan_operating
-                    ):
-                        return HVACAction.COOLING
-                    if int(state.unit_status.zones[self._attr_zone].set_temp) < 8:
-                        return HVACAction.OFF
-                    return HVACAction.IDLE
-                if state.unit_status.zones[self._attr_zone].fan_operating:
-                    return HVACAction.FAN
-                return HVACAction.OFF
-            if state.mode == RinnaiSystemMode.HEATING:
-                if (
-                    state.unit_status.is_on
-                    and self._attr_zone in state.unit_status.zones.keys()
-                ):
-                    if (
-                        state.unit_status.zones[self._attr_zone].gas_valve_active
-                        or state.unit_status.zones[self._attr_zone].calling_for_work
-                        or state.unit_status.zones[self._attr_zone].fan_operating
-                    ):
-                        return HVACAction.HEATING
-                    if int(state.unit_status.zones[self._attr_zone].set_temp) < 8:
-                        return HVACAction.OFF
-                    return HVACAction.IDLE
-                if state.unit_status.zones[self._attr_zone].fan_operating:
-                    return HVACAction.FAN
-                return HVACAction.OFF
-
-        # logic to return the right action for main unit
-        if state.mode == RinnaiSystemMode.COOLING:
-            if state.unit_status.is_on:
-                if (
-                    state.unit_status.compressor_active
-                    or state.unit_status.calling_for_cool
-                    or state.unit_status.fan_operating
-                ):
-                    return HVACAction.COOLING
-                return HVACAction.IDLE
-            return HVACAction.FAN
-
-        if state.mode == RinnaiSystemMode.HEATING:
-            if state.unit_status.is_on:
-                if (
-                    state.unit_status.gas_valve_active
-                    or state.unit_status.calling_for_heat
-                    or state.unit_status.fan_operating
-                    or state.unit_status.preheating
-                ):
-                    return HVACAction.HEATING
-                return HVACAction.IDLE
-            return HVACAction.FAN
-
-        if state.mode == RinnaiSystemMode.EVAP:
-            if (
-                state.unit_status.is_on
-                and self._attr_zone in state.unit_status.zones.keys()
-                and state.unit_status.zones[self._attr_zone].user_enabled
-            ):
-                if (
-                    state.unit_status.prewetting
-                    or state.unit_status.cooler_busy
-                    or (
-                        state.unit_status.fan_operating
-                        and state.unit_status.pump_operating
-                    )
-                ):
-                    return HVACAction.COOLING
-                if state.unit_status.fan_operating and not (
-                    state.unit_status.cooler_busy
-                    or state.unit_status.prewetting
-                    or state.unit_status.pump_operating
-                ):
-                    return HVACAction.FAN
-                return HVACAction.IDLE
-            return HVACAction.OFF
-        return HVACAction.OFF
+        return self._zone_data.hvac_action
 
     # not common. Only return the mode that is set on the main
     @property
     def hvac_modes(self):
         """Return the list of available HVAC modes."""
-        modes = [HVACMode.OFF]
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if (
-            RinnaiCapabilities.COOLER in state.capabilities
-            or RinnaiCapabilities.EVAP in state.capabilities
-        ):
-            modes.append(HVACMode.COOL)
-
-        if RinnaiCapabilities.HEATER in state.capabilities:
-            modes.append(HVACMode.HEAT)
-
-        if state.mode == RinnaiSystemMode.EVAP:
-            return modes
-
-        modes.append(HVACMode.FAN_ONLY)
-        return modes
+        return list(self._coordinator.data.hvac_modes)
 
     @property
     def preset_mode(self):
         """Return current Preset mode, ie Auto or Manual."""
-        # pylint: disable=too-many-return-statements
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if (
-            self._attr_zone in state.unit_status.zones.keys()
-            and state.unit_status.zones[self._attr_zone].auto_mode
-        ):
-            return PRESET_AUTO
-        return PRESET_MANUAL
+        return self._zone_data.preset_mode
 
     # not common. Only return the mode that is set on the main
     @property
@@ -1126,27 +815,26 @@ class RinnaiTouchZone(ClimateEntity):
     # not common
     @property
     def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING):
-            return self._attr_zone in state.unit_status.zones.keys()
-        return False
+        return self._zone_data.available
+
+    @callback
+    def _external_temperature_changed(self, event):
+        """Write the state when the external temperature sensor reading changed."""
+        if self.update_external_temperature(event.data["new_state"]):
+            self.async_write_ha_state()
 
-    def update_external_temperature(self):
-        """Update latest external temperature reading."""
+    def update_external_temperature(self, temperature_entity) -> bool:
+        """Cache the external temperature reading, return whether it changed."""
+        if temperature_entity is None or temperature_entity.state == "unavailable":
+            return False
         _LOGGER.debug(
-            "Ext temp sensor (%s): %s", self._attr_zone, self._temerature_entity_name
+            "Ext temp sensor (%s) reports: %s", self._attr_zone, temperature_entity.state
         )
-        if self._temerature_entity_name is not None and self._hass:
-            temperature_entity = self._hass.states.get(self._temerature_entity_name)
-            # _LOGGER.debug("External temperature sensor entity: %s", temperature_entity)
-            if (
-                temperature_entity is not None
-                and temperature_entity.state != "unavailable"
-            ):
-                _LOGGER.debug("Ext temp sensor reports: %s", temperature_entity.state)
-                try:
-                    self._sensor_temperature = int(
-                        round(float(temperature_entity.state))
-                    )
-                except ValueError:
-                    self._sensor_temperature = 0
+        try:
+            temperature = int(round(float(temperature_entity.state)))
+        except ValueError:
+            temperature = 0
+        if temperature == self._sensor_temperature:
+            return False
+        self._sensor_temperature = temperature
+        return True
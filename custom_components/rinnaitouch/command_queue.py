@@ -0,0 +1,190 @@
+"""Queue coalescing the commands sent to the controller."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Hashable
+import json
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEFAULT_DEBOUNCE
+from .transport import RinnaiAsyncSystem
+
+_LOGGER = logging.getLogger(__name__)
+
+# top level group of the system wide commands (mode, time setting)
+SYSTEM_GROUP = "SYST"
+# values switching a unit on, off or to the circulation fan, below the unit group
+STATE_SWITCHES = (("OOP", "ST"), ("GSO", "SW"))
+
+
+class RinnaiCommandQueue:
+    """Collect the commands issued in one event loop iteration and send them batched.
+
+    The controller acknowledges every write with a status frame and the
+    library waits for that before sending the next command, so each write
+    costs a round trip. Entities usually issue several commands for one
+    transition (zone temperature and zone on, unit on and temperature) and
+    UI sliders issue bursts of the same command.
+
+    The queue takes over ``send_command`` of the system. Pending commands
+    are flushed on the next loop iteration:
+
+    * a command writing exactly the same values as the previous pending
+      command supersedes it, only the latest value is sent
+    * consecutive commands writing to the same group of a unit (GSO, ZAO,
+      ...) are merged into one write, the module is not relied on to apply
+      several groups of one write in a particular order
+    * system commands (SYST) are never merged with anything else as they
+      switch the active unit or must be applied in order
+    * switching a unit on, off or to the fan is never superseded by or
+      merged with another switch, each transition reaches the module
+
+    Setters driven by sliders go through ``async_debounce`` first, which
+    only runs the last call per key once no newer one arrived for
+    ``debounce`` seconds.
+
+    Commands are refused with HomeAssistantError as soon as they are
+    issued while the circuit breaker of the connection is open.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        system: RinnaiAsyncSystem,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> None:
+        self.hass = hass
+        self.system = system
+        self.debounce = debounce
+        self._send = system.send_command
+        self._pending: list[str] = []
+        self._flush_scheduled = False
+        self._debounced: dict[
+            Hashable, tuple[CALLBACK_TYPE, Callable[[], Awaitable]]
+        ] = {}
+
+    def start(self) -> None:
+        """Route the commands of the system through the queue."""
+        self.system.send_command = self.send_command
+
+    def stop(self) -> None:
+        """Send what is pending and give the commands back to the system."""
+        debounced, self._debounced = self._debounced, {}
+        for cancel, action in debounced.values():
+            cancel()
+            self.hass.async_create_task(_async_run(action))
+        self._flush()
+        self.system.send_command = self._send
+
+    @callback
+    def async_debounce(self, key: Hashable, action: Callable[[], Awaitable]) -> None:
+        """Run the action unless another one for the same key follows within the window."""
+        if (debounced := self._debounced.pop(key, None)) is not None:
+            debounced[0]()
+        if self.debounce <= 0:
+            self.hass.async_create_task(_async_run(action))
+            return
+
+        @callback
+        def run_action(_now) -> None:
+            self._debounced.pop(key, None)
+            self.hass.async_create_task(_async_run(action))
+
+        self._debounced[key] = (
+            async_call_later(self.hass, self.debounce, run_action),
+            action,
+        )
+
+    def send_command(self, cmd: str) -> None:
+        """Queue a command to be sent on the next loop iteration.
+
+        Raises HomeAssistantError right away while the circuit breaker of
+        the connection rejects commands, so the service call fails.
+        """
+        self.system.transport.check_command()
+        self._pending.append(cmd)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        """Coalesce the pending commands and hand them to the connection."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        batches = coalesce(pending)
+        if len(batches) < len(pending):
+            _LOGGER.debug("Coalesced %d commands into %d", len(pending), len(batches))
+        for batch in batches:
+            self._send(batch)
+
+
+async def _async_run(action: Callable[[], Awaitable]) -> None:
+    """Run a debounced action, the service call that issued it already returned."""
+    try:
+        await action()
+    except HomeAssistantError as err:
+        _LOGGER.warning("Debounced command not sent: %s", err)
+
+
+def coalesce(commands: list[str]) -> list[str]:
+    """Merge and drop superseded commands, keeping the order of the writes."""
+    batches: list[tuple[dict, set, str | None]] = []
+    for cmd in commands:
+        try:
+            data = json.loads(cmd)
+        except ValueError:
+            _LOGGER.warning("Sending unparsable command as is: %s", cmd)
+            batches.append(({}, set(), cmd))
+            continue
+        paths = _leaf_paths(data)
+        if batches and batches[-1][0]:
+            last, last_paths, _ = batches[-1]
+            if _switches_state(paths) and _switches_state(last_paths):
+                batches.append((data, paths, cmd))
+                continue
+            if paths == last_paths:
+                batches[-1] = (data, paths, cmd)
+                continue
+            if _groups(paths) == _groups(last_paths) and SYSTEM_GROUP not in data:
+                _merge(last, data)
+                batches[-1] = (last, last_paths | paths, None)
+                continue
+        batches.append((data, paths, cmd))
+    return [cmd if cmd is not None else json.dumps(data) for data, _, cmd in batches]
+
+
+def _groups(paths: set) -> set:
+    """Return the groups a command writes to, the paths without the values."""
+    return {path[:-1] for path in paths}
+
+
+def _switches_state(paths: set) -> bool:
+    """Return whether a command switches a unit on, off or to the fan."""
+    return any(path[1:] in STATE_SWITCHES for path in paths)
+
+
+def _leaf_paths(data: dict, prefix: tuple = ()) -> set:
+    """Return the paths of all values written by a command."""
+    paths = set()
+    for key, value in data.items():
+        if isinstance(value, dict):
+            paths |= _leaf_paths(value, prefix + (key,))
+        else:
+            paths.add(prefix + (key,))
+    return paths
+
+
+def _merge(target: dict, data: dict) -> None:
+    """Deep merge a command into a batch, later values win."""
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
@@ -5,69 +5,108 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_NAME
-from homeassistant.data_entry_flow import AbortFlow
-
-from pyrinnaitouch import RinnaiSystem
+from homeassistant.core import callback
 
+from . import entry_option
 from .const import (
     DOMAIN,
-    CONF_ZONE_A,
-    CONF_ZONE_B,
-    CONF_ZONE_C,
-    CONF_ZONE_D,
-    CONF_ZONE_COMMON,
+    CONF_BURNER_RATING,
+    CONF_COMPRESSOR_RATING,
+    CONF_DEBOUNCE,
     CONF_TEMP_SENSOR,
     CONF_TEMP_SENSOR_A,
     CONF_TEMP_SENSOR_B,
     CONF_TEMP_SENSOR_C,
     CONF_TEMP_SENSOR_D,
     CONF_TEMP_SENSOR_COMMON,
+    DEFAULT_DEBOUNCE,
     DEFAULT_NAME,
+    ZONE_TEMP_SENSORS,
 )
+from .transport import RinnaiTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+RATING = vol.All(vol.Coerce(float), vol.Range(min=0))
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
-        vol.Required(CONF_ZONE_A): bool,
         vol.Optional(CONF_TEMP_SENSOR_A): str,
-        vol.Required(CONF_ZONE_B): bool,
         vol.Optional(CONF_TEMP_SENSOR_B): str,
-        vol.Required(CONF_ZONE_C): bool,
         vol.Optional(CONF_TEMP_SENSOR_C): str,
-        vol.Required(CONF_ZONE_D): bool,
         vol.Optional(CONF_TEMP_SENSOR_D): str,
-        vol.Required(CONF_ZONE_COMMON): bool,
         vol.Optional(CONF_TEMP_SENSOR_COMMON): str,
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
         vol.Optional(CONF_TEMP_SENSOR): str,
+        vol.Optional(CONF_BURNER_RATING): RATING,
+        vol.Optional(CONF_COMPRESSOR_RATING): RATING,
     }
 )
+# options which can be left empty
+TEMP_SENSOR_KEYS = (CONF_TEMP_SENSOR, *ZONE_TEMP_SENSORS.values())
+RATING_KEYS = (CONF_BURNER_RATING, CONF_COMPRESSOR_RATING)
 
 
 class RinnaiTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Rinnai Touch."""
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow of an entry."""
+        return RinnaiTouchOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
         errors = {}
         if user_input is not None:
-            system: RinnaiSystem = RinnaiSystem.get_instance(user_input[CONF_HOST])
             device_id = "rinnaitouch_" + str.replace(user_input[CONF_HOST], ".", "_")
+            # the module only takes one connection, don't compete with the
+            # entry already connected to it
+            await self.async_set_unique_id(device_id)
+            self._abort_if_unique_id_configured()
+            transport = RinnaiTransport(self.hass, user_input[CONF_HOST])
             try:
-                await self.hass.async_add_executor_job(system.get_status)
-            except AbortFlow:
-                return self.async_abort(reason="single_instance_allowed")
+                await transport.async_start()
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
-            else:
-                await self.async_set_unique_id(device_id)
-                self._abort_if_unique_id_configured()
+            finally:
+                # the entry opens its own connection
+                transport.stop()
+            if not errors:
                 return self.async_create_entry(
                     title=user_input[CONF_NAME], data=user_input
                 )
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+
+class RinnaiTouchOptionsFlow(config_entries.OptionsFlow):
+    """Change the external sensors, ratings and debounce of an entry.
+
+    The integration applies the new options to the running entities, the
+    connection to the controller stays up.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Show the current options and store the new ones."""
+        if user_input is not None:
+            # store cleared fields as None, not to fall back to the setup values
+            options = dict.fromkeys(TEMP_SENSOR_KEYS + RATING_KEYS) | user_input
+            return self.async_create_entry(title="", data=options)
+        schema = {}
+        for keys, validator in ((TEMP_SENSOR_KEYS, str), (RATING_KEYS, RATING)):
+            for key in keys:
+                suggested = {"suggested_value": entry_option(self._entry, key)}
+                schema[vol.Optional(key, description=suggested)] = validator
+        default = entry_option(self._entry, CONF_DEBOUNCE, DEFAULT_DEBOUNCE)
+        schema[vol.Required(CONF_DEBOUNCE, default=default)] = vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=10)
+        )
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -3,6 +3,7 @@
 RINNAI = "rinnai"
 ICON = "mdi:fan"
 DOMAIN = "rinnaitouch"
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
 DEFAULT_NAME = "Rinnai Touch"
 UNIT_FAN_SPEED = "ø"
 UNIT_COMFORT_LEVEL = "±"
@@ -18,9 +19,39 @@ CONF_TEMP_SENSOR_B = "external_temperature_sensor_b"
 CONF_TEMP_SENSOR_C = "external_temperature_sensor_c"
 CONF_TEMP_SENSOR_D = "external_temperature_sensor_d"
 CONF_TEMP_SENSOR_COMMON = "external_temperature_sensor_common"
-CONF_ZONE_A = "Zone A"
-CONF_ZONE_B = "Zone B"
-CONF_ZONE_C = "Zone C"
-CONF_ZONE_D = "Zone D"
-CONF_ZONE_COMMON = "Common Zone"
 SET_DATETIME = "set_datetime"
+CAPTURE_DURATION = "duration"
+STATE_ZONES = "zones"
+ZONE_ENABLED = "enabled"
+CONF_DEBOUNCE = "debounce"
+CONF_BURNER_RATING = "burner_rating"
+CONF_COMPRESSOR_RATING = "compressor_rating"
+DEFAULT_DEBOUNCE = 1.0
+OPTIMISTIC_TIMEOUT = 15
+
+MODULE_PORT = 27847
+CONNECT_TIMEOUT = 10
+COMMAND_TIMEOUT = 5
+# queued commands not sent within this many seconds are dropped, not sent late
+COMMAND_DEADLINE = 30
+# unacknowledged commands in a row opening the circuit, and seconds it stays open
+CIRCUIT_FAILURES = 3
+CIRCUIT_COOLDOWN = 30
+IDLE_POLL_INTERVAL = 10
+NO_DATA_TIMEOUT = 30
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 120
+STALE_GRACE = 120
+CAPTURE_FLUSH_INTERVAL = 30
+DEFAULT_CAPTURE_DURATION = 600
+RUNTIME_UPDATE_INTERVAL = 60
+CACHE_SAVE_DELAY = 60
+# zones the controller may report, with the external temperature sensor option of each
+ZONE_TEMP_SENSORS = {
+    "A": CONF_TEMP_SENSOR_A,
+    "B": CONF_TEMP_SENSOR_B,
+    "C": CONF_TEMP_SENSOR_C,
+    "D": CONF_TEMP_SENSOR_D,
+    "U": CONF_TEMP_SENSOR_COMMON,
+}
+ZONE_IDS = tuple(ZONE_TEMP_SENSORS)
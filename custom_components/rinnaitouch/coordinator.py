@@ -0,0 +1,378 @@
+"""Coordinator fanning out controller status pushes to the entities."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+
+from pyrinnaitouch import RinnaiSystem, RinnaiSystemStatus
+from pyrinnaitouch.pollconnection import RinnaiConnectionState
+
+from .command_queue import RinnaiCommandQueue
+from .const import DEFAULT_DEBOUNCE, DOMAIN, OPTIMISTIC_TIMEOUT, STALE_GRACE
+from .snapshot import RinnaiSnapshot, overlay_status, status_value
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class OptimisticValue:
+    """A status value shown ahead of the controller confirming it."""
+
+    value: Any
+    previous: Any
+    since: float
+    cancel_timeout: CALLBACK_TYPE
+
+
+class RinnaiCoordinator:
+    """Receive status pushes from one controller and write state for all entities.
+
+    The controller pushes a full status frame every few seconds, the
+    transport receives it on the event loop. Rather than every entity
+    subscribing to the system on its own, the coordinator subscribes once
+    and then writes the state of all registered entities in one batch.
+
+    The status is resolved into an immutable RinnaiSnapshot once per frame,
+    entities read their state from ``data``. Listeners
+    may register the snapshot fields they depend on, they are then only run
+    when one of those fields changed from the previous frame.
+
+    After a command entities set the status values they expect with
+    ``async_set_optimistic``. Those are applied on top of the received
+    status until a frame reports them (confirmed, the latency is kept in
+    ``confirmation_latency``), reports another change of the value
+    (superseded) or OPTIMISTIC_TIMEOUT passes (rolled back).
+
+    After a restart the coordinator may start from a status restored from
+    the cache, ``restored`` is then set until the first frame arrives.
+
+    While the connection is lost the last received snapshot is kept and
+    ``stale`` is set, entities only become unavailable when the transport
+    did not reconnect within STALE_GRACE. Short drops then don't flap every
+    entity to unavailable and back.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        system: RinnaiSystem,
+        debounce: float = DEFAULT_DEBOUNCE,
+        restored: bool = False,
+    ) -> None:
+        self.hass = hass
+        self.system = system
+        self.commands = RinnaiCommandQueue(hass, system, debounce)
+        self.data = RinnaiSnapshot.from_status(system.get_stored_status())
+        self._latest = self.data
+        self._received = self.data
+        self._optimistic: dict[str, OptimisticValue] = {}
+        self.confirmation_latency: float | None = None
+        self._listeners: dict[CALLBACK_TYPE, tuple[str, ...] | None] = {}
+        self._ready_listeners: list[Callable[[RinnaiSnapshot], None]] = []
+        self._status_waiters: list[
+            tuple[Callable[[RinnaiSnapshot], bool], asyncio.Future]
+        ] = []
+        self.stale = False
+        self._cancel_stale: CALLBACK_TYPE | None = None
+        self.restored = restored
+
+    @property
+    def received(self) -> RinnaiSnapshot:
+        """Return the snapshot of the last received frame, without optimistic values."""
+        return self._received
+
+    def start(self) -> None:
+        """Subscribe to status pushes from the controller."""
+        self.system.subscribe_updates(self._system_updated)
+        self.system.register_socket_state_handler(self._connection_state_changed)
+        self.commands.start()
+
+    def stop(self) -> None:
+        """Unsubscribe from status pushes from the controller."""
+        self.system.unregister_socket_state_handler(self._connection_state_changed)
+        if self._cancel_stale is not None:
+            self._cancel_stale()
+            self._cancel_stale = None
+        self.commands.stop()
+        for optimistic in self._optimistic.values():
+            optimistic.cancel_timeout()
+        self._optimistic.clear()
+        for _check, future in self._status_waiters:
+            future.cancel()
+        try:
+            self.system.unsubscribe_updates(self._system_updated)
+        except ValueError:
+            _LOGGER.debug("Coordinator was not subscribed to system updates")
+
+    @callback
+    def _connection_state_changed(self, state: RinnaiConnectionState) -> None:
+        """Keep the last snapshot while reconnecting, start the grace period."""
+        if state == RinnaiConnectionState.CONNECTED:
+            # stays stale and the grace period runs on until the next frame
+            # arrives, a module which takes the connection but sends nothing
+            # is dropped again after NO_DATA_TIMEOUT
+            return
+        if not self.stale:
+            self.stale = True
+            self._cancel_stale = async_call_later(
+                self.hass, STALE_GRACE, self._async_stale_expired
+            )
+            # show the kept snapshot as stale
+            self.async_update_listeners()
+
+    @callback
+    def _async_stale_expired(self, _now) -> None:
+        """Make the entities unavailable, the connection did not come back in time."""
+        self._cancel_stale = None
+        _LOGGER.warning(
+            "Controller not reconnected within %ss, marking entities unavailable",
+            STALE_GRACE,
+        )
+        snapshot = RinnaiSnapshot.from_status(RinnaiSystemStatus())
+        changed = snapshot.changed_fields(self._latest)
+        self._latest = snapshot
+        self._async_set_snapshot(snapshot, changed)
+
+    @callback
+    def _system_updated(self) -> None:
+        """Fan out a new status, the transport calls this on the event loop."""
+        if self._cancel_stale is not None:
+            self._cancel_stale()
+            self._cancel_stale = None
+        stale, self.stale = self.stale, False
+        restored, self.restored = self.restored, False
+        snapshot = RinnaiSnapshot.from_status(self.system.get_stored_status())
+        changed = snapshot.changed_fields(self._latest)
+        self._latest = snapshot
+        self._async_set_snapshot(snapshot, changed)
+        if restored or stale:
+            # also clear the flags of the entities the frame did not change
+            self.async_update_listeners()
+
+    @callback
+    def _async_set_snapshot(self, snapshot: RinnaiSnapshot, changed: set[str]) -> None:
+        """Store the snapshot of the latest frame and update the affected entities."""
+        self._received = snapshot
+        for check, future in self._status_waiters:
+            if not future.done() and check(snapshot):
+                future.set_result(None)
+        if self._optimistic or self.data is not self._latest:
+            self._async_reconcile(snapshot)
+            snapshot = self._overlaid(snapshot)
+            changed = snapshot.changed_fields(self.data)
+        self.data = snapshot
+        if snapshot.available and self._ready_listeners:
+            ready_listeners, self._ready_listeners = self._ready_listeners, []
+            for ready_callback in ready_listeners:
+                ready_callback(snapshot)
+        if changed:
+            self.async_update_listeners(changed)
+
+    @callback
+    def async_set_optimistic(self, values: dict[str, Any]) -> None:
+        """Show status values expected after a command until a frame confirms them.
+
+        Values are named like the snapshot fields, e.g. ``system_on``,
+        ``unit_status.set_temp`` or ``zones.A.user_enabled``.
+        """
+        status = self._received.status
+        now = time.monotonic()
+        for path, value in values.items():
+            if (optimistic := self._optimistic.pop(path, None)) is not None:
+                optimistic.cancel_timeout()
+                previous = optimistic.previous
+            else:
+                previous = status_value(status, path)
+            self._optimistic[path] = OptimisticValue(
+                value,
+                previous,
+                now,
+                async_call_later(
+                    self.hass, OPTIMISTIC_TIMEOUT, partial(self._async_expire, path)
+                ),
+            )
+        self._async_show(self._overlaid(self._received))
+
+    async def async_wait_for_status(
+        self, check: Callable[[RinnaiSnapshot], bool], timeout: float
+    ) -> bool:
+        """Wait for a received frame passing the check, False if none did in time.
+
+        Optimistic values are not taken into account, the check sees what
+        the controller reported. Returns at once if the last frame passes.
+        """
+        if check(self._received):
+            return True
+        waiter = (check, self.hass.loop.create_future())
+        self._status_waiters.append(waiter)
+        try:
+            async with asyncio.timeout(timeout):
+                await waiter[1]
+        except TimeoutError:
+            return False
+        finally:
+            self._status_waiters.remove(waiter)
+        return True
+
+    @callback
+    def _async_reconcile(self, snapshot: RinnaiSnapshot) -> None:
+        """Drop the optimistic values a received frame confirmed or superseded."""
+        for path, optimistic in list(self._optimistic.items()):
+            reported = status_value(snapshot.status, path)
+            if _same_value(reported, optimistic.value):
+                self.confirmation_latency = time.monotonic() - optimistic.since
+                _LOGGER.debug(
+                    "Confirmed %s after %.2fs", path, self.confirmation_latency
+                )
+            elif _same_value(reported, optimistic.previous):
+                continue
+            else:
+                _LOGGER.debug("Optimistic %s superseded by %s", path, reported)
+            optimistic.cancel_timeout()
+            del self._optimistic[path]
+
+    @callback
+    def _async_expire(self, path: str, _now) -> None:
+        """Roll back an optimistic value the controller did not confirm in time."""
+        if self._optimistic.pop(path, None) is None:
+            return
+        _LOGGER.warning(
+            "Controller did not confirm %s within %ss, rolling back",
+            path,
+            OPTIMISTIC_TIMEOUT,
+        )
+        self._async_show(self._overlaid(self._received))
+
+    def _overlaid(self, snapshot: RinnaiSnapshot) -> RinnaiSnapshot:
+        """Return the snapshot with the pending optimistic values applied."""
+        if not self._optimistic:
+            return snapshot
+        return RinnaiSnapshot.from_status(
+            overlay_status(
+                snapshot.status,
+                {path: optimistic.value for path, optimistic in self._optimistic.items()},
+            )
+        )
+
+    @callback
+    def _async_show(self, snapshot: RinnaiSnapshot) -> None:
+        """Replace the shown snapshot and update the entities affected."""
+        changed = snapshot.changed_fields(self.data)
+        self.data = snapshot
+        if changed:
+            self.async_update_listeners(changed)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, fields: Iterable[str] | None = None
+    ) -> CALLBACK_TYPE:
+        """Register a callback run on status updates, return its remover.
+
+        With ``fields`` the callback only runs when one of the named snapshot
+        fields (see RinnaiSnapshot.changed_fields) changed, a field also
+        matches changes to its dotted children and parents.
+        """
+        self._listeners[update_callback] = None if fields is None else tuple(fields)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(update_callback, None)
+
+        return remove_listener
+
+    @callback
+    def async_add_ready_listener(
+        self, ready_callback: Callable[[RinnaiSnapshot], None]
+    ) -> CALLBACK_TYPE:
+        """Run a callback once with the first complete frame, return its remover.
+
+        Capabilities and zones are only known once the controller sent a
+        frame, entities depending on them are created from this callback.
+        """
+        if self.data.available:
+            ready_callback(self.data)
+        else:
+            self._ready_listeners.append(ready_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if ready_callback in self._ready_listeners:
+                self._ready_listeners.remove(ready_callback)
+
+        return remove_listener
+
+    @callback
+    def async_remove_stale_entities(
+        self, entry: ConfigEntry, domain: str, unique_id_prefixes: Iterable[str]
+    ) -> None:
+        """Remove registry entries of entities which are not created for this system.
+
+        Unique ids start with a prefix naming the kind of entity, the lower
+        case class name for most, so the entries of the config entry are
+        matched with one set lookup each.
+        """
+        prefixes = set(unique_id_prefixes)
+        if not prefixes:
+            return
+        entity_registry = er.async_get(self.hass)
+        for registry_entry in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        ):
+            if (
+                registry_entry.domain == domain
+                and registry_entry.platform == DOMAIN
+                and registry_entry.unique_id.split("_", 1)[0] in prefixes
+            ):
+                _LOGGER.debug("Removing entity: %s", registry_entry.entity_id)
+                entity_registry.async_remove(registry_entry.entity_id)
+
+    @callback
+    def async_update_listeners(self, changed: set[str] | None = None) -> None:
+        """Run the registered callbacks depending on the changed fields, None for all."""
+        for update_callback, fields in list(self._listeners.items()):
+            if (
+                changed is not None
+                and fields is not None
+                and not _depends_on(fields, changed)
+            ):
+                continue
+            try:
+                update_callback()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error writing state after system update")
+
+
+def _depends_on(fields: tuple[str, ...], changed: set[str]) -> bool:
+    """Return whether any of the fields or their parents or children changed."""
+    for field in fields:
+        if field in changed:
+            return True
+        for name in changed:
+            if name.startswith(field + ".") or field.startswith(name + "."):
+                return True
+    return False
+
+
+def _same_value(reported: Any, value: Any) -> bool:
+    """Compare a reported status value, some numbers are reported as strings."""
+    if reported == value:
+        return True
+    if isinstance(reported, str) and isinstance(value, (int, float)):
+        try:
+            return float(reported) == value
+        except ValueError:
+            return False
+    return False
@@ -0,0 +1,386 @@
+"""Plan the commands taking the system from its status to a desired state.
+
+The ``apply_state`` service names the whole desired state of the unit and
+its zones, the planner compares it to the last received frame, not the
+optimistic values shown, and returns only the commands changing
+something, in the order the controller needs them:
+
+1. the mode and on/off of the unit, as the climate entity sends them
+2. the preset and the target of the unit
+3. per zone on/off, preset and target temperature
+
+Every command carries the status values it is expected to lead to, the
+planner applies them to a predicted snapshot before choosing the next
+command, so e.g. the target setter matches the preset set just before.
+
+The library formats the unit and zone commands with the unit of the last
+received frame and validates them against its mode, and it only reads the
+evap zones while the evap is on. When the first phase sends anything, the
+settings are therefore only planned and sent once the controller reported
+the new mode and on/off state.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, ATTR_PRESET_MODE, HVACMode
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.exceptions import HomeAssistantError
+
+from pyrinnaitouch import RinnaiOperatingMode, RinnaiSystemMode
+
+from .const import (
+    COOLING_COOL,
+    COOLING_EVAP,
+    OPTIMISTIC_TIMEOUT,
+    PRESET_AUTO,
+    STATE_ZONES,
+    ZONE_ENABLED,
+)
+from .coordinator import RinnaiCoordinator
+from .snapshot import TEMPERATURE_LIMITS, RinnaiSnapshot, overlay_status, status_value
+
+_LOGGER = logging.getLogger(__name__)
+
+# zones off in a multi set point system report a set point at or below this
+ZONE_OFF_TEMP = 7
+# library call switching the system to each mode
+MODE_SETTERS = {
+    RinnaiSystemMode.HEATING: "set_heater_mode",
+    RinnaiSystemMode.COOLING: "set_cooling_mode",
+    RinnaiSystemMode.EVAP: "set_evap_mode",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RinnaiDesiredZone:
+    """Desired state of a zone, None leaves a value as it is."""
+
+    enabled: bool | None = None
+    preset_mode: str | None = None
+    temperature: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RinnaiDesiredState:
+    """Desired state of the unit and the zones, None leaves a value as it is."""
+
+    hvac_mode: HVACMode | None = None
+    preset_mode: str | None = None
+    temperature: int | None = None
+    zones: dict[str, RinnaiDesiredZone] = field(default_factory=dict)
+
+    @classmethod
+    def from_service_data(cls, data: Mapping[str, Any]) -> RinnaiDesiredState:
+        """Return the desired state named by the data of an ``apply_state`` call."""
+        return cls(
+            hvac_mode=data.get(ATTR_HVAC_MODE),
+            preset_mode=data.get(ATTR_PRESET_MODE),
+            temperature=_whole(data.get(ATTR_TEMPERATURE)),
+            zones={
+                zone: RinnaiDesiredZone(
+                    enabled=values.get(ZONE_ENABLED),
+                    preset_mode=values.get(ATTR_PRESET_MODE),
+                    temperature=_whole(values.get(ATTR_TEMPERATURE)),
+                )
+                for zone, values in data.get(STATE_ZONES, {}).items()
+            },
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RinnaiCommand:
+    """A library call of a plan and the status values it is expected to lead to."""
+
+    method: str
+    args: tuple = ()
+    optimistic: dict[str, Any] = field(default_factory=dict)
+
+
+def validate_desired_state(snapshot: RinnaiSnapshot, desired: RinnaiDesiredState) -> None:
+    """Raise if the system can't take the state, before sending anything.
+
+    Targets are checked against the limits of the mode and preset they are
+    meant for, HomeAssistantError for a state the system doesn't have,
+    ValueError like the climate entities for a target out of range.
+    """
+    if desired.hvac_mode is not None and desired.hvac_mode not in snapshot.hvac_modes:
+        raise HomeAssistantError(
+            f"HVAC mode {desired.hvac_mode} is not supported, "
+            f"use one of {', '.join(snapshot.hvac_modes)}"
+        )
+    predicted = predict(snapshot, plan_mode(snapshot, desired.hvac_mode))
+    switched = predicted.mode != snapshot.mode
+    if desired.preset_mode is not None:
+        predicted = predict(predicted, [_preset_command(desired.preset_mode)])
+    evap = predicted.cooling_mode == COOLING_EVAP
+    if desired.temperature is not None:
+        if evap and switched and desired.preset_mode is None:
+            # the preset of the evap is only known once it reported
+            raise HomeAssistantError(
+                "Give the preset mode with the temperature when switching to evap, "
+                "the target is a comfort level in Auto and a fan speed in Manual"
+            )
+        _check_range(desired.temperature, predicted.min_temp, predicted.max_temp)
+    for zone, zone_state in desired.zones.items():
+        if snapshot.zones[zone].status is None:
+            raise HomeAssistantError(f"Zone {zone} is not installed")
+        if zone_state.temperature is None:
+            continue
+        if not snapshot.is_multi_set_point:
+            raise HomeAssistantError(
+                f"Zone {zone} has no own temperature, the system has a single set point"
+            )
+        if not evap and zone_state.enabled is not False:
+            _check_range(
+                zone_state.temperature, TEMPERATURE_LIMITS["min"], TEMPERATURE_LIMITS["max"]
+            )
+
+
+def plan_mode(snapshot: RinnaiSnapshot, hvac_mode: HVACMode | None) -> list[RinnaiCommand]:
+    """Return the commands switching the unit to the hvac mode, none if it is in it."""
+    # pylint: disable=too-many-return-statements
+    if hvac_mode is None or hvac_mode == snapshot.hvac_mode:
+        return []
+    if hvac_mode == HVACMode.HEAT:
+        return _turn_on(snapshot, RinnaiSystemMode.HEATING, "turn_heater_on", "set_heater_mode")
+    if hvac_mode == HVACMode.COOL:
+        if snapshot.preferred_cooling_mode == COOLING_COOL:
+            return _turn_on(
+                snapshot, RinnaiSystemMode.COOLING, "turn_cooler_on", "set_cooling_mode"
+            )
+        if snapshot.preferred_cooling_mode == COOLING_EVAP:
+            return _turn_on(snapshot, RinnaiSystemMode.EVAP, "set_evap_mode", "turn_evap_on")
+        return []
+    if hvac_mode == HVACMode.OFF:
+        off = {"system_on": False, "unit_status.is_on": False}
+        if snapshot.cooling_mode == COOLING_EVAP:
+            return [RinnaiCommand("turn_evap_off", optimistic=off)]
+        return [RinnaiCommand("turn_unit_off", optimistic=off)]
+    if hvac_mode == HVACMode.FAN_ONLY and snapshot.cooling_mode != COOLING_EVAP:
+        # the fan is switched on while the unit is off, like the climate entity does
+        return [
+            RinnaiCommand("turn_unit_off"),
+            RinnaiCommand(
+                "turn_unit_fan_only",
+                optimistic={
+                    "mode": snapshot.mode,
+                    "system_on": True,
+                    "unit_status.is_on": False,
+                },
+            ),
+        ]
+    return []
+
+
+def _turn_on(
+    snapshot: RinnaiSnapshot, mode: RinnaiSystemMode, *methods: str
+) -> list[RinnaiCommand]:
+    """Return the commands turning the unit on in a mode, without the mode if it is in it."""
+    if snapshot.mode == mode:
+        methods = tuple(method for method in methods if method != MODE_SETTERS[mode])
+    optimistic = {"mode": mode, "system_on": True, "unit_status.is_on": True}
+    return [RinnaiCommand(method) for method in methods[:-1]] + [
+        RinnaiCommand(methods[-1], optimistic=optimistic)
+    ]
+
+
+def plan_settings(snapshot: RinnaiSnapshot, desired: RinnaiDesiredState) -> list[RinnaiCommand]:
+    """Return the commands setting the preset, the target and the zones of the unit.
+
+    The unit must already be in the mode the settings are meant for and the
+    state must have passed validate_desired_state. Zones turned off in a
+    multi set point system have their set point at 0, a temperature given
+    for them is ignored.
+    """
+    commands: list[RinnaiCommand] = []
+    predicted = snapshot
+
+    def add(command: RinnaiCommand) -> None:
+        nonlocal predicted
+        commands.append(command)
+        predicted = predict(predicted, [command])
+
+    evap = snapshot.cooling_mode == COOLING_EVAP
+    if desired.preset_mode is not None and desired.preset_mode != predicted.preset_mode:
+        add(_preset_command(desired.preset_mode))
+    if desired.temperature is not None:
+        setter, name = _unit_target(predicted)
+        if _reported_int(predicted.status, name) != desired.temperature:
+            add(
+                RinnaiCommand(
+                    setter, (desired.temperature,), {name: desired.temperature}
+                )
+            )
+
+    for zone, zone_state in desired.zones.items():
+        for command in _plan_zone(predicted, zone, zone_state, evap):
+            add(command)
+    return commands
+
+
+def _preset_command(preset_mode: str) -> RinnaiCommand:
+    """Return the command switching the unit to a preset."""
+    auto = preset_mode == PRESET_AUTO
+    return RinnaiCommand(
+        "set_unit_auto" if auto else "set_unit_manual",
+        optimistic={
+            "unit_status.operating_mode": (
+                RinnaiOperatingMode.AUTO if auto else RinnaiOperatingMode.MANUAL
+            )
+        },
+    )
+
+
+def _unit_target(snapshot: RinnaiSnapshot) -> tuple[str, str]:
+    """Return the setter of the unit target and the status value it writes."""
+    if snapshot.cooling_mode == COOLING_EVAP:
+        if snapshot.preset_mode == PRESET_AUTO:
+            return "set_evap_comfort", "unit_status.comfort"
+        return "set_evap_fanspeed", "unit_status.fan_speed"
+    if snapshot.hvac_mode == HVACMode.FAN_ONLY:
+        return "set_unit_fanspeed", "unit_status.fan_speed"
+    return "set_unit_temp", "unit_status.set_temp"
+
+
+def _plan_zone(
+    snapshot: RinnaiSnapshot, zone: str, desired: RinnaiDesiredZone, evap: bool
+) -> list[RinnaiCommand]:
+    """Return the commands bringing one zone to its desired state."""
+    commands = []
+    prefix = "zones." + zone + "."
+    # without evap a multi set point system turns zones off with a set point of 0
+    by_set_point = snapshot.is_multi_set_point and not evap
+    temperature = desired.temperature
+    if by_set_point:
+        enabled = (_reported_int(snapshot.status, prefix + "set_temp") or 0) > ZONE_OFF_TEMP
+        if desired.enabled is False:
+            # off is a set point of 0, a temperature given for the zone is ignored
+            temperature = 0 if enabled else None
+        elif desired.enabled and not enabled and temperature is None:
+            # the set point turns the zone on, the unit target if none is given
+            temperature = min(
+                max(
+                    _reported_int(snapshot.status, "unit_status.set_temp") or 0,
+                    TEMPERATURE_LIMITS["min"],
+                ),
+                TEMPERATURE_LIMITS["max"],
+            )
+    elif desired.enabled is not None and desired.enabled != bool(
+        status_value(snapshot.status, prefix + "user_enabled")
+    ):
+        method = (
+            ("turn_evap_zone_" if evap else "turn_unit_zone_")
+            + ("on" if desired.enabled else "off")
+        )
+        commands.append(
+            RinnaiCommand(method, (zone,), {prefix + "user_enabled": desired.enabled})
+        )
+
+    if desired.preset_mode is not None:
+        auto = desired.preset_mode == PRESET_AUTO
+        if bool(status_value(snapshot.status, prefix + "auto_mode")) != auto:
+            method = (
+                ("set_evap_zone_" if evap else "set_unit_zone_")
+                + ("auto" if auto else "manual")
+            )
+            commands.append(RinnaiCommand(method, (zone,), {prefix + "auto_mode": auto}))
+
+    if by_set_point and temperature is not None:
+        if _reported_int(snapshot.status, prefix + "set_temp") != temperature:
+            commands.append(
+                RinnaiCommand(
+                    "set_unit_zone_temp",
+                    (zone, temperature),
+                    {prefix + "set_temp": temperature},
+                )
+            )
+    return commands
+
+
+def predict(snapshot: RinnaiSnapshot, commands: list[RinnaiCommand]) -> RinnaiSnapshot:
+    """Return the snapshot expected once the controller took the commands."""
+    values = {}
+    for command in commands:
+        values.update(command.optimistic)
+    if not values:
+        return snapshot
+    return RinnaiSnapshot.from_status(overlay_status(snapshot.status, values))
+
+
+async def async_apply_desired_state(
+    coordinator: RinnaiCoordinator, desired: RinnaiDesiredState
+) -> int:
+    """Send the commands bringing the system to the desired state, return how many.
+
+    Nothing is sent if the state can't be taken (see validate_desired_state),
+    HomeAssistantError is raised if the controller did not report the new
+    mode within OPTIMISTIC_TIMEOUT.
+    """
+    received = coordinator.received
+    validate_desired_state(received, desired)
+    commands = plan_mode(received, desired.hvac_mode)
+    await _async_send(coordinator, commands)
+    has_settings = desired.preset_mode is not None or desired.temperature is not None
+    if commands and (has_settings or desired.zones):
+        # unit commands go to the unit of the received mode and evap zone
+        # values are only reported while the evap is on
+        predicted = predict(received, commands)
+        mode, system_on = predicted.mode, predicted.system_on
+        if not await coordinator.async_wait_for_status(
+            lambda snapshot: snapshot.mode == mode and snapshot.system_on == system_on,
+            OPTIMISTIC_TIMEOUT,
+        ):
+            raise HomeAssistantError(
+                f"Controller did not switch to {mode} within {OPTIMISTIC_TIMEOUT}s, "
+                "the unit and zone settings were not sent"
+            )
+    settings = plan_settings(coordinator.received, desired)
+    await _async_send(coordinator, settings)
+    _LOGGER.debug(
+        "Applied the desired state with %d commands: %s",
+        len(commands) + len(settings),
+        ", ".join(command.method for command in commands + settings) or "none",
+    )
+    return len(commands) + len(settings)
+
+
+async def _async_send(coordinator: RinnaiCoordinator, commands: list[RinnaiCommand]) -> None:
+    """Issue the commands, the command queue sends them batched."""
+    system = coordinator.system
+    for command in commands:
+        if not await getattr(system, command.method)(*command.args):
+            _LOGGER.warning(
+                "Command %s not valid in mode %s, not sent",
+                command.method,
+                system.get_stored_status().mode,
+            )
+            continue
+        if command.optimistic:
+            coordinator.async_set_optimistic(command.optimistic)
+
+
+def _check_range(value: int, minimum: float, maximum: float) -> None:
+    """Raise ValueError like the climate entities for a target out of range."""
+    if not minimum <= value <= maximum:
+        raise ValueError(
+            f"Target temperature ({value}) must be between {minimum} and {maximum}."
+        )
+
+
+def _reported_int(status, path: str) -> int | None:
+    """Return a numeric status value as int, some are reported as strings."""
+    value = status_value(status, path)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _whole(value: float | None) -> int | None:
+    """Round a target like the climate entities, None stays None."""
+    return None if value is None else int(round(value))
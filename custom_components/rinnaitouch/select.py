@@ -4,9 +4,10 @@
 from homeassistant.components.select import SelectEntity
 from homeassistant.const import CONF_NAME, CONF_HOST
 
-from pyrinnaitouch import RinnaiSystem, RinnaiOperatingMode
+from pyrinnaitouch import RinnaiOperatingMode
 
-from .const import PRESET_AUTO, PRESET_MANUAL, DEFAULT_NAME
+from . import RinnaiData, RinnaiEntity
+from .const import PRESET_AUTO, PRESET_MANUAL, DEFAULT_NAME, DOMAIN
 
 # _LOGGER = logging.getLogger(__name__)
 
@@ -15,64 +16,36 @@ async def async_setup_entry(
     hass, entry, async_add_entities
 ):  # pylint: disable=unused-argument
     """Set up the preset select entities."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
     ip_address = entry.data.get(CONF_HOST)
     name = entry.data.get(CONF_NAME)
     if name == "":
         name = DEFAULT_NAME
-    async_add_entities([RinnaiSelectPresetEntity(ip_address, name)])
+    async_add_entities([RinnaiSelectPresetEntity(coordinator, ip_address, name)])
     return True
 
 
-class RinnaiSelectPresetEntity(SelectEntity):
+class RinnaiSelectPresetEntity(RinnaiEntity, SelectEntity):
     """A preset select entity."""
 
-    def __init__(self, ip_address, name):
-        self._host = ip_address
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = (
-            str.lower(self.__class__.__name__) + "_" + str.replace(ip_address, ".", "_")
-        )
+    _attr_icon = "mdi:format-list-group"
 
-        self._attr_unique_id = device_id
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Preset Select"
-        self._attr_device_name = name
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
-
-    @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
-    @property
-    def name(self):
-        """Name of the entity."""
-        return self._attr_name
 
     @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:format-list-group"
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("unit_status.operating_mode",)
 
     @property
     def current_option(self):
         """If the switch is currently on or off."""
         # pylint: disable=too-many-return-statements
         if (
-            self._system.get_stored_status().unit_status.operating_mode
+            self._coordinator.data.unit_status.operating_mode
             == RinnaiOperatingMode.AUTO
         ):
             return PRESET_AUTO
@@ -86,6 +59,12 @@ class RinnaiSelectPresetEntity(SelectEntity):
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         if option == PRESET_AUTO:
-            await self._system.set_unit_auto()
+            sent = await self._system.set_unit_auto()
+            operating_mode = RinnaiOperatingMode.AUTO
         else:
-            await self._system.set_unit_manual()
+            sent = await self._system.set_unit_manual()
+            operating_mode = RinnaiOperatingMode.MANUAL
+        if sent:
+            self._coordinator.async_set_optimistic(
+                {"unit_status.operating_mode": operating_mode}
+            )
@@ -4,174 +4,183 @@ from __future__ import annotations
 
 # import logging
 
+import time
+from datetime import timedelta
+from functools import partial
+
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 
-from homeassistant.const import UnitOfTemperature
-from homeassistant.const import CONF_NAME, CONF_HOST
+from homeassistant.const import (
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.const import CONF_NAME, CONF_HOST, EntityCategory
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import (
+    async_track_time_change,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
 
 from pyrinnaitouch import (
-    RinnaiSystem,
+    RinnaiCapabilities,
     RinnaiSchedulePeriod,
     RinnaiSystemMode,
     RinnaiOperatingMode,
-    RinnaiSystemStatus,
 )
 
+from . import RinnaiData, RinnaiEntity, entry_option, zone_name
 from .const import (
-    CONF_ZONE_A,
-    CONF_ZONE_B,
-    CONF_ZONE_C,
-    CONF_ZONE_D,
-    CONF_ZONE_COMMON,
+    CONF_BURNER_RATING,
+    CONF_COMPRESSOR_RATING,
     DEFAULT_NAME,
+    DOMAIN,
+    RUNTIME_UPDATE_INTERVAL,
+    ZONE_IDS,
 )
+from .coordinator import RinnaiCoordinator
+from .snapshot import RinnaiSnapshot, UNIT_FLAG_BITS, ZONE_FLAG_BITS
+from .transport import RinnaiTransport
 
 # _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):  # pylint: disable=unused-argument
     """Set up the sensor entities."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
     ip_address = entry.data.get(CONF_HOST)
     name = entry.data.get(CONF_NAME)
     if name == "":
         name = DEFAULT_NAME
+    # report the connection, also while no frame was received
     async_add_entities(
-        [
-            RinnaiMainTemperatureSensor(ip_address, name, "temperature"),
-            RinnaiMainTemperatureSensor(ip_address, name, "set_temp"),
-            RinnaiSchedulePeriodSensor(ip_address, name),
-            RinnaiAdvancePeriodSensor(ip_address, name),
-            RinnaiConnectionStateSensor(ip_address, name),
+        [RinnaiConnectionStateSensor(coordinator, ip_address, name)]
+        + [
+            RinnaiConnectionStatsSensor(coordinator, ip_address, name, stat)
+            for stat in CONNECTION_STATS
         ]
     )
-    if entry.data.get(CONF_ZONE_A):
-        async_add_entities(
-            [
-                RinnaiZoneTemperatureSensor(ip_address, "A", name, "set_temp"),
-                RinnaiZoneTemperatureSensor(ip_address, "A", name, "temperature"),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_B):
-        async_add_entities(
-            [
-                RinnaiZoneTemperatureSensor(ip_address, "B", name, "set_temp"),
-                RinnaiZoneTemperatureSensor(ip_address, "B", name, "temperature"),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_C):
-        async_add_entities(
-            [
-                RinnaiZoneTemperatureSensor(ip_address, "C", name, "set_temp"),
-                RinnaiZoneTemperatureSensor(ip_address, "C", name, "temperature"),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_D):
-        async_add_entities(
-            [
-                RinnaiZoneTemperatureSensor(ip_address, "D", name, "set_temp"),
-                RinnaiZoneTemperatureSensor(ip_address, "D", name, "temperature"),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_COMMON):
-        async_add_entities(
-            [
-                RinnaiZoneTemperatureSensor(ip_address, "U", name, "set_temp"),
-                RinnaiZoneTemperatureSensor(ip_address, "U", name, "temperature"),
-            ]
+
+    # energy sensors by flag, added and removed when the ratings change
+    energy_sensors: dict[str, RinnaiEnergySensor] = {}
+
+    @callback
+    def energy_sensors_for(snapshot: RinnaiSnapshot) -> list[RinnaiEnergySensor]:
+        """Create the energy sensors of rated flags which have none yet."""
+        entities = []
+        for flag, (conf_rating, energy_label) in ENERGY_RATINGS.items():
+            capability = RUNTIME_FLAGS[flag][0]
+            if flag in energy_sensors or capability not in snapshot.capabilities:
+                continue
+            if rating := entry_option(entry, conf_rating):
+                energy_sensors[flag] = RinnaiEnergySensor(
+                    coordinator, ip_address, name, flag, energy_label, rating
+                )
+                entities.append(energy_sensors[flag])
+        return entities
+
+    @callback
+    def add_sensors(snapshot: RinnaiSnapshot):
+        """Add the sensors for the unit and the zones of the system."""
+        entities = [
+            RinnaiMainTemperatureSensor(coordinator, ip_address, name, "temperature"),
+            RinnaiMainTemperatureSensor(coordinator, ip_address, name, "set_temp"),
+            RinnaiSchedulePeriodSensor(coordinator, ip_address, name),
+            RinnaiAdvancePeriodSensor(coordinator, ip_address, name),
+        ]
+        entities.extend(
+            RinnaiZoneTemperatureSensor(coordinator, ip_address, zone, name, temp_attr)
+            for zone in snapshot.reported_zones
+            for temp_attr in ("set_temp", "temperature")
         )
+        for flag, (capability, label) in RUNTIME_FLAGS.items():
+            if capability is not None and capability not in snapshot.capabilities:
+                continue
+            for daily in (False, True):
+                entities.append(
+                    RinnaiRuntimeSensor(coordinator, ip_address, name, flag, label, daily=daily)
+                )
+                if flag in ZONE_FLAG_BITS:
+                    entities.extend(
+                        RinnaiRuntimeSensor(
+                            coordinator, ip_address, name, flag, label, zone, daily
+                        )
+                        for zone in snapshot.reported_zones
+                    )
+        entities.extend(energy_sensors_for(snapshot))
+        async_add_entities(entities)
+
+    async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Apply changed ratings to the energy sensors without a reload."""
+        for flag, (conf_rating, _) in ENERGY_RATINGS.items():
+            if (sensor := energy_sensors.get(flag)) is None:
+                continue
+            if rating := entry_option(entry, conf_rating):
+                sensor.set_rating(rating)
+            else:
+                del energy_sensors[flag]
+                if sensor.registry_entry is not None:
+                    # also removes the entity from hass
+                    er.async_get(hass).async_remove(sensor.entity_id)
+        if coordinator.data.available and (added := energy_sensors_for(coordinator.data)):
+            async_add_entities(added)
+
+    entry.async_on_unload(coordinator.async_add_ready_listener(add_sensors))
+    entry.async_on_unload(entry.add_update_listener(async_options_updated))
     return True
 
 
-class RinnaiTemperatureSensor(SensorEntity):
+class RinnaiTemperatureSensor(RinnaiEntity, SensorEntity):
     """Representation of a Sensor."""
 
-    # pylint: disable=too-many-instance-attributes
-
-    def __init__(self, ip_address, name):
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = (
-            str.lower(self.__class__.__name__) + "_" + str.replace(ip_address, ".", "_")
-        )
-
-        self._host = ip_address
-        self._attr_unique_id = device_id
-        self._attr_name = name
-        self._attr_device_name = name
-
-        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-        self._attr_device_class = SensorDeviceClass.TEMPERATURE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
-
-    @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
-    @property
-    def name(self):
-        """Name of the entity."""
-        return self._attr_name.replace("Zone U", "Common Zone")
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:thermometer"
-
-    def update(self) -> None:
-        """Fetch new state data for the sensor.
-        This is the only method that should fetch new data for Home Assistant.
-        """
-        self._attr_native_value = 0
+    _attr_icon = "mdi:thermometer"
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
 
 
 class RinnaiMainTemperatureSensor(RinnaiTemperatureSensor):
     """Temparature sensor on the main unit"""
 
-    def __init__(self, ip_address, name, temp_attr):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name, temp_attr):
+        super().__init__(coordinator, ip_address, name)
         if temp_attr == "set_temp":
             self._attr_name = name + " Main Target Temperature Sensor"
         else:
             self._attr_name = name + " Main Temperature Sensor"
         self._temp_attr = temp_attr
-        device_id = (
+        self._attr_unique_id = (
             str.lower(self.__class__.__name__)
             + "_"
             + temp_attr
             + "_"
             + str.replace(ip_address, ".", "_")
         )
-
-        self._attr_unique_id = device_id
         self.multiplier = 10
         if self._temp_attr == "set_temp":
             self.multiplier = 1
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("mode", f"unit_status.{self._temp_attr}")
+
     @property
     def native_value(self) -> float:
         """Fetch new state data for the sensor.
         This is the only method that should fetch new data for Home Assistant.
         """
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING):
             return float(getattr(state.unit_status, self._temp_attr)) / self.multiplier
         if state.mode == RinnaiSystemMode.EVAP and self._temp_attr == "temperature":
@@ -186,15 +195,14 @@ class RinnaiMainTemperatureSensor(RinnaiTemperatureSensor):
 class RinnaiZoneTemperatureSensor(RinnaiTemperatureSensor):
     """Temperature sensor on a zone."""
 
-    def __init__(self, ip_address, zone, name, temp_attr="temperature"):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, zone, name, temp_attr="temperature"):
+        super().__init__(coordinator, ip_address, name, zone)
         if temp_attr == "set_temp":
-            self._attr_name = name + " Zone " + zone + " Target Temperature Sensor"
+            self._attr_name = f"{name} {zone_name(zone)} Target Temperature Sensor"
         else:
-            self._attr_name = name + " Zone " + zone + " Temperature Sensor"
-        self._attr_zone = zone
+            self._attr_name = f"{name} {zone_name(zone)} Temperature Sensor"
         self._temp_attr = temp_attr
-        device_id = (
+        self._attr_unique_id = (
             str.lower(self.__class__.__name__)
             + "_"
             + temp_attr
@@ -202,18 +210,21 @@ class RinnaiZoneTemperatureSensor(RinnaiTemperatureSensor):
             + zone
             + str.replace(ip_address, ".", "_")
         )
-
-        self._attr_unique_id = device_id
         self.multiplier = 10
         if self._temp_attr == "set_temp":
             self.multiplier = 1
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("mode", f"zones.{self._attr_zone}.{self._temp_attr}")
+
     @property
     def native_value(self) -> float:
         """Fetch new state data for the sensor.
         This is the only method that should fetch new data for Home Assistant.
         """
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if (
             state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING)
             and self._attr_zone in state.unit_status.zones.keys()
@@ -248,56 +259,29 @@ class RinnaiZoneTemperatureSensor(RinnaiTemperatureSensor):
         return self.native_value < 99 and self.native_value > 0
 
 
-class RinnaiPeriodSensor(SensorEntity):
+class RinnaiPeriodSensor(RinnaiEntity, SensorEntity):
     """Representation of a Sensor."""
 
-    def __init__(self, ip_address, name):
-        self._system = RinnaiSystem.get_instance(ip_address)
-        device_id = (
-            str.lower(self.__class__.__name__) + "_" + str.replace(ip_address, ".", "_")
-        )
-
-        self._host = ip_address
-        self._attr_unique_id = device_id
-        self._attr_name = name
-        self._attr_device_name = name
+    def __init__(self, coordinator: RinnaiCoordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_period = None
 
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
-
     @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
-    @property
-    def name(self):
-        """Name of the entity."""
-        return self._attr_name.replace("Zone U", "Common Zone")
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:calendar-question"
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            "mode",
+            "system_on",
+            "unit_status.is_on",
+            "unit_status.operating_mode",
+            "unit_status.advanced",
+            f"unit_status.{self._attr_period}",
+        )
 
     @property
     def native_value(self) -> str | None:
         """Fetch new state data for the sensor."""
-        state = self._system.get_stored_status()
+        state = self._coordinator.data
         if not state.system_on:
             return "N/A"
         if (
@@ -327,71 +311,230 @@ class RinnaiPeriodSensor(SensorEntity):
 class RinnaiSchedulePeriodSensor(RinnaiPeriodSensor):
     """Main on/off switch for the system."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    _attr_icon = "mdi:calendar-month"
+
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Schedule Time Period Sensor"
         self._attr_period = "schedule_period"
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:calendar-month"
-
 
 class RinnaiAdvancePeriodSensor(RinnaiPeriodSensor):
     """Main on/off switch for the system."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    _attr_icon = "mdi:calendar-arrow-right"
+
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Advance Time Period Sensor"
         self._attr_period = "advance_period"
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:calendar-arrow-right"
-
     @property
     def native_value(self):
-        if self._system.get_stored_status().unit_status.advanced:
+        if self._coordinator.data.unit_status.advanced:
             return super().native_value
         return "N/A"
 
 
-class RinnaiConnectionStateSensor(SensorEntity):
+# flags with runtime sensors: capability needed, None for all systems, and label
+RUNTIME_FLAGS = {
+    "gas_valve_active": (RinnaiCapabilities.HEATER, "Burner"),
+    "compressor_active": (RinnaiCapabilities.COOLER, "Compressor"),
+    "pump_operating": (RinnaiCapabilities.EVAP, "Pump"),
+    "fan_operating": (None, "Fan"),
+}
+# flags with an energy estimate: rating option in kW and label
+ENERGY_RATINGS = {
+    "gas_valve_active": (CONF_BURNER_RATING, "Estimated Gas Energy"),
+    "compressor_active": (CONF_COMPRESSOR_RATING, "Estimated Compressor Energy"),
+}
+
+
+class RinnaiRuntimeSensor(RinnaiEntity, RestoreSensor):
+    """Time a flag of the unit or a zone was on, in total or today.
+
+    The on-time is added up when the flag changes, and the value includes
+    the time since while it is on, so it is written every
+    RUNTIME_UPDATE_INTERVAL while running. The unit counts as running when
+    the unit or any zone reports the flag, multi set point systems report
+    it per zone. The value is restored after a restart, the daily value
+    only on the same day and reset at midnight.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:timer-outline"
+    # value added per second on
+    _scale = 1 / 3600
+
+    def __init__(
+        self,
+        coordinator: RinnaiCoordinator,
+        ip_address,
+        name,
+        flag,
+        label,
+        zone=None,
+        daily=False,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        super().__init__(coordinator, ip_address, name, zone)
+        self._flag = flag
+        self._daily = daily
+        self._unit_bit = UNIT_FLAG_BITS[flag]
+        self._zone_bit = ZONE_FLAG_BITS.get(flag, 0)
+        self._value = 0.0
+        self._on_since: float | None = None
+        period = "today" if daily else "total"
+        self._attr_unique_id = (
+            f"runtime_{flag}_{period}_{zone or ''}{str.replace(ip_address, '.', '_')}"
+        )
+        prefix = name if zone is None else f"{name} {zone_name(zone)}"
+        self._attr_name = f"{prefix} {label} Runtime" + (" Today" if daily else "")
+        if zone is not None:
+            self._attr_entity_registry_enabled_default = False
+
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        if self._attr_zone is not None:
+            return (f"zones.{self._attr_zone}.flags.{self._flag}",)
+        if not self._zone_bit:
+            return (f"flags.{self._flag}",)
+        return (f"flags.{self._flag}",) + tuple(
+            f"zones.{zone}.flags.{self._flag}" for zone in ZONE_IDS
+        )
+
+    def _running(self) -> bool:
+        """Return whether the flag is on in the latest frame."""
+        state: RinnaiSnapshot = self._coordinator.data
+        if self._attr_zone is not None:
+            return bool(state.zones[self._attr_zone].flags & self._zone_bit)
+        return bool(state.flags & self._unit_bit) or any(
+            zone.flags & self._zone_bit for zone in state.zones.values()
+        )
+
+    def _accumulate(self) -> None:
+        """Add the time on since the last change and restart from now."""
+        now = time.monotonic()
+        if self._on_since is not None:
+            self._value += (now - self._on_since) * self._scale
+        self._on_since = now if self._running() else None
+
+    async def async_added_to_hass(self):
+        """Restore the value and start counting."""
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_sensor_data()
+        if (
+            last_state is not None
+            and last_data is not None
+            and last_data.native_value is not None
+            and (
+                not self._daily
+                or dt_util.as_local(last_state.last_updated).date()
+                == dt_util.now().date()
+            )
+        ):
+            self._value = float(last_data.native_value)
+        self._accumulate()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=RUNTIME_UPDATE_INTERVAL)
+            )
+        )
+        if self._daily:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_new_day, hour=0, minute=0, second=0
+                )
+            )
+
+    @callback
+    def system_updated(self):
+        """Add up the time on when the flag changed."""
+        self._accumulate()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_tick(self, _now) -> None:
+        """Move the value on while the flag is on."""
+        if self._on_since is not None:
+            self.async_write_ha_state()
+
+    @callback
+    def _async_new_day(self, _now) -> None:
+        """Start the daily value over."""
+        self._accumulate()
+        self._value = 0.0
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float:
+        """Return the value including the time on since the last change."""
+        value = self._value
+        if self._on_since is not None:
+            value += (time.monotonic() - self._on_since) * self._scale
+        return round(value, 3)
+
+
+class RinnaiEnergySensor(RinnaiRuntimeSensor):
+    """Energy used by the burner or compressor, estimated from its runtime."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_icon = "mdi:lightning-bolt"
+
+    def __init__(self, coordinator, ip_address, name, flag, label, rating):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        super().__init__(coordinator, ip_address, name, flag, label)
+        # the rating in kW, so kWh per second on
+        self._scale = rating / 3600
+        self._attr_unique_id = f"energy_{flag}_{str.replace(ip_address, '.', '_')}"
+        self._attr_name = f"{name} {label}"
+
+    @callback
+    def set_rating(self, rating):
+        """Estimate with another rating in kW from now on."""
+        self._accumulate()
+        self._scale = rating / 3600
+        self.async_write_ha_state()
+
+
+class RinnaiConnectionStateSensor(RinnaiEntity, SensorEntity):
     """Sensor for reporting the latest connection state."""
 
-    def __init__(self, ip_address, name):
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        self._host = ip_address
+    def __init__(self, coordinator: RinnaiCoordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_unique_id = f"connection_state_{str.replace(ip_address, '.', '_')}"
         self._attr_name = f"{name} Connection State"
-        self._attr_device_name = name
         self._connection_state = None
+
+    async def async_added_to_hass(self):
+        """Subscribe to connection state changes while added to hass."""
+        await super().async_added_to_hass()
         self._system.register_socket_state_handler(self._connection_state_handler)
+        self.async_on_remove(
+            partial(
+                self._system.unregister_socket_state_handler,
+                self._connection_state_handler,
+            )
+        )
 
+    @callback
     def _connection_state_handler(self, state):
         """Handle connection state updates from pyrinnaitouch."""
-        try:
-            self._connection_state = getattr(state, "name", str(state))
-            self.schedule_update_ha_state()
-        except Exception:  # pylint: disable=broad-except
-            pass
+        self._connection_state = getattr(state, "name", str(state))
+        self.async_write_ha_state()
 
     @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
-    @property
-    def name(self):
-        """Name of the entity."""
-        return self._attr_name
+    def status_fields(self):
+        """Connection state is pushed by the socket handler, not by frames."""
+        return ()
 
     @property
     def icon(self):
@@ -414,3 +557,162 @@ class RinnaiConnectionStateSensor(SensorEntity):
     def available(self):
         """Sensor is always available."""
         return True
+
+
+# statistic: name, unit, device class, state class, icon, value
+CONNECTION_STATS = {
+    "frames_per_minute": (
+        "Frames Per Minute",
+        "frames/min",
+        None,
+        SensorStateClass.MEASUREMENT,
+        "mdi:swap-vertical",
+        lambda stats, _transport: stats.frames_per_minute(),
+    ),
+    "frame_age": (
+        "Last Frame Age",
+        UnitOfTime.SECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-sand",
+        lambda stats, _transport: _rounded(stats.frame_age()),
+    ),
+    "latency_p50": (
+        "Command Latency P50",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-outline",
+        lambda stats, _transport: _rounded(stats.latency(0.5), 1000),
+    ),
+    "latency_p95": (
+        "Command Latency P95",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-alert-outline",
+        lambda stats, _transport: _rounded(stats.latency(0.95), 1000),
+    ),
+    "reconnects": (
+        "Reconnects",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:restart",
+        lambda stats, _transport: stats.reconnects,
+    ),
+    "bytes_in": (
+        "Bytes Received",
+        UnitOfInformation.BYTES,
+        SensorDeviceClass.DATA_SIZE,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:download-network",
+        lambda stats, _transport: stats.bytes_in,
+    ),
+    "bytes_out": (
+        "Bytes Sent",
+        UnitOfInformation.BYTES,
+        SensorDeviceClass.DATA_SIZE,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:upload-network",
+        lambda stats, _transport: stats.bytes_out,
+    ),
+    "frames_dropped": (
+        "Frames Dropped",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:delete-sweep-outline",
+        lambda stats, _transport: stats.frames_dropped,
+    ),
+    "loop_lag": (
+        "Frame Loop Lag",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-alert",
+        lambda stats, _transport: _rounded(stats.loop_lag(), 1000),
+    ),
+    "commands_failed": (
+        "Commands Not Acknowledged",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:message-alert-outline",
+        lambda stats, _transport: stats.commands_failed,
+    ),
+    "commands_rejected": (
+        "Commands Rejected",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:message-lock-outline",
+        lambda stats, _transport: stats.commands_rejected + stats.commands_expired,
+    ),
+    "circuit": (
+        "Command Circuit",
+        None,
+        None,
+        None,
+        "mdi:electric-switch",
+        lambda _stats, transport: transport.breaker.state.value,
+    ),
+    "queue_depth": (
+        "Command Queue Depth",
+        None,
+        None,
+        SensorStateClass.MEASUREMENT,
+        "mdi:tray-full",
+        lambda _stats, transport: transport.queue_depth,
+    ),
+}
+
+# statistics enabled by default, the others are polled for diagnosis only
+CONNECTION_STATS_ENABLED = ("reconnects", "frames_dropped", "circuit")
+
+
+def _rounded(value: float | None, scale: float = 1) -> float | None:
+    """Scale a measurement and round it to one decimal."""
+    if value is None:
+        return None
+    return round(value * scale, 1)
+
+
+class RinnaiConnectionStatsSensor(RinnaiEntity, SensorEntity):
+    """Diagnostic sensor for one statistic of the connection to the module.
+
+    The statistics are kept by the transport as frames and commands pass,
+    the sensor is polled so ages and rates move on without frames. Only
+    the statistics in CONNECTION_STATS_ENABLED are enabled by default.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    def __init__(self, coordinator: RinnaiCoordinator, ip_address, name, stat):
+        super().__init__(coordinator, ip_address, name)
+        self._transport: RinnaiTransport = self._system.transport
+        (
+            label,
+            self._attr_native_unit_of_measurement,
+            self._attr_device_class,
+            self._attr_state_class,
+            self._attr_icon,
+            self._value,
+        ) = CONNECTION_STATS[stat]
+        self._attr_unique_id = f"connection_{stat}_{str.replace(ip_address, '.', '_')}"
+        self._attr_name = f"{name} {label}"
+        if stat not in CONNECTION_STATS_ENABLED:
+            self._attr_entity_registry_enabled_default = False
+
+    @property
+    def status_fields(self):
+        """Statistics are polled, not updated by frames."""
+        return ()
+
+    @property
+    def native_value(self):
+        """Return the current value of the statistic."""
+        return self._value(self._transport.stats, self._transport)
@@ -0,0 +1,617 @@
+"""Immutable per-frame view of the controller status.
+
+The climate, switch, sensor and binary sensor entities all derive their
+state from the same few values (hvac mode, cooling mode, preset mode, ...).
+Those are resolved once per received status frame into a RinnaiSnapshot so a
+state write only reads precomputed attributes instead of re-running the mode
+resolution for every property.
+
+The boolean flags the controller reports for the unit and the zones
+(preheating, gas valve active, ...) are resolved in one pass over UNIT_FLAGS
+and ZONE_FLAGS into two bitfields per snapshot, one of the flags that are
+set and one of the flags that are reported in the current mode.
+
+Consecutive snapshots are compared with ``changed_fields`` so the
+coordinator only writes the entities whose inputs actually changed. The
+controller repeats an identical frame every few seconds, in steady state
+that diff is empty and nothing is written at all.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import copy
+from dataclasses import dataclass, fields
+from typing import Any
+
+from homeassistant.components.climate import HVACAction, HVACMode
+from homeassistant.const import UnitOfTemperature
+
+from pyrinnaitouch import (
+    TEMP_FAHRENHEIT,
+    RinnaiCapabilities,
+    RinnaiOperatingMode,
+    RinnaiSystemMode,
+    RinnaiSystemStatus,
+    RinnaiUnitStatus,
+)
+from pyrinnaitouch.zone import Zone
+
+from .const import (
+    COOLING_COOL,
+    COOLING_EVAP,
+    COOLING_NONE,
+    PRESET_AUTO,
+    PRESET_MANUAL,
+    ZONE_IDS,
+)
+
+TEMPERATURE_LIMITS = {"min": 8, "max": 30}
+COMFORT_LIMITS = {"min": 19, "max": 34}
+FAN_LIMITS = {"min": 0, "max": 16}
+
+# fields holding the raw library objects, compared attribute by attribute
+_RAW_FIELDS = ("status", "unit_status", "zones")
+# bitfields of the flags, compared flag by flag
+_FLAG_FIELDS = ("flags", "available_flags")
+
+
+@dataclass(frozen=True, slots=True)
+class RinnaiFlag:
+    """A boolean reported for the unit or a zone and when it is reported.
+
+    ``attribute`` is read from the unit or zone status when ``available``
+    returns True for the system mode and multi set point setting.
+    """
+
+    key: str
+    attribute: str
+    available: Callable[[RinnaiSystemMode, bool], bool]
+
+
+def _single_set_point(mode: RinnaiSystemMode) -> Callable[[RinnaiSystemMode, bool], bool]:
+    return lambda system_mode, multi_set_point: system_mode == mode and not multi_set_point
+
+
+def _multi_set_point(mode: RinnaiSystemMode) -> Callable[[RinnaiSystemMode, bool], bool]:
+    return lambda system_mode, multi_set_point: system_mode == mode and multi_set_point
+
+
+# flag bits are the positions in these tables, append new flags at the end
+UNIT_FLAGS = (
+    RinnaiFlag("preheating", "preheating", _single_set_point(RinnaiSystemMode.HEATING)),
+    RinnaiFlag(
+        "gas_valve_active",
+        "gas_valve_active",
+        _single_set_point(RinnaiSystemMode.HEATING),
+    ),
+    RinnaiFlag(
+        "calling_for_heat",
+        "calling_for_heat",
+        _single_set_point(RinnaiSystemMode.HEATING),
+    ),
+    RinnaiFlag(
+        "compressor_active",
+        "compressor_active",
+        _single_set_point(RinnaiSystemMode.COOLING),
+    ),
+    RinnaiFlag(
+        "calling_for_cool",
+        "calling_for_cool",
+        _single_set_point(RinnaiSystemMode.COOLING),
+    ),
+    RinnaiFlag("prewetting", "prewetting", lambda mode, _: mode == RinnaiSystemMode.EVAP),
+    RinnaiFlag(
+        "pump_operating", "pump_operating", lambda mode, _: mode == RinnaiSystemMode.EVAP
+    ),
+    RinnaiFlag("cooler_busy", "cooler_busy", lambda mode, _: mode == RinnaiSystemMode.EVAP),
+    RinnaiFlag(
+        "fan_operating",
+        "fan_operating",
+        lambda mode, multi_set_point: mode == RinnaiSystemMode.EVAP or not multi_set_point,
+    ),
+)
+ZONE_FLAGS = (
+    RinnaiFlag("preheating", "preheating", _multi_set_point(RinnaiSystemMode.HEATING)),
+    RinnaiFlag(
+        "gas_valve_active",
+        "gas_valve_active",
+        _multi_set_point(RinnaiSystemMode.HEATING),
+    ),
+    RinnaiFlag(
+        "calling_for_heat",
+        "calling_for_work",
+        _multi_set_point(RinnaiSystemMode.HEATING),
+    ),
+    RinnaiFlag(
+        "compressor_active",
+        "compressor_active",
+        _multi_set_point(RinnaiSystemMode.COOLING),
+    ),
+    RinnaiFlag(
+        "calling_for_cool",
+        "calling_for_work",
+        _multi_set_point(RinnaiSystemMode.COOLING),
+    ),
+    RinnaiFlag(
+        "fan_operating",
+        "fan_operating",
+        lambda mode, multi_set_point: mode != RinnaiSystemMode.EVAP and multi_set_point,
+    ),
+)
+UNIT_FLAG_BITS = {flag.key: 1 << bit for bit, flag in enumerate(UNIT_FLAGS)}
+ZONE_FLAG_BITS = {flag.key: 1 << bit for bit, flag in enumerate(ZONE_FLAGS)}
+
+
+@dataclass(frozen=True, slots=True)
+class RinnaiZoneSnapshot:
+    """Derived state of a single zone."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    zone: str
+    status: Zone | None
+    available: bool
+    is_on: bool
+    hvac_mode: HVACMode
+    hvac_action: HVACAction
+    preset_mode: str
+    target_temperature: float
+    min_temp: float
+    max_temp: float
+    current_temperature: float | None
+    flags: int
+    available_flags: int
+
+
+@dataclass(frozen=True, slots=True)
+class RinnaiSnapshot:
+    """Derived state of the whole system for one status frame."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    status: RinnaiSystemStatus
+    unit_status: RinnaiUnitStatus
+    mode: RinnaiSystemMode
+    system_on: bool
+    is_multi_set_point: bool
+    capabilities: RinnaiCapabilities
+    is_timesetting: bool
+    has_fault: bool
+    available: bool
+    temperature_unit: str
+    hvac_mode: HVACMode
+    hvac_action: HVACAction
+    hvac_modes: tuple
+    cooling_mode: str
+    preferred_cooling_mode: str
+    preset_mode: str
+    target_temperature: float
+    min_temp: float
+    max_temp: float
+    current_temperature: float | None
+    flags: int
+    available_flags: int
+    zones: dict[str, RinnaiZoneSnapshot]
+
+    @classmethod
+    def from_status(cls, status: RinnaiSystemStatus) -> RinnaiSnapshot:
+        """Resolve all derived values for a status frame."""
+        unit = status.unit_status
+        cooling_mode = _cooling_mode(status)
+        hvac_mode = _hvac_mode(status)
+        preset_mode = (
+            PRESET_AUTO
+            if unit.operating_mode == RinnaiOperatingMode.AUTO
+            else PRESET_MANUAL
+        )
+        min_temp, max_temp = _limits(cooling_mode, hvac_mode, preset_mode)
+        flags, available_flags = _flags(UNIT_FLAGS, status, unit)
+        return cls(
+            status=status,
+            unit_status=unit,
+            mode=status.mode,
+            system_on=status.system_on,
+            is_multi_set_point=status.is_multi_set_point,
+            capabilities=status.capabilities,
+            is_timesetting=status.is_timesetting,
+            has_fault=status.has_fault,
+            available=status.mode != RinnaiSystemMode.NONE,
+            temperature_unit=(
+                UnitOfTemperature.FAHRENHEIT
+                if status.temp_unit == TEMP_FAHRENHEIT
+                else UnitOfTemperature.CELSIUS
+            ),
+            hvac_mode=hvac_mode,
+            hvac_action=_hvac_action(status),
+            hvac_modes=_hvac_modes(status),
+            cooling_mode=cooling_mode,
+            preferred_cooling_mode=_preferred_cooling_mode(status),
+            preset_mode=preset_mode,
+            target_temperature=_target_temperature(
+                unit, cooling_mode, hvac_mode, preset_mode
+            ),
+            min_temp=min_temp,
+            max_temp=max_temp,
+            current_temperature=_reported_temperature(unit.temperature),
+            flags=flags,
+            available_flags=available_flags,
+            zones={
+                zone: _zone_snapshot(status, zone, cooling_mode) for zone in ZONE_IDS
+            },
+        )
+
+    @property
+    def reported_zones(self) -> list[str]:
+        """Return the zones installed according to the controller."""
+        return [zone_id for zone_id, zone in self.zones.items() if zone.status is not None]
+
+    def changed_fields(self, previous: RinnaiSnapshot) -> set[str]:
+        """Return the dotted names of all values that differ from a previous frame.
+
+        Names are the snapshot field (``hvac_mode``), the raw unit attribute
+        (``unit_status.gas_valve_active``) or the zone value
+        (``zones.A.temperature``). A zone appearing or disappearing is
+        reported as ``zones.A``. Flags are reported by their key
+        (``flags.preheating``, ``zones.A.flags.fan_operating``) when they
+        changed or became available or unavailable.
+        """
+        changed = {
+            field.name
+            for field in fields(self)
+            if field.name not in _RAW_FIELDS + _FLAG_FIELDS
+            and getattr(self, field.name) != getattr(previous, field.name)
+        }
+        changed.update(_changed_flags(UNIT_FLAGS, "flags.", self, previous))
+        changed.update(
+            "unit_status." + name
+            for name in _changed_attributes(self.unit_status, previous.unit_status)
+            if name != "zones"
+        )
+        for zone_id, zone in self.zones.items():
+            old_zone = previous.zones[zone_id]
+            if (zone.status is None) != (old_zone.status is None):
+                changed.add("zones." + zone_id)
+                continue
+            changed.update(
+                "zones." + zone_id + "." + field.name
+                for field in fields(zone)
+                if field.name not in ("zone", "status") + _FLAG_FIELDS
+                and getattr(zone, field.name) != getattr(old_zone, field.name)
+            )
+            changed.update(
+                _changed_flags(ZONE_FLAGS, "zones." + zone_id + ".flags.", zone, old_zone)
+            )
+            if zone.status is not None:
+                changed.update(
+                    "zones." + zone_id + "." + name
+                    for name in _changed_attributes(zone.status, old_zone.status)
+                )
+        return changed
+
+
+def status_value(status: RinnaiSystemStatus, path: str) -> Any:
+    """Return a raw status value by its dotted snapshot name, None if not reported.
+
+    ``system_on`` names a system attribute, ``unit_status.set_temp`` a unit
+    attribute and ``zones.A.set_temp`` an attribute of a zone.
+    """
+    target, name = _status_target(status, path)
+    return getattr(target, name, None)
+
+
+def overlay_status(status: RinnaiSystemStatus, values: dict[str, Any]) -> RinnaiSystemStatus:
+    """Return a copy of the status with the given values applied on top."""
+    status = copy.copy(status)
+    status.unit_status = copy.copy(status.unit_status)
+    status.unit_status.zones = dict(status.unit_status.zones)
+    for path, value in values.items():
+        if path.startswith("zones."):
+            zone_id = path.split(".")[1]
+            if zone_id not in status.unit_status.zones:
+                continue
+            status.unit_status.zones[zone_id] = copy.copy(
+                status.unit_status.zones[zone_id]
+            )
+        target, name = _status_target(status, path)
+        setattr(target, name, value)
+    return status
+
+
+def _status_target(status: RinnaiSystemStatus, path: str) -> tuple[Any, str]:
+    """Return the object holding a dotted status value and the attribute name."""
+    parts = path.split(".")
+    if parts[0] == "unit_status":
+        return status.unit_status, parts[1]
+    if parts[0] == "zones":
+        return status.unit_status.zones.get(parts[1]), parts[2]
+    return status, parts[0]
+
+
+def _flags(table: tuple[RinnaiFlag, ...], status: RinnaiSystemStatus, source) -> tuple[int, int]:
+    """Return the bitfields of the set and the available flags of a unit or zone status."""
+    flags = available_flags = 0
+    if source is None:
+        return flags, available_flags
+    mode = status.mode
+    multi_set_point = status.is_multi_set_point
+    for bit, flag in enumerate(table):
+        if flag.available(mode, multi_set_point):
+            available_flags |= 1 << bit
+            if getattr(source, flag.attribute, False):
+                flags |= 1 << bit
+    return flags, available_flags
+
+
+def _changed_flags(table: tuple[RinnaiFlag, ...], prefix: str, current, previous) -> list[str]:
+    """Return the dotted names of the flags that changed between two snapshots."""
+    diff = (current.flags ^ previous.flags) | (
+        current.available_flags ^ previous.available_flags
+    )
+    if not diff:
+        return []
+    return [prefix + flag.key for bit, flag in enumerate(table) if diff & 1 << bit]
+
+
+def _changed_attributes(current, previous) -> list[str]:
+    """Return the names of the instance attributes that differ between two objects."""
+    old = vars(previous)
+    return [name for name, value in vars(current).items() if old.get(name) != value]
+
+
+def _reported_temperature(temp) -> float | None:
+    """Convert a reported temperature in tenths, None if not reported."""
+    if int(temp) < 999:
+        return float(temp) / 10
+    return None
+
+
+def _cooling_mode(status: RinnaiSystemStatus) -> str:
+    if status.mode == RinnaiSystemMode.COOLING:
+        return COOLING_COOL
+    if status.mode == RinnaiSystemMode.EVAP:
+        return COOLING_EVAP
+    return COOLING_NONE
+
+
+def _preferred_cooling_mode(status: RinnaiSystemStatus) -> str:
+    """Return the preferred cooling mode, prioritising refrigerated over evap."""
+    if RinnaiCapabilities.COOLER in status.capabilities:
+        return COOLING_COOL
+    if RinnaiCapabilities.EVAP in status.capabilities:
+        return COOLING_EVAP
+    return COOLING_NONE
+
+
+def _hvac_mode(status: RinnaiSystemStatus) -> HVACMode:
+    # pylint: disable=too-many-return-statements
+    if not status.system_on:
+        return HVACMode.OFF
+
+    if status.mode == RinnaiSystemMode.COOLING:
+        if status.unit_status.is_on:
+            return HVACMode.COOL
+        # system on, cooling mode, but cooling off indicates fan only
+        return HVACMode.FAN_ONLY
+
+    if status.mode == RinnaiSystemMode.HEATING:
+        if status.unit_status.is_on:
+            return HVACMode.HEAT
+        # system on, heater mode, but heater off indicates fan only
+        return HVACMode.FAN_ONLY
+
+    if status.mode == RinnaiSystemMode.EVAP:
+        return HVACMode.COOL
+    return HVACMode.OFF
+
+
+def _hvac_modes(status: RinnaiSystemStatus) -> tuple:
+    modes = [HVACMode.OFF]
+    if (
+        RinnaiCapabilities.COOLER in status.capabilities
+        or RinnaiCapabilities.EVAP in status.capabilities
+    ):
+        modes.append(HVACMode.COOL)
+
+    if RinnaiCapabilities.HEATER in status.capabilities:
+        modes.append(HVACMode.HEAT)
+
+    if status.mode != RinnaiSystemMode.EVAP:
+        modes.append(HVACMode.FAN_ONLY)
+    return tuple(modes)
+
+
+def _unit_hvac_action(unit: RinnaiUnitStatus, mode: RinnaiSystemMode) -> HVACAction:
+    """Return the action of the unit for single set point systems."""
+    # pylint: disable=too-many-return-statements
+    if mode == RinnaiSystemMode.COOLING:
+        if unit.is_on:
+            if unit.compressor_active or unit.calling_for_cool or unit.fan_operating:
+                return HVACAction.COOLING
+            return HVACAction.IDLE
+        return HVACAction.FAN
+
+    if mode == RinnaiSystemMode.HEATING:
+        if unit.is_on:
+            if (
+                unit.gas_valve_active
+                or unit.calling_for_heat
+                or unit.fan_operating
+                or unit.preheating
+            ):
+                return HVACAction.HEATING
+            return HVACAction.IDLE
+        return HVACAction.FAN
+    return HVACAction.OFF
+
+
+def _evap_hvac_action(unit: RinnaiUnitStatus) -> HVACAction:
+    if (
+        unit.prewetting
+        or unit.cooler_busy
+        or (unit.fan_operating and unit.pump_operating)
+    ):
+        return HVACAction.COOLING
+    if unit.fan_operating and not (
+        unit.cooler_busy or unit.prewetting or unit.pump_operating
+    ):
+        return HVACAction.FAN
+    return HVACAction.IDLE
+
+
+def _hvac_action(status: RinnaiSystemStatus) -> HVACAction:
+    if not status.system_on:
+        return HVACAction.OFF
+    if status.is_multi_set_point:
+        # return zone actions in zone unit
+        return HVACAction.IDLE
+    if status.mode == RinnaiSystemMode.EVAP:
+        if status.unit_status.is_on:
+            return _evap_hvac_action(status.unit_status)
+        return HVACAction.OFF
+    return _unit_hvac_action(status.unit_status, status.mode)
+
+
+def _target_temperature(
+    unit: RinnaiUnitStatus, cooling_mode: str, hvac_mode: HVACMode, preset_mode: str
+):
+    # pylint: disable=too-many-return-statements
+    if hvac_mode == HVACMode.OFF:
+        return 0
+
+    if cooling_mode == COOLING_EVAP:
+        if preset_mode == PRESET_AUTO:
+            return int(unit.comfort)
+        return int(unit.fan_speed)
+
+    if hvac_mode == HVACMode.FAN_ONLY:
+        return unit.fan_speed
+    return unit.set_temp
+
+
+def _limits(cooling_mode: str, hvac_mode: HVACMode, preset_mode: str) -> tuple:
+    if cooling_mode == COOLING_EVAP and preset_mode == PRESET_AUTO:
+        return COMFORT_LIMITS["min"], COMFORT_LIMITS["max"]
+    if cooling_mode != COOLING_EVAP and hvac_mode != HVACMode.FAN_ONLY:
+        return TEMPERATURE_LIMITS["min"], TEMPERATURE_LIMITS["max"]
+    return FAN_LIMITS["min"], FAN_LIMITS["max"]
+
+
+def _zone_hvac_action(status: RinnaiSystemStatus, zone: Zone | None) -> HVACAction:
+    """Return the action of a zone, zone is None if the controller lacks it."""
+    # pylint: disable=too-many-return-statements
+    unit = status.unit_status
+    if not status.system_on:
+        return HVACAction.OFF
+    if status.is_multi_set_point and status.mode in (
+        RinnaiSystemMode.COOLING,
+        RinnaiSystemMode.HEATING,
+    ):
+        # return zone actions in zone unit
+        if unit.is_on and zone is not None:
+            active = (
+                zone.compressor_active
+                if status.mode == RinnaiSystemMode.COOLING
+                else zone.gas_valve_active
+            )
+            if active or zone.calling_for_work or zone.fan_operating:
+                if status.mode == RinnaiSystemMode.COOLING:
+                    return HVACAction.COOLING
+                return HVACAction.HEATING
+            if int(zone.set_temp) < 8:
+                return HVACAction.OFF
+            return HVACAction.IDLE
+        if zone is not None and zone.fan_operating:
+            return HVACAction.FAN
+        return HVACAction.OFF
+
+    if status.mode == RinnaiSystemMode.EVAP:
+        if unit.is_on and zone is not None and zone.user_enabled:
+            return _evap_hvac_action(unit)
+        return HVACAction.OFF
+    # logic to return the right action for main unit
+    return _unit_hvac_action(unit, status.mode)
+
+
+def _zone_hvac_mode(
+    status: RinnaiSystemStatus,
+    zone: Zone | None,
+    hvac_action: HVACAction,
+    cooling_mode: str,
+) -> HVACMode:
+    # pylint: disable=too-many-return-statements
+    if hvac_action == HVACAction.OFF or zone is None:
+        return HVACMode.OFF
+    if cooling_mode == COOLING_COOL:
+        return HVACMode.COOL
+    if status.unit_status.is_on:
+        if cooling_mode == COOLING_EVAP:
+            return HVACMode.COOL
+        return HVACMode.HEAT
+    return HVACMode.FAN_ONLY
+
+
+def _zone_target_temperature(
+    status: RinnaiSystemStatus,
+    zone: Zone | None,
+    cooling_mode: str,
+    hvac_mode: HVACMode,
+    preset_mode: str,
+):
+    # pylint: disable=too-many-return-statements
+    unit = status.unit_status
+    if cooling_mode == COOLING_EVAP:
+        if preset_mode == PRESET_AUTO:
+            return int(unit.comfort)
+        return int(unit.fan_speed)
+
+    if hvac_mode == HVACMode.FAN_ONLY:
+        return unit.fan_speed
+
+    if status.is_multi_set_point and zone is not None:
+        if int(zone.set_temp) > 7:
+            return float(zone.set_temp)
+        return 0
+    return float(unit.set_temp)
+
+
+def _zone_snapshot(
+    status: RinnaiSystemStatus, zone_id: str, cooling_mode: str
+) -> RinnaiZoneSnapshot:
+    zone = status.unit_status.zones.get(zone_id)
+    hvac_action = _zone_hvac_action(status, zone)
+    hvac_mode = _zone_hvac_mode(status, zone, hvac_action, cooling_mode)
+    preset_mode = (
+        PRESET_AUTO if zone is not None and zone.auto_mode else PRESET_MANUAL
+    )
+    target_temperature = _zone_target_temperature(
+        status, zone, cooling_mode, hvac_mode, preset_mode
+    )
+    flags, available_flags = _flags(ZONE_FLAGS, status, zone)
+    if status.is_multi_set_point and not (
+        cooling_mode == COOLING_EVAP or hvac_mode == HVACMode.FAN_ONLY
+    ):
+        min_temp, max_temp = TEMPERATURE_LIMITS["min"], TEMPERATURE_LIMITS["max"]
+    else:
+        min_temp = max_temp = target_temperature
+    return RinnaiZoneSnapshot(
+        zone=zone_id,
+        status=zone,
+        available=(
+            zone is not None
+            and status.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING)
+        ),
+        is_on=zone is not None
+        and (zone.user_enabled or int(zone.set_temp) > 7),
+        hvac_mode=hvac_mode,
+        hvac_action=hvac_action,
+        preset_mode=preset_mode,
+        target_temperature=target_temperature,
+        min_temp=min_temp,
+        max_temp=max_temp,
+        current_temperature=(
+            _reported_temperature(zone.temperature) if zone is not None else None
+        ),
+        flags=flags,
+        available_flags=available_flags,
+    )
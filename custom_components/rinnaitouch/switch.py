@@ -1,173 +1,130 @@
 """Switches for Auto/Manual, On/Off, Mode, Water Pump and Fan"""
 # import logging
 
-from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.entity import Entity
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN, SwitchEntity
+from homeassistant.core import callback
 from homeassistant.const import CONF_NAME, CONF_HOST
 
 from pyrinnaitouch import (
-    RinnaiSystem,
     RinnaiSystemMode,
     RinnaiCapabilities,
     RinnaiOperatingMode,
-    RinnaiSystemStatus,
 )
 
+from . import RinnaiData, RinnaiEntity, zone_name
 from .const import (
-    CONF_ZONE_A,
-    CONF_ZONE_B,
-    CONF_ZONE_C,
-    CONF_ZONE_D,
-    CONF_ZONE_COMMON,
     DEFAULT_NAME,
+    DOMAIN,
 )
+from .snapshot import RinnaiSnapshot
 
 
 async def async_setup_entry(hass, entry, async_add_entities):  # pylint: disable=unused-argument
     """Set up the switch entities."""
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
     ip_address = entry.data.get(CONF_HOST)
     name = entry.data.get(CONF_NAME)
     if name == "":
         name = DEFAULT_NAME
-    async_add_entities(
-        [
-            RinnaiOnOffSwitch(ip_address, name),
-            RinnaiCoolingModeSwitch(ip_address, name),
-            RinnaiHeaterModeSwitch(ip_address, name),
-            RinnaiEvapModeSwitch(ip_address, name),
-            RinnaiWaterpumpSwitch(ip_address, name),
-            RinnaiEvapFanSwitch(ip_address, name),
-            RinnaiCircFanSwitch(ip_address, name),
-            RinnaiAutoSwitch(ip_address, name),
+
+    @callback
+    def add_switches(snapshot: RinnaiSnapshot):
+        """Add the switches for the capabilities and zones of the system."""
+        entities = [
+            RinnaiOnOffSwitch(coordinator, ip_address, name),
+            RinnaiCircFanSwitch(coordinator, ip_address, name),
+            RinnaiAutoSwitch(coordinator, ip_address, name),
         ]
-    )
-    if entry.data.get(CONF_ZONE_A):
-        async_add_entities(
-            [
-                RinnaiZoneSwitch(ip_address, "A", name),
-                RinnaiZoneAutoSwitch(ip_address, "A", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_B):
-        async_add_entities(
-            [
-                RinnaiZoneSwitch(ip_address, "B", name),
-                RinnaiZoneAutoSwitch(ip_address, "B", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_C):
-        async_add_entities(
-            [
-                RinnaiZoneSwitch(ip_address, "C", name),
-                RinnaiZoneAutoSwitch(ip_address, "C", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_D):
-        async_add_entities(
-            [
-                RinnaiZoneSwitch(ip_address, "D", name),
-                RinnaiZoneAutoSwitch(ip_address, "D", name),
-            ]
-        )
-    if entry.data.get(CONF_ZONE_COMMON):
-        async_add_entities(
-            [
-                RinnaiZoneSwitch(ip_address, "U", name),
-                RinnaiZoneAutoSwitch(ip_address, "U", name),
-            ]
-        )
+        stale = []
+        for capability, entity_classes in CAPABILITY_SWITCHES.items():
+            if capability in snapshot.capabilities:
+                entities.extend(
+                    entity_class(coordinator, ip_address, name)
+                    for entity_class in entity_classes
+                )
+            else:
+                stale.extend(
+                    str.lower(entity_class.__name__) for entity_class in entity_classes
+                )
+        for zone in snapshot.reported_zones:
+            entities.append(RinnaiZoneSwitch(coordinator, ip_address, zone, name))
+            entities.append(RinnaiZoneAutoSwitch(coordinator, ip_address, zone, name))
+        async_add_entities(entities)
+        coordinator.async_remove_stale_entities(entry, SWITCH_DOMAIN, stale)
+
+    entry.async_on_unload(coordinator.async_add_ready_listener(add_switches))
     return True
 
 
-class RinnaiExtraEntity(Entity):
-    """Base entity with a name and system update capability."""
-
-    def __init__(self, ip_address, name):
-        self._host = ip_address
-        self._system: RinnaiSystem = RinnaiSystem.get_instance(ip_address)
-        device_id = (
-            str.lower(self.__class__.__name__) + "_" + str.replace(ip_address, ".", "_")
-        )
-
-        self._attr_unique_id = device_id
-        self._attr_name = name
-        self._attr_device_name = name
-        self._system.subscribe_updates(self.system_updated)
-
-    def system_updated(self):
-        """After system is updated write the new state to HA."""
-        # this very infrequently fails on startup so wrapping in try except
-        try:
-            self.schedule_update_ha_state()
-        except:  # pylint: disable=bare-except
-            pass
-
-    @property
-    def device_info(self):
-        """Return device information about this heater."""
-        return {
-            # "connections": {(CONNECTION_NETWORK_MAC, self._host)},
-            "identifiers": {("rinnai_touch", self._host)},
-            "model": "Rinnai Touch Wifi",
-            "name": self._attr_device_name,
-            "manufacturer": "Rinnai/Brivis",
-        }
-
-    @property
-    def name(self):
-        """Name of the entity."""
-        return self._attr_name.replace("Zone U", "Common Zone")
-
-
-class RinnaiOnOffSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiOnOffSwitch(RinnaiEntity, SwitchEntity):
     """Main on/off switch for the system."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    _attr_icon = "mdi:power"
+
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " On Off Switch"
         self._is_on = False
 
     @property
-    def icon(self):
-        """Return the icon to use in the frontend for this device."""
-        return "mdi:power"
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("system_on",)
 
     @property
     def is_on(self):
         """If the switch is currently on or off."""
-        return self._system.get_stored_status().system_on
+        return self._coordinator.data.system_on
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
         # turn whatever the preset is on and put it into manual mode
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if state.mode == RinnaiSystemMode.COOLING:
-            await self._system.turn_unit_on()
+            sent = await self._system.turn_unit_on()
         elif state.mode == RinnaiSystemMode.HEATING:
-            await self._system.turn_unit_on()
+            sent = await self._system.turn_unit_on()
         elif state.mode == RinnaiSystemMode.EVAP:
-            await self._system.turn_evap_on()
+            sent = await self._system.turn_evap_on()
+        else:
+            return
+        if sent:
+            self._coordinator.async_set_optimistic(
+                {"system_on": True, "unit_status.is_on": True}
+            )
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
         # turn whatever the preset is off
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if state.mode == RinnaiSystemMode.COOLING:
-            await self._system.turn_unit_off()
+            sent = await self._system.turn_unit_off()
         elif state.mode == RinnaiSystemMode.HEATING:
-            await self._system.turn_unit_off()
+            sent = await self._system.turn_unit_off()
         elif state.mode == RinnaiSystemMode.EVAP:
-            await self._system.turn_evap_off()
+            sent = await self._system.turn_evap_off()
+        else:
+            return
+        if sent:
+            self._coordinator.async_set_optimistic(
+                {"system_on": False, "unit_status.is_on": False}
+            )
 
 
-class RinnaiCoolingModeSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiCoolingModeSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn the system into cooling mode."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Cooling Mode Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("mode", "capabilities")
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -177,31 +134,39 @@ class RinnaiCoolingModeSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        return self._system.get_stored_status().mode == RinnaiSystemMode.COOLING
+        return self._coordinator.data.mode == RinnaiSystemMode.COOLING
 
     @property
     def available(self):
         return (
-            RinnaiCapabilities.COOLER in self._system.get_stored_status().capabilities
+            RinnaiCapabilities.COOLER in self._coordinator.data.capabilities
         )
 
     async def async_turn_on(self, **kwargs):
-        if not self._system.get_stored_status().mode == RinnaiSystemMode.COOLING:
-            await self._system.set_cooling_mode()
+        if (
+            not self._coordinator.data.mode == RinnaiSystemMode.COOLING
+            and await self._system.set_cooling_mode()
+        ):
+            self._coordinator.async_set_optimistic({"mode": RinnaiSystemMode.COOLING})
 
     async def async_turn_off(self, **kwargs):
         """Turning it off does nothing"""
         pass  # pylint: disable=unnecessary-pass
 
 
-class RinnaiHeaterModeSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiHeaterModeSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn the system into heater mode."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Heater Mode Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("mode", "capabilities")
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -211,31 +176,39 @@ class RinnaiHeaterModeSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        return self._system.get_stored_status().mode == RinnaiSystemMode.HEATING
+        return self._coordinator.data.mode == RinnaiSystemMode.HEATING
 
     @property
     def available(self):
         return (
-            RinnaiCapabilities.HEATER in self._system.get_stored_status().capabilities
+            RinnaiCapabilities.HEATER in self._coordinator.data.capabilities
         )
 
     async def async_turn_on(self, **kwargs):
-        if not self._system.get_stored_status().mode == RinnaiSystemMode.HEATING:
-            await self._system.set_heater_mode()
+        if (
+            not self._coordinator.data.mode == RinnaiSystemMode.HEATING
+            and await self._system.set_heater_mode()
+        ):
+            self._coordinator.async_set_optimistic({"mode": RinnaiSystemMode.HEATING})
 
     async def async_turn_off(self, **kwargs):
         """Turning it off does nothing"""
         pass  # pylint: disable=unnecessary-pass
 
 
-class RinnaiEvapModeSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiEvapModeSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn the system into evap mode."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Evap Mode Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("mode", "capabilities")
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -245,38 +218,40 @@ class RinnaiEvapModeSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        return self._system.get_stored_status().mode == RinnaiSystemMode.EVAP
+        return self._coordinator.data.mode == RinnaiSystemMode.EVAP
 
     @property
     def available(self):
-        return RinnaiCapabilities.EVAP in self._system.get_stored_status().capabilities
+        return RinnaiCapabilities.EVAP in self._coordinator.data.capabilities
 
     async def async_turn_on(self, **kwargs):
-        if not self._system.get_stored_status().mode == RinnaiSystemMode.EVAP:
-            await self._system.set_evap_mode()
+        if (
+            not self._coordinator.data.mode == RinnaiSystemMode.EVAP
+            and await self._system.set_evap_mode()
+        ):
+            self._coordinator.async_set_optimistic({"mode": RinnaiSystemMode.EVAP})
 
     async def async_turn_off(self, **kwargs):
         """Turning it off does nothing"""
         pass  # pylint: disable=unnecessary-pass
 
 
-class RinnaiZoneSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiZoneSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn a zone on or off."""
 
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, zone, name):
+        super().__init__(coordinator, ip_address, name, zone)
         self._is_on = False
-        self._attr_name = name + " Zone " + zone + " Switch"
-        self._attr_zone = zone
+        self._attr_name = f"{name} {zone_name(zone)} Switch"
         self._last_set_temp = 20
-        device_id = (
-            str.lower(self.__class__.__name__)
-            + "_"
-            + zone
-            + str.replace(ip_address, ".", "_")
-        )
 
-        self._attr_unique_id = device_id
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            f"zones.{self._attr_zone}.user_enabled",
+            f"zones.{self._attr_zone}.set_temp",
+        )
 
     @property
     def icon(self):
@@ -288,12 +263,12 @@ class RinnaiZoneSwitch(RinnaiExtraEntity, SwitchEntity):
     @property
     def available(self):
         return (
-            self._attr_zone in self._system.get_stored_status().unit_status.zones.keys()
+            self._attr_zone in self._coordinator.data.unit_status.zones.keys()
         )
 
     @property
     def is_on(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if self._attr_zone not in state.unit_status.zones.keys():
             return False
         return (
@@ -302,36 +277,68 @@ class RinnaiZoneSwitch(RinnaiExtraEntity, SwitchEntity):
         )
 
     async def async_turn_on(self, **kwargs):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.mode == RinnaiSystemMode.EVAP:
-            await self._system.turn_evap_zone_on(self._attr_zone)
+        state: RinnaiSnapshot = self._coordinator.data
+        if (
+            state.mode == RinnaiSystemMode.EVAP
+            and await self._system.turn_evap_zone_on(self._attr_zone)
+        ):
+            self._coordinator.async_set_optimistic(
+                {f"zones.{self._attr_zone}.user_enabled": True}
+            )
         if state.is_multi_set_point:
-            await self._system.set_unit_zone_temp(self._attr_zone, self._last_set_temp)
-        else:
-            # turn whatever the preset is on and put it into manual mode
-            await self._system.turn_unit_zone_on(self._attr_zone)
+            if await self._system.set_unit_zone_temp(
+                self._attr_zone, self._last_set_temp
+            ):
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.set_temp": self._last_set_temp}
+                )
+        # turn whatever the preset is on and put it into manual mode
+        elif await self._system.turn_unit_zone_on(self._attr_zone):
+            self._coordinator.async_set_optimistic(
+                {f"zones.{self._attr_zone}.user_enabled": True}
+            )
 
     async def async_turn_off(self, **kwargs):
         """Turning it off does nothing"""
-        state: RinnaiSystemStatus = self._system.get_stored_status()
-        if state.mode == RinnaiSystemMode.EVAP:
-            await self._system.turn_evap_zone_off(self._attr_zone)
+        state: RinnaiSnapshot = self._coordinator.data
+        if (
+            state.mode == RinnaiSystemMode.EVAP
+            and await self._system.turn_evap_zone_off(self._attr_zone)
+        ):
+            self._coordinator.async_set_optimistic(
+                {f"zones.{self._attr_zone}.user_enabled": False}
+            )
         if state.is_multi_set_point:
             self._last_set_temp = state.unit_status.set_temp
-            await self._system.set_unit_zone_temp(self._attr_zone, 0)
-        else:
-            # turn whatever the preset is on and put it into manual mode
-            await self._system.turn_unit_zone_off(self._attr_zone)
+            if await self._system.set_unit_zone_temp(self._attr_zone, 0):
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.set_temp": 0}
+                )
+        # turn whatever the preset is on and put it into manual mode
+        elif await self._system.turn_unit_zone_off(self._attr_zone):
+            self._coordinator.async_set_optimistic(
+                {f"zones.{self._attr_zone}.user_enabled": False}
+            )
 
 
-class RinnaiWaterpumpSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiWaterpumpSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn the waterpump on or off in evap mode."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Water Pump Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            "mode",
+            "unit_status.is_on",
+            "unit_status.operating_mode",
+            "unit_status.water_pump_on",
+        )
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -341,7 +348,7 @@ class RinnaiWaterpumpSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def available(self):
-        state = self._system.get_stored_status()
+        state = self._coordinator.data
         if (
             state.mode == RinnaiSystemMode.EVAP
             and state.unit_status.is_on
@@ -353,26 +360,36 @@ class RinnaiWaterpumpSwitch(RinnaiExtraEntity, SwitchEntity):
     @property
     def is_on(self):
         if self.available:
-            return self._system.get_stored_status().unit_status.water_pump_on
+            return self._coordinator.data.unit_status.water_pump_on
         return False
 
     async def async_turn_on(self, **kwargs):
-        if self.available:
-            await self._system.turn_evap_pump_on()
+        if self.available and await self._system.turn_evap_pump_on():
+            self._coordinator.async_set_optimistic({"unit_status.water_pump_on": True})
 
     async def async_turn_off(self, **kwargs):
-        if self.available:
-            await self._system.turn_evap_pump_off()
+        if self.available and await self._system.turn_evap_pump_off():
+            self._coordinator.async_set_optimistic({"unit_status.water_pump_on": False})
 
 
-class RinnaiEvapFanSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiEvapFanSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn the fan on or off in evap mode."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Evap Fan Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            "mode",
+            "unit_status.is_on",
+            "unit_status.operating_mode",
+            "unit_status.fan_on",
+        )
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -382,7 +399,7 @@ class RinnaiEvapFanSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def available(self):
-        state = self._system.get_stored_status()
+        state = self._coordinator.data
         if (
             state.mode == RinnaiSystemMode.EVAP
             and state.unit_status.is_on
@@ -394,26 +411,31 @@ class RinnaiEvapFanSwitch(RinnaiExtraEntity, SwitchEntity):
     @property
     def is_on(self):
         if self.available:
-            return self._system.get_stored_status().unit_status.fan_on
+            return self._coordinator.data.unit_status.fan_on
         return False
 
     async def async_turn_on(self, **kwargs):
-        if self.available:
-            await self._system.turn_evap_fan_on()
+        if self.available and await self._system.turn_evap_fan_on():
+            self._coordinator.async_set_optimistic({"unit_status.fan_on": True})
 
     async def async_turn_off(self, **kwargs):
-        if self.available:
-            await self._system.turn_evap_fan_off()
+        if self.available and await self._system.turn_evap_fan_off():
+            self._coordinator.async_set_optimistic({"unit_status.fan_on": False})
 
 
-class RinnaiAutoSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiAutoSwitch(RinnaiEntity, SwitchEntity):
     """A switch to change between auto and manual operation."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Auto Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return ("system_on", "unit_status.operating_mode")
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -423,42 +445,62 @@ class RinnaiAutoSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def available(self):
-        if self._system.get_stored_status().system_on:
+        if self._coordinator.data.system_on:
             return True
         return False
 
     @property
     def is_on(self):
         if self.available:
-            state: RinnaiSystemStatus = self._system.get_stored_status()
+            state: RinnaiSnapshot = self._coordinator.data
             return state.unit_status.operating_mode == RinnaiOperatingMode.AUTO
         return False
 
     async def async_turn_on(self, **kwargs):
         if self.available:
-            state: RinnaiSystemStatus = self._system.get_stored_status()
+            state: RinnaiSnapshot = self._coordinator.data
+            sent = False
             if state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING):
-                await self._system.set_unit_auto()
+                sent = await self._system.set_unit_auto()
             if state.mode == RinnaiSystemMode.EVAP:
-                await self._system.set_unit_auto()
+                sent = await self._system.set_unit_auto()
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {"unit_status.operating_mode": RinnaiOperatingMode.AUTO}
+                )
 
     async def async_turn_off(self, **kwargs):
         if self.available:
-            state: RinnaiSystemStatus = self._system.get_stored_status()
+            state: RinnaiSnapshot = self._coordinator.data
+            sent = False
             if state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING):
-                await self._system.set_unit_manual()
+                sent = await self._system.set_unit_manual()
             if state.mode == RinnaiSystemMode.EVAP:
-                await self._system.set_unit_manual()
+                sent = await self._system.set_unit_manual()
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {"unit_status.operating_mode": RinnaiOperatingMode.MANUAL}
+                )
 
 
-class RinnaiCircFanSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiCircFanSwitch(RinnaiEntity, SwitchEntity):
     """A switch to turn the circ fan on or off in heater or cooling mode when the system is off."""
 
-    def __init__(self, ip_address, name):
-        super().__init__(ip_address, name)
+    def __init__(self, coordinator, ip_address, name):
+        super().__init__(coordinator, ip_address, name)
         self._attr_name = name + " Circulation Fan Switch"
         self._is_on = False
 
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            "mode",
+            "system_on",
+            "unit_status.is_on",
+            "unit_status.circulation_fan_on",
+        )
+
     @property
     def icon(self):
         """Return the icon to use in the frontend for this device."""
@@ -468,7 +510,7 @@ class RinnaiCircFanSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if not (state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING)):  # pylint: disable=superfluous-parens
             return False
         if not state.system_on:
@@ -480,34 +522,38 @@ class RinnaiCircFanSwitch(RinnaiExtraEntity, SwitchEntity):
     @property
     def is_on(self):
         if self.available:
-            return self._system.get_stored_status().unit_status.circulation_fan_on
+            return self._coordinator.data.unit_status.circulation_fan_on
         return False
 
     async def async_turn_on(self, **kwargs):
-        if self.available:
-            await self._system.turn_unit_fan_only()
+        if self.available and await self._system.turn_unit_fan_only():
+            self._coordinator.async_set_optimistic(
+                {"unit_status.circulation_fan_on": True}
+            )
 
     async def async_turn_off(self, **kwargs):
-        if self.available:
-            await self._system.turn_unit_off()
+        if self.available and await self._system.turn_unit_off():
+            self._coordinator.async_set_optimistic(
+                {"unit_status.circulation_fan_on": False}
+            )
 
 
-class RinnaiZoneAutoSwitch(RinnaiExtraEntity, SwitchEntity):
+class RinnaiZoneAutoSwitch(RinnaiEntity, SwitchEntity):
     """A switch to change to auto or manual operation in a zone."""
 
-    def __init__(self, ip_address, zone, name):
-        super().__init__(ip_address, name)
-        self._attr_name = name + " Zone " + zone + " Auto Switch"
+    def __init__(self, coordinator, ip_address, zone, name):
+        super().__init__(coordinator, ip_address, name, zone)
+        self._attr_name = f"{name} {zone_name(zone)} Auto Switch"
         self._is_on = False
-        self._attr_zone = zone
-        device_id = (
-            str.lower(self.__class__.__name__)
-            + "_"
-            + zone
-            + str.replace(ip_address, ".", "_")
-        )
 
-        self._attr_unique_id = device_id
+    @property
+    def status_fields(self):
+        """Snapshot fields the state depends on."""
+        return (
+            "system_on",
+            "unit_status.operating_mode",
+            f"zones.{self._attr_zone}.auto_mode",
+        )
 
     @property
     def icon(self):
@@ -518,7 +564,7 @@ class RinnaiZoneAutoSwitch(RinnaiExtraEntity, SwitchEntity):
 
     @property
     def available(self):
-        state: RinnaiSystemStatus = self._system.get_stored_status()
+        state: RinnaiSnapshot = self._coordinator.data
         if state.system_on and self._attr_zone in state.unit_status.zones.keys():
             return state.unit_status.operating_mode == RinnaiOperatingMode.AUTO
         return False
@@ -526,22 +572,42 @@ class RinnaiZoneAutoSwitch(RinnaiExtraEntity, SwitchEntity):
     @property
     def is_on(self):
         if self.available:
-            state: RinnaiSystemStatus = self._system.get_stored_status()
+            state: RinnaiSnapshot = self._coordinator.data
             return state.unit_status.zones[self._attr_zone].auto_mode
         return False
 
     async def async_turn_on(self, **kwargs):
         if self.available:
-            state: RinnaiSystemStatus = self._system.get_stored_status()
+            state: RinnaiSnapshot = self._coordinator.data
             if state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING):
-                await self._system.set_unit_zone_auto(self._attr_zone)
+                sent = await self._system.set_unit_zone_auto(self._attr_zone)
             else:
-                await self._system.set_evap_zone_auto(self._attr_zone)
+                sent = await self._system.set_evap_zone_auto(self._attr_zone)
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.auto_mode": True}
+                )
 
     async def async_turn_off(self, **kwargs):
         if self.available:
-            state: RinnaiSystemStatus = self._system.get_stored_status()
+            state: RinnaiSnapshot = self._coordinator.data
             if state.mode in (RinnaiSystemMode.COOLING, RinnaiSystemMode.HEATING):
-                await self._system.set_unit_zone_manual(self._attr_zone)
+                sent = await self._system.set_unit_zone_manual(self._attr_zone)
             else:
-                await self._system.set_evap_zone_manual(self._attr_zone)
+                sent = await self._system.set_evap_zone_manual(self._attr_zone)
+            if sent:
+                self._coordinator.async_set_optimistic(
+                    {f"zones.{self._attr_zone}.auto_mode": False}
+                )
+
+
+# switches only created when the system has the capability
+CAPABILITY_SWITCHES = {
+    RinnaiCapabilities.COOLER: (RinnaiCoolingModeSwitch,),
+    RinnaiCapabilities.HEATER: (RinnaiHeaterModeSwitch,),
+    RinnaiCapabilities.EVAP: (
+        RinnaiEvapModeSwitch,
+        RinnaiWaterpumpSwitch,
+        RinnaiEvapFanSwitch,
+    ),
+}
@@ -0,0 +1,628 @@
+"""Connection to the Rinnai Touch WiFi module running on the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import copy
+from dataclasses import dataclass, field
+from enum import StrEnum
+import json
+import logging
+import random
+import re
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from pyrinnaitouch import RinnaiSystem, RinnaiSystemStatus
+from pyrinnaitouch.event import Event
+from pyrinnaitouch.pollconnection import RinnaiConnectionState
+
+from .const import (
+    CIRCUIT_COOLDOWN,
+    CIRCUIT_FAILURES,
+    COMMAND_DEADLINE,
+    COMMAND_TIMEOUT,
+    CONNECT_TIMEOUT,
+    IDLE_POLL_INTERVAL,
+    MODULE_PORT,
+    NO_DATA_TIMEOUT,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_MIN_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HELLO = b"*HELLO*"
+IDLE_COMMAND = "NA"
+_FRAME = re.compile(rb"N(\d{6})(\[.*?\])", re.DOTALL)
+_SEQUENCE = re.compile(rb"N\d{6}")
+# number of command round trips the latency percentiles are taken from
+LATENCY_SAMPLES = 100
+
+
+@dataclass
+class RinnaiConnectionStats:
+    """Counters describing how well the module responds, kept by the transport."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    frame_times: deque[float] = field(default_factory=deque)
+    last_frame: float | None = None
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+    reconnects: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    frames_dropped: int = 0
+    commands_failed: int = 0
+    commands_rejected: int = 0
+    commands_expired: int = 0
+    loop_lags: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+
+    def frame_received(self) -> None:
+        """Count a status frame."""
+        self.last_frame = time.monotonic()
+        self.frame_times.append(self.last_frame)
+        self._prune(self.last_frame)
+
+    def frames_per_minute(self) -> int:
+        """Return the number of status frames received in the last minute."""
+        self._prune(time.monotonic())
+        return len(self.frame_times)
+
+    def frame_age(self) -> float | None:
+        """Return the seconds since the last status frame, None before the first."""
+        if self.last_frame is None:
+            return None
+        return time.monotonic() - self.last_frame
+
+    def latency(self, quantile: float) -> float | None:
+        """Return a quantile of the recent command round trips in seconds."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def loop_lag(self) -> float | None:
+        """Return the longest wait of a recent frame for the event loop in seconds."""
+        if not self.loop_lags:
+            return None
+        return max(self.loop_lags)
+
+    def _prune(self, now: float) -> None:
+        while self.frame_times and self.frame_times[0] < now - 60:
+            self.frame_times.popleft()
+
+
+class RinnaiCircuitState(StrEnum):
+    """State of the command circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RinnaiCircuitBreaker:
+    """Stop taking commands for a module which doesn't acknowledge them.
+
+    After ``failures`` commands in a row were not acknowledged within
+    COMMAND_TIMEOUT the circuit opens and new commands are rejected at once
+    for ``cooldown`` seconds. Then it is half open, commands are sent again
+    and the next acknowledged one closes the circuit while the next failed
+    one opens it for another cooldown.
+    """
+
+    def __init__(
+        self, failures: int = CIRCUIT_FAILURES, cooldown: float = CIRCUIT_COOLDOWN
+    ) -> None:
+        self.failures_to_open = failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened: float | None = None
+
+    @property
+    def state(self) -> RinnaiCircuitState:
+        """Return the current state, half open once the cooldown passed."""
+        if self._opened is None:
+            return RinnaiCircuitState.CLOSED
+        if time.monotonic() < self._opened + self.cooldown:
+            return RinnaiCircuitState.OPEN
+        return RinnaiCircuitState.HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Return the seconds until commands are taken again."""
+        if self._opened is None:
+            return 0.0
+        return max(0.0, self._opened + self.cooldown - time.monotonic())
+
+    def record_success(self) -> None:
+        """Close the circuit after an acknowledged command."""
+        self.failures = 0
+        self._opened = None
+
+    def record_failure(self) -> bool:
+        """Count an unacknowledged command, return True if the circuit opened."""
+        self.failures += 1
+        if self._opened is not None or self.failures >= self.failures_to_open:
+            self._opened = time.monotonic()
+            return True
+        return False
+
+
+class RinnaiTransport:
+    """Talk to the module with asyncio streams instead of a socket thread.
+
+    Speaks the same protocol as the library's poll connection: commands are
+    sent one at a time with a sequence number and the next one waits until
+    a status frame acknowledged it (or COMMAND_TIMEOUT passed), an idle
+    command keeps the module sending while nothing is written and the
+    connection is reopened when no data arrived for NO_DATA_TIMEOUT.
+
+    Commands not sent within COMMAND_DEADLINE are dropped rather than sent
+    late, and the circuit breaker rejects new commands at once while the
+    module stopped acknowledging them.
+
+    A lost connection is retried after RECONNECT_MIN_DELAY, doubling up to
+    RECONNECT_MAX_DELAY with random jitter so controllers coming back after
+    a router reboot don't all retry at once. Once reconnected a single idle
+    command asks the module for its status straight away.
+
+    Status frames are parsed with the library and handed to the status
+    listeners on the event loop. Received frames wait in a one frame
+    mailbox until the loop gets to them, when the loop lags behind a newer
+    frame replaces the waiting one, so only the latest is parsed and fanned
+    out. Dropped frames and the wait are counted in the stats.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int = MODULE_PORT) -> None:
+        self.hass = hass
+        self.host = host
+        self.port = port
+        self.state = RinnaiConnectionState.IDLE
+        self.status = RinnaiSystemStatus()
+        self._status_listeners: list[Callable[[RinnaiSystemStatus], None]] = []
+        self._frame_listeners: list[Callable[[bytes], None]] = []
+        self._state_handlers: list[Callable[[RinnaiConnectionState], None]] = []
+        self._commands: asyncio.Queue[tuple[str, float]] = asyncio.Queue()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+        self._buffer = bytearray()
+        self._sequence = 1
+        self._received_sequence = 0
+        self._ack: asyncio.Future | None = None
+        self._first_status = asyncio.Event()
+        self._pending_frame: bytes | None = None
+        self._pending_since = 0.0
+        self._pending_handle: asyncio.Handle | None = None
+        self.stats = RinnaiConnectionStats()
+        self.breaker = RinnaiCircuitBreaker()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting to be sent."""
+        return self._commands.qsize()
+
+    @property
+    def received(self) -> bool:
+        """Return whether a status was received or handed in yet."""
+        return self._first_status.is_set()
+
+    async def async_start(self, timeout: float = CONNECT_TIMEOUT) -> None:
+        """Connect and wait for the first status frame, raise if the module is unreachable."""
+        await self._async_connect(timeout)
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"rinnaitouch transport {self.host}"
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                await self._first_status.wait()
+        except TimeoutError:
+            _LOGGER.warning("No status received from %s yet", self.host)
+
+    @callback
+    def start(self) -> None:
+        """Connect in the background, retrying until the module is reached."""
+        self._task = self.hass.async_create_background_task(
+            self._async_start_background(), f"rinnaitouch transport {self.host}"
+        )
+
+    @callback
+    def stop(self) -> None:
+        """Close the connection and stop reconnecting."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._pending_handle is not None:
+            self._pending_handle.cancel()
+            self._pending_handle = None
+        self._pending_frame = None
+        self._close()
+        self._set_state(RinnaiConnectionState.IDLE)
+
+    @callback
+    def check_command(self) -> None:
+        """Raise if commands are rejected, the module stopped acknowledging them."""
+        if self.breaker.state == RinnaiCircuitState.OPEN:
+            self.stats.commands_rejected += 1
+            raise HomeAssistantError(
+                f"Rinnai module {self.host} is not acknowledging commands, "
+                f"try again in {self.breaker.retry_in():.0f}s"
+            )
+
+    @callback
+    def send_command(self, cmd: str) -> None:
+        """Queue a command, it is sent once the previous one was acknowledged."""
+        self._commands.put_nowait((cmd, time.monotonic() + COMMAND_DEADLINE))
+
+    @callback
+    def add_status_listener(
+        self, status_callback: Callable[[RinnaiSystemStatus], None]
+    ) -> None:
+        """Register a callback run with every parsed status frame."""
+        self._status_listeners.append(status_callback)
+
+    @callback
+    def add_frame_listener(self, frame_callback: Callable[[bytes], None]) -> CALLBACK_TYPE:
+        """Register a callback run with the raw JSON of every frame, return its remover."""
+        self._frame_listeners.append(frame_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if frame_callback in self._frame_listeners:
+                self._frame_listeners.remove(frame_callback)
+
+        return remove_listener
+
+    def register_socket_state_handler(
+        self, handler: Callable[[RinnaiConnectionState], None]
+    ) -> None:
+        """Run the handler with the current and every later connection state."""
+        if handler not in self._state_handlers:
+            handler(self.state)
+            self._state_handlers.append(handler)
+
+    def unregister_socket_state_handler(
+        self, handler: Callable[[RinnaiConnectionState], None]
+    ) -> None:
+        """Stop reporting connection states to the handler."""
+        if handler in self._state_handlers:
+            self._state_handlers.remove(handler)
+
+    async def _async_connect(self, timeout: float) -> None:
+        """Open the connection, the state reflects why it failed."""
+        self._set_state(RinnaiConnectionState.CONNECTING)
+        try:
+            async with asyncio.timeout(timeout):
+                self._reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+        except ConnectionRefusedError:
+            self._set_state(RinnaiConnectionState.REFUSED)
+            raise
+        except TimeoutError:
+            self._set_state(RinnaiConnectionState.TIMEOUT)
+            raise
+        except OSError:
+            self._set_state(RinnaiConnectionState.ERROR)
+            raise
+        self._buffer.clear()
+        self._sequence = 1
+        self._received_sequence = 0
+        self._set_state(RinnaiConnectionState.CONNECTED)
+        _LOGGER.debug("Connected to %s:%s", self.host, self.port)
+
+    async def _async_start_background(self) -> None:
+        """Connect, retrying with backoff, then run like a started transport."""
+        try:
+            await self._async_connect(CONNECT_TIMEOUT)
+        except (OSError, TimeoutError) as err:
+            _LOGGER.warning("Can't connect to %s yet, retrying: %s", self.host, err)
+            await self._async_reconnect()
+        await self._async_run()
+
+    async def _async_run(self) -> None:
+        """Exchange data with the module and reconnect whenever the connection is lost."""
+        while True:
+            await self._async_communicate()
+            self._close()
+            lost = time.monotonic()
+            await self._async_reconnect()
+            self.stats.reconnects += 1
+            _LOGGER.info(
+                "Reconnected to %s after %.0fs", self.host, time.monotonic() - lost
+            )
+
+    async def _async_reconnect(self) -> None:
+        """Retry connecting with exponential backoff until the module answers."""
+        attempt = 0
+        while True:
+            await asyncio.sleep(_backoff(attempt))
+            try:
+                await self._async_connect(CONNECT_TIMEOUT)
+                return
+            except (OSError, TimeoutError) as err:
+                attempt += 1
+                _LOGGER.debug(
+                    "Reconnecting to %s failed (attempt %d): %s",
+                    self.host,
+                    attempt,
+                    err,
+                )
+
+    async def _async_communicate(self) -> None:
+        """Read status frames and write commands until the connection is lost."""
+        writer_task = self.hass.async_create_background_task(
+            self._async_write_commands(), f"rinnaitouch commands {self.host}"
+        )
+        try:
+            await self._async_read_frames()
+        finally:
+            writer_task.cancel()
+
+    async def _async_read_frames(self) -> None:
+        assert self._reader is not None
+        while True:
+            try:
+                async with asyncio.timeout(NO_DATA_TIMEOUT):
+                    data = await self._reader.read(8192)
+            except TimeoutError:
+                _LOGGER.error(
+                    "Resetting connection as no data received for %s seconds",
+                    NO_DATA_TIMEOUT,
+                )
+                self._set_state(RinnaiConnectionState.TIMEOUT)
+                return
+            except OSError as err:
+                _LOGGER.error("Socket error on receive: %s. Reconnecting", err)
+                self._set_state(RinnaiConnectionState.ERROR)
+                return
+            if not data:
+                _LOGGER.info("Socket disconnected. Reconnecting")
+                self._set_state(RinnaiConnectionState.IDLE)
+                return
+            self.stats.bytes_in += len(data)
+            self._buffer.extend(data)
+            if not self._process_buffer():
+                self._set_state(RinnaiConnectionState.ERROR)
+                return
+
+    async def _async_write_commands(self) -> None:
+        writer = self._writer
+        assert writer is not None
+        loop = asyncio.get_running_loop()
+        # ask for the status right away rather than waiting for the next push
+        interval = 0.0
+        while True:
+            try:
+                async with asyncio.timeout(interval):
+                    command, deadline = await self._commands.get()
+            except TimeoutError:
+                command = IDLE_COMMAND
+            else:
+                if time.monotonic() > deadline:
+                    self.stats.commands_expired += 1
+                    _LOGGER.warning("Dropping command not sent in time: %s", command)
+                    continue
+            interval = IDLE_POLL_INTERVAL
+            self._sequence = max(self._sequence + 1, self._received_sequence + 1) % 255
+            self._ack = loop.create_future()
+            data = f"N{self._sequence:06d}{command}".encode()
+            writer.write(data)
+            self.stats.bytes_out += len(data)
+            sent = time.monotonic()
+            try:
+                await writer.drain()
+            except OSError as err:
+                _LOGGER.error("Socket error on send: %s. Reconnecting", err)
+                self._close()
+                return
+            try:
+                async with asyncio.timeout(COMMAND_TIMEOUT):
+                    await self._ack
+            except TimeoutError:
+                _LOGGER.debug("Command %d was not acknowledged", self._sequence)
+                if command != IDLE_COMMAND:
+                    self._command_failed()
+                continue
+            if command != IDLE_COMMAND:
+                # the module answers idle polls with its regular frame only
+                self.stats.latencies.append(time.monotonic() - sent)
+                if self.breaker.state != RinnaiCircuitState.CLOSED:
+                    _LOGGER.info("Module %s acknowledges commands again", self.host)
+                self.breaker.record_success()
+
+    def _command_failed(self) -> None:
+        """Count an unacknowledged command, drop the queued ones if the circuit opens."""
+        self.stats.commands_failed += 1
+        if not self.breaker.record_failure():
+            return
+        dropped = 0
+        while not self._commands.empty():
+            self._commands.get_nowait()
+            dropped += 1
+        _LOGGER.warning(
+            "Module %s did not acknowledge %d commands, rejecting commands for %ss "
+            "and dropping %d queued",
+            self.host,
+            self.breaker.failures,
+            self.breaker.cooldown,
+            dropped,
+        )
+
+    def _process_buffer(self) -> bool:
+        """Handle all complete messages in the buffer, False if it can't be parsed."""
+        while len(self._buffer) >= len(HELLO):
+            if self._buffer.startswith(HELLO):
+                _LOGGER.debug("Hello message received from %s", self.host)
+                del self._buffer[: len(HELLO)]
+            elif self._buffer.startswith(b"N"):
+                if (match := _FRAME.match(self._buffer)) is None:
+                    # partial frame, wait for the rest
+                    break
+                self._received_sequence = int(match.group(1))
+                self.stats.frame_received()
+                for frame_callback in list(self._frame_listeners):
+                    frame_callback(match.group(2))
+                if (
+                    self._ack is not None
+                    and not self._ack.done()
+                    and self._received_sequence >= self._sequence
+                ):
+                    self._ack.set_result(None)
+                self._post_frame(match.group(2))
+                del self._buffer[: match.end()]
+            elif (match := _SEQUENCE.search(self._buffer)) is not None:
+                _LOGGER.warning("Error parsing data, attempting recovery")
+                del self._buffer[: match.start()]
+            else:
+                _LOGGER.error("Unexpected data from %s, reconnecting", self.host)
+                self._buffer.clear()
+                return False
+        return True
+
+    def _post_frame(self, frame: bytes) -> None:
+        """Leave a frame in the mailbox, replacing one the loop didn't get to yet."""
+        if self._pending_frame is not None and b'"STM"' in frame:
+            # the time echo only amends the previous status, parse that first
+            self._handle_pending_frame()
+        if self._pending_frame is not None:
+            self.stats.frames_dropped += 1
+        else:
+            self._pending_since = time.monotonic()
+        self._pending_frame = frame
+        if self._pending_handle is None:
+            self._pending_handle = self.hass.loop.call_soon(self._handle_pending_frame)
+
+    @callback
+    def _handle_pending_frame(self) -> None:
+        """Parse the frame in the mailbox, the latest one received."""
+        self._pending_handle = None
+        frame, self._pending_frame = self._pending_frame, None
+        if frame is None:
+            return
+        self.stats.loop_lags.append(time.monotonic() - self._pending_since)
+        self.handle_frame(frame)
+
+    @callback
+    def handle_frame(self, frame: bytes) -> None:
+        """Parse the JSON of a status frame and pass it to the listeners.
+
+        Also used to replay captured frames without a connection.
+        """
+        try:
+            status_json = json.loads(frame)
+        except ValueError:
+            _LOGGER.error("Could not parse JSON data")
+            return
+        if (
+            isinstance(status_json, list)
+            and status_json
+            and "STM" in status_json[0].get("SYST", {})
+        ):
+            # the module only echoes the time while it is being set
+            status = copy.copy(self.status)
+            status.set_timesetting(True)
+        else:
+            status = RinnaiSystemStatus()
+            if not status.handle_status(status_json):
+                _LOGGER.error("JSON Error: %s", status_json)
+                return
+        self.handle_status(status)
+
+    @callback
+    def handle_status(self, status: RinnaiSystemStatus) -> None:
+        """Pass a parsed status to the listeners."""
+        self.status = status
+        self._first_status.set()
+        for status_callback in list(self._status_listeners):
+            status_callback(status)
+
+    def _close(self) -> None:
+        if self._ack is not None and not self._ack.done():
+            self._ack.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._reader = None
+
+    def _set_state(self, state: RinnaiConnectionState) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        _LOGGER.debug("Connection to %s is now %s", self.host, state)
+        for handler in list(self._state_handlers):
+            try:
+                handler(state)
+            except (ValueError, TypeError) as err:
+                _LOGGER.error("Invalid socket state handler (%s)", err)
+
+
+def _backoff(attempt: int) -> float:
+    """Return the delay before a reconnect attempt, exponential with jitter."""
+    delay = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RinnaiAsyncSystem(RinnaiSystem):
+    """RinnaiSystem receiving and sending through a RinnaiTransport.
+
+    Keeps the command methods and validation of the library, only the
+    connection and its poll thread are replaced. Registered as the library
+    instance for the address, so ``RinnaiSystem.get_instance`` returns it.
+    Status updates are run on the event loop.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, hass: HomeAssistant, ip_address: str, port: int = MODULE_PORT
+    ) -> None:
+        self._ip_address = ip_address
+        self._status = RinnaiSystemStatus()
+        self._on_updated = Event()
+        self.transport = RinnaiTransport(hass, ip_address, port)
+        self.transport.add_status_listener(self._status_received)
+        RinnaiSystem.instances[ip_address] = self
+
+    async def async_start(self, timeout: float = CONNECT_TIMEOUT) -> None:
+        """Connect to the module, raise if it can't be reached."""
+        await self.transport.async_start(timeout)
+
+    @callback
+    def start(self) -> None:
+        """Connect to the module in the background until it is reached."""
+        self.transport.start()
+
+    @callback
+    def _status_received(self, status: RinnaiSystemStatus) -> None:
+        self._status = status
+        self._on_updated()
+
+    def get_status(self) -> RinnaiSystemStatus:
+        """Return the latest status, the transport keeps it up to date."""
+        return self._status
+
+    def send_command(self, cmd: str) -> None:
+        """Send the command to the unit."""
+        self.transport.send_command(cmd)
+
+    def register_socket_state_handler(self, socket_handler) -> None:
+        """Register a socket state handler to receive updates."""
+        self.transport.register_socket_state_handler(socket_handler)
+
+    def unregister_socket_state_handler(self, socket_handler) -> None:
+        """Unregister a socket state handler."""
+        self.transport.unregister_socket_state_handler(socket_handler)
+
+    @callback
+    def shutdown(self, *args) -> None:  # pylint: disable=unused-argument
+        """Close the connection, also used as the Home Assistant stop listener."""
+        self.transport.stop()
@@ -0,0 +1,81 @@
+"""Tests for coalescing the commands sent to the controller."""
+
+import json
+
+from custom_components.rinnaitouch.command_queue import coalesce
+
+
+def _commands(*commands: dict) -> list[str]:
+    return [json.dumps(command) for command in commands]
+
+
+def _sent(batches: list[str]) -> list[dict]:
+    return [json.loads(batch) for batch in batches]
+
+
+def test_same_values_supersede():
+    """Only the latest of a burst writing the same values is sent."""
+    batches = coalesce(
+        _commands(
+            {"HGOM": {"GSO": {"SP": "20"}}},
+            {"HGOM": {"GSO": {"SP": "21"}}},
+            {"HGOM": {"GSO": {"SP": "22"}}},
+        )
+    )
+    assert _sent(batches) == [{"HGOM": {"GSO": {"SP": "22"}}}]
+
+
+def test_same_group_merged():
+    """Consecutive commands for the same group of a unit go out as one write."""
+    batches = coalesce(
+        _commands(
+            {"HGOM": {"ZAO": {"SP": "21"}}},
+            {"HGOM": {"ZAO": {"UE": "Y"}}},
+        )
+    )
+    assert _sent(batches) == [{"HGOM": {"ZAO": {"SP": "21", "UE": "Y"}}}]
+
+
+def test_other_groups_not_merged():
+    """Writes to different groups of the same unit are sent in order."""
+    commands = _commands(
+        {"HGOM": {"GSO": {"OP": "M"}}},
+        {"HGOM": {"ZAO": {"UE": "Y"}}},
+        {"HGOM": {"GSO": {"SP": "21"}}},
+    )
+    assert coalesce(commands) == commands
+
+
+def test_system_commands_keep_order():
+    """Mode commands are neither merged nor reordered around unit commands."""
+    commands = _commands(
+        {"CGOM": {"OOP": {"ST": "N"}}},
+        {"SYST": {"OSS": {"MD": "C"}}},
+        {"SYST": {"OSS": {"ST": "C"}}},
+        {"CGOM": {"GSO": {"SP": "24"}}},
+    )
+    assert coalesce(commands) == commands
+
+
+def test_state_switches_not_superseded():
+    """Off followed by fan only reaches the module as two writes."""
+    commands = _commands(
+        {"HGOM": {"OOP": {"ST": "F"}}},
+        {"HGOM": {"OOP": {"ST": "Z"}}},
+    )
+    assert coalesce(commands) == commands
+
+
+def test_state_switch_not_merged_with_settings():
+    """Switching a unit on and setting its temperature stay two writes."""
+    commands = _commands(
+        {"HGOM": {"OOP": {"ST": "N"}}},
+        {"HGOM": {"GSO": {"SP": "21"}}},
+    )
+    assert coalesce(commands) == commands
+
+
+def test_unparsable_command_sent_as_is():
+    """A command which is not JSON is passed on and ends any merging."""
+    batches = coalesce(["not json", json.dumps({"HGOM": {"GSO": {"SP": "21"}}})])
+    assert batches == ["not json", json.dumps({"HGOM": {"GSO": {"SP": "21"}}})]
@@ -0,0 +1,194 @@
+"""Benchmark frame ingestion and state writes of the integration.
+
+Sets the integration up in a bare Home Assistant instance for every zone
+configuration, with all six platforms, and hands canned status frames to
+the transport of the system as if they were received. For each
+configuration it reports:
+
+* CPU time per frame spent in the integration and Home Assistant
+* peak memory allocated per frame (tracemalloc, second pass) and memory retained
+  after the run
+* ``async_write_ha_state`` calls and actual state changes per frame
+
+The frames come from the controller emulator, a heating system warming
+up, so most frames change some temperatures and flags. Parsing the JSON
+is done up front and not part of the numbers.
+
+    python tools/benchmark.py --frames 2000 --zones 0 1 2 3 4 5
+
+Five zones are zones A to D and the common zone. Needs Home Assistant and
+pyrinnaitouch installed, does not open any connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant import config_entries, loader
+from homeassistant.const import CONF_HOST, CONF_NAME, EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    restore_state as rs,
+    translation,
+)
+
+from pyrinnaitouch import RinnaiSystemStatus
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position,import-error
+from rinnai_emulator import HEATER, EmulatedController  # noqa: E402
+from custom_components.rinnaitouch import async_get_connections  # noqa: E402
+from custom_components.rinnaitouch.const import DOMAIN  # noqa: E402
+from custom_components.rinnaitouch.transport import RinnaiAsyncSystem  # noqa: E402
+
+ADDRESS = "192.0.2.1"
+
+
+def canned_frames(zones: int, count: int) -> list[RinnaiSystemStatus]:
+    """Return parsed status frames of a heater warming up the zones."""
+    controller = EmulatedController((HEATER,), min(zones, 4), zones > 4)
+    controller.apply({HEATER: {"OOP": {"ST": "N"}, "GSO": {"SP": "30"}}})
+    frames = []
+    for index in range(count):
+        controller.tick(1.0)
+        if index % 200 == 199:
+            # let the rooms cool down again now and then
+            controller.temperatures = dict.fromkeys(controller.temperatures, 15.0)
+        status = RinnaiSystemStatus()
+        status.handle_status(controller.frame())
+        frames.append(status)
+    return frames
+
+
+async def async_create_hass(config_dir: str) -> HomeAssistant:
+    """Return a Home Assistant instance with just what config entries need."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    # the translation cache is set up with the core from 2024.3, before it
+    # was created on first use
+    if hasattr(translation, "async_setup"):
+        translation.async_setup(hass)
+    await asyncio.gather(
+        ar.async_load(hass), dr.async_load(hass), er.async_load(hass), rs.async_load(hass)
+    )
+    await hass.async_start()
+    return hass
+
+
+async def async_run(frames: list[RinnaiSystemStatus]) -> dict:
+    """Set up the integration with the zones of the first frame and replay the frames."""
+    # pylint: disable=too-many-locals
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        system = RinnaiAsyncSystem(hass, ADDRESS)
+        system.transport.handle_status(frames[0])
+        async_get_connections(hass).async_add(ADDRESS, system)
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Rinnai",
+            data={CONF_HOST: ADDRESS, CONF_NAME: "Rinnai"},
+            source=config_entries.SOURCE_USER,
+        )
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+
+        writes = 0
+        write_ha_state = entity.Entity.async_write_ha_state
+
+        def counting_write(self):
+            nonlocal writes
+            writes += 1
+            write_ha_state(self)
+
+        entity.Entity.async_write_ha_state = counting_write
+        state_changes = 0
+
+        def count_state_change(_event):
+            nonlocal state_changes
+            state_changes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_change)
+        try:
+            cpu_times = []
+            for status in frames:
+                start = time.process_time()
+                system.transport.handle_status(status)
+                await hass.async_block_till_done()
+                cpu_times.append(time.process_time() - start)
+            result = {
+                "entities": len(hass.states.async_all()),
+                "cpu_us": statistics.mean(cpu_times) * 1e6,
+                "cpu_p95_us": statistics.quantiles(cpu_times, n=20)[-1] * 1e6,
+                "writes": writes / len(frames),
+                "changes": state_changes / len(frames),
+            }
+
+            tracemalloc.start()
+            baseline = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            allocated = 0
+            for status in frames:
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                system.transport.handle_status(status)
+                await hass.async_block_till_done()
+                allocated += tracemalloc.get_traced_memory()[1] - before
+            retained = sum(
+                stat.size_diff
+                for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename")
+            )
+            tracemalloc.stop()
+            result["alloc_kib"] = allocated / len(frames) / 1024
+            result["retained_kib"] = retained / 1024
+        finally:
+            entity.Entity.async_write_ha_state = write_ha_state
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_stop(force=True)
+    return result
+
+
+def main() -> None:
+    """Run the benchmark for the requested zone configurations and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument(
+        "--zones", type=int, nargs="+", default=[0, 1, 2, 3, 4, 5], choices=range(6)
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(
+        f"{'zones':>5} {'entities':>8} {'cpu/frame':>10} {'p95':>10} "
+        f"{'alloc/frame':>12} {'retained':>10} {'writes/frame':>12} {'changes/frame':>13}"
+    )
+    for zones in args.zones:
+        frames = canned_frames(zones, args.frames)
+        result = asyncio.run(async_run(frames))
+        print(
+            f"{zones:>5} {result['entities']:>8} {result['cpu_us']:>8.0f}us "
+            f"{result['cpu_p95_us']:>8.0f}us {result['alloc_kib']:>9.1f}KiB "
+            f"{result['retained_kib']:>7.1f}KiB {result['writes']:>12.2f} "
+            f"{result['changes']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Reload the config entry over and over and check nothing is left behind.
+
+Sets the integration up in a bare Home Assistant instance against the
+controller emulator and reloads the entry ``--reloads`` times, like the
+reload button or an options change does. After every reload it counts
+
+* the callbacks registered with the coordinator, the transport and the
+  system, and the listeners on the Home Assistant event bus
+* the entity and system objects still alive after a garbage collection
+* the memory allocated (tracemalloc) compared to the first reload
+
+Callbacks and live objects may vary a little between reloads, one-shot
+bus listeners come and go, but must not be higher in the second half of
+the run than in the first, and the memory may only grow by
+``--max-growth`` KiB per reload, otherwise the exit status is 1.
+
+Home Assistant 2024.2 keeps every unloaded entity platform in
+``hass.data`` (reset, never destroyed), these are dropped before counting
+so only what the integration leaves behind is measured.
+
+    python tools/reload_stress.py --reloads 100 --zones 4 --common
+
+Needs Home Assistant and pyrinnaitouch installed, the emulator listens on
+port 27847 of localhost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_component import DATA_INSTANCES
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position,import-error
+from benchmark import async_create_hass  # noqa: E402
+from rinnai_emulator import HEATER, EmulatedController, RinnaiEmulator  # noqa: E402
+from custom_components.rinnaitouch import RinnaiData, RinnaiEntity  # noqa: E402
+from custom_components.rinnaitouch.const import DOMAIN  # noqa: E402
+from custom_components.rinnaitouch.transport import RinnaiAsyncSystem  # noqa: E402
+
+ADDRESS = "127.0.0.1"
+
+
+def drop_unloaded_platforms(hass: HomeAssistant) -> None:
+    """Forget the entity platforms Home Assistant keeps after unloading them."""
+    # pylint: disable=protected-access
+    loaded = [
+        platform
+        for component in hass.data[DATA_INSTANCES].values()
+        for platform in component._platforms.values()
+    ]
+    platforms = hass.data[DATA_ENTITY_PLATFORM][DOMAIN]
+    platforms[:] = [platform for platform in platforms if platform in loaded]
+
+
+def count_callbacks(hass: HomeAssistant, entry: config_entries.ConfigEntry) -> dict:
+    """Return the number of callbacks and live objects of the entry."""
+    # pylint: disable=protected-access
+    data: RinnaiData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
+    transport = data.system.transport
+    gc.collect()
+    objects = gc.get_objects()
+    return {
+        "coordinator listeners": len(coordinator._listeners),
+        "ready listeners": len(coordinator._ready_listeners),
+        "status listeners": len(transport._status_listeners),
+        "frame listeners": len(transport._frame_listeners),
+        "state handlers": len(transport._state_handlers),
+        "update handlers": len(data.system._on_updated._Event__eventhandlers),
+        "bus listeners": sum(hass.bus.async_listeners().values()),
+        "live entities": sum(isinstance(obj, RinnaiEntity) for obj in objects),
+        "live systems": sum(isinstance(obj, RinnaiAsyncSystem) for obj in objects),
+        "states": len(hass.states.async_all()),
+    }
+
+
+async def async_run(controller: EmulatedController, reloads: int) -> list[dict]:
+    """Set the entry up, reload it and return the counts after every reload."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with RinnaiEmulator(controller, ADDRESS, interval=1.0):
+            hass = await async_create_hass(config_dir)
+            entry = config_entries.ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title="Rinnai",
+                data={CONF_HOST: ADDRESS, CONF_NAME: "Rinnai"},
+                source=config_entries.SOURCE_USER,
+            )
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+            if entry.state is not config_entries.ConfigEntryState.LOADED:
+                raise RuntimeError(f"Entry not set up: {entry.state}")
+            counts = []
+            try:
+                for index in range(reloads):
+                    if index == 1:
+                        # the first setup loads platforms and fills caches
+                        tracemalloc.start()
+                    await hass.config_entries.async_reload(entry.entry_id)
+                    await hass.async_block_till_done()
+                    if entry.state is not config_entries.ConfigEntryState.LOADED:
+                        raise RuntimeError(f"Reload {index + 1} failed: {entry.state}")
+                    drop_unloaded_platforms(hass)
+                    count = count_callbacks(hass, entry)
+                    count["memory"] = (
+                        tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+                    )
+                    counts.append(count)
+            finally:
+                tracemalloc.stop()
+                await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_stop(force=True)
+    return counts
+
+
+def main() -> None:
+    """Run the reloads, print the counts and exit with 1 if anything leaked."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--reloads", type=int, default=100)
+    parser.add_argument("--zones", type=int, default=2, choices=range(5))
+    parser.add_argument("--common", action="store_true", help="add the common zone")
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=4.0,
+        help="memory growth in KiB per reload still considered flat",
+    )
+    args = parser.parse_args()
+    if args.reloads < 3:
+        parser.error("needs at least 3 reloads")
+    logging.basicConfig(level=logging.ERROR)
+
+    controller = EmulatedController((HEATER,), args.zones, args.common)
+    counts = asyncio.run(async_run(controller, args.reloads))
+
+    first, last = counts[1], counts[-1]
+    half = len(counts) // 2
+    failed = False
+    for name in first:
+        if name == "memory":
+            continue
+        print(f"{name:>22}: {first[name]:>6} -> {last[name]:>6}")
+        before = max(count[name] for count in counts[:half])
+        after = min(count[name] for count in counts[half:])
+        if after > before:
+            print(f"{'':>22}  grew from at most {before} to at least {after}")
+            failed = True
+    growth = (last["memory"] - first["memory"]) / 1024 / (len(counts) - 2)
+    print(
+        f"{'memory':>22}: {first['memory'] / 1024:>6.0f} -> {last['memory'] / 1024:>6.0f}KiB, "
+        f"{growth:.1f}KiB per reload"
+    )
+    if growth > args.max_growth:
+        failed = True
+    print(f"{len(counts)} reloads, {'LEAKING' if failed else 'no leaks'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Replay a frame capture through the integration.
+
+Captures are recorded with the ``rinnaitouch.rinnai_capture_frames``
+service. The integration is set up in a bare Home Assistant instance and
+every captured frame is handed to the transport as if it was received,
+keeping the recorded timing scaled by ``--speed`` (0 replays as fast as
+possible). Entities are created for the zones of the first frame.
+
+    python tools/replay.py rinnaitouch_192_168_1_20_20240501_100000.log.gz --speed 0 --profile
+
+With ``--profile`` the replay runs under cProfile and the functions with the
+most cumulative time are printed, ``--profile-output`` keeps the stats for
+snakeviz or pstats. Needs Home Assistant and pyrinnaitouch installed, does
+not open any connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import time
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_NAME
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position,import-error
+from benchmark import async_create_hass  # noqa: E402
+from custom_components.rinnaitouch import async_get_connections  # noqa: E402
+from custom_components.rinnaitouch.capture import read_capture  # noqa: E402
+from custom_components.rinnaitouch.const import DOMAIN  # noqa: E402
+from custom_components.rinnaitouch.transport import RinnaiAsyncSystem  # noqa: E402
+
+ADDRESS = "192.0.2.1"
+
+
+async def async_replay(
+    frames: list[tuple[float, bytes]], speed: float, profiler: cProfile.Profile | None
+) -> dict:
+    """Set the integration up and feed it the frames, return timing figures."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        system = RinnaiAsyncSystem(hass, ADDRESS)
+        system.transport.handle_frame(frames[0][1])
+        async_get_connections(hass).async_add(ADDRESS, system)
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Rinnai",
+            data={CONF_HOST: ADDRESS, CONF_NAME: "Rinnai"},
+            source=config_entries.SOURCE_USER,
+        )
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        try:
+            start = time.monotonic()
+            cpu_start = time.process_time()
+            if profiler is not None:
+                profiler.enable()
+            for offset, frame in frames:
+                if speed > 0 and (delay := start + offset / speed - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+                system.transport.handle_frame(frame)
+                await hass.async_block_till_done()
+            if profiler is not None:
+                profiler.disable()
+            result = {
+                "entities": len(hass.states.async_all()),
+                "wall_s": time.monotonic() - start,
+                "cpu_us": (time.process_time() - cpu_start) / len(frames) * 1e6,
+            }
+        finally:
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_stop(force=True)
+    return result
+
+
+def main() -> None:
+    """Replay a capture file and print the figures, and the profile if asked for."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("capture", help="capture file written by rinnai_capture_frames")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed, 0 for as fast as possible"
+    )
+    parser.add_argument("--profile", action="store_true", help="run under cProfile")
+    parser.add_argument("--profile-output", help="write the profile stats to this file")
+    parser.add_argument("--top", type=int, default=30, help="profile entries to print")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    frames = list(read_capture(args.capture))
+    if not frames:
+        parser.error(f"no frames in {args.capture}")
+    profiler = cProfile.Profile() if args.profile or args.profile_output else None
+    result = asyncio.run(async_replay(frames, args.speed, profiler))
+    print(
+        f"{len(frames)} frames over {frames[-1][0]:.0f}s replayed in "
+        f"{result['wall_s']:.1f}s, {result['entities']} entities, "
+        f"{result['cpu_us']:.0f}us cpu per frame"
+    )
+    if profiler is not None:
+        if args.profile_output:
+            profiler.dump_stats(args.profile_output)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
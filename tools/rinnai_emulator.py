@@ -0,0 +1,424 @@
+"""Local stand-in for the Rinnai/Brivis Touch WiFi module (NC-6/NC-7).
+
+Serves the module's TCP protocol on localhost so the integration can be
+measured without a controller:
+
+* ``*HELLO*`` on connect, then status frames ``N<seq>[{SYST}, {unit}]``
+  every ``interval`` seconds
+* commands ``N<seq>{json}`` are applied to the emulated state and answered
+  right away with a frame carrying the command's sequence number, idle
+  polls ``N<seq>NA`` are answered the same way
+* the ``Rinnai_NBW2_Module`` UDP broadcast the library waits for before
+  connecting is sent to ``host`` so discovery works over loopback
+
+The library always connects to port 27847 of the configured address, point
+``RinnaiSystem.get_instance("127.0.0.1")`` at a running emulator.
+
+Run standalone with ``python tools/rinnai_emulator.py --units heater,cooler
+--zones 2 --common``, or use ``RinnaiEmulator`` from scripts as an async
+context manager.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterable
+import copy
+import json
+import logging
+import re
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+MODULE_PORT = 27847
+BROADCAST_PORT = 50000
+BROADCAST_MESSAGE = b"Rinnai_NBW2_Module"
+HELLO = b"*HELLO*"
+
+HEATER = "HGOM"
+COOLER = "CGOM"
+EVAP = "ECOM"
+UNITS = {"heater": HEATER, "cooler": COOLER, "evap": EVAP}
+MODES = {HEATER: "H", COOLER: "C", EVAP: "E"}
+
+MAIN_ZONES = "ABCD"
+COMMON_ZONE = "U"
+AMBIENT = 18.0
+
+_COMMAND = re.compile(rb"N(\d{6})")
+
+
+class EmulatedController:
+    """Status of an emulated system, kept in the JSON layout of the module.
+
+    Commands are deep merged into the layout the same way the module stores
+    written values, ``tick`` advances the simulated room temperatures and
+    the derived status flags.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        units: Iterable[str] = (HEATER,),
+        zones: int = 2,
+        common_zone: bool = False,
+        multi_set_point: bool = False,
+    ) -> None:
+        self.units = tuple(units)
+        if not self.units or any(unit not in MODES for unit in self.units):
+            raise ValueError(f"Units must be a combination of {list(MODES)}")
+        if not 0 <= zones <= len(MAIN_ZONES):
+            raise ValueError("Between 0 and 4 zones are supported")
+        self.zones = tuple(MAIN_ZONES[:zones]) + ((COMMON_ZONE,) if common_zone else ())
+        self.multi_set_point = multi_set_point
+        self.temperatures = {zone: 21.5 - index for index, zone in enumerate(self.zones)}
+        self.system = {
+            "CFG": {
+                "TU": "C",
+                "MTSP": "Y" if multi_set_point else "N",
+                "ZA": "Living    ",
+                "ZB": "Bedrooms  ",
+                "ZC": "Kitchen   ",
+                "ZD": "Study     ",
+                "VR": "0259",
+                "CV": "0012",
+            },
+            "AVM": {
+                "HG": "Y" if HEATER in self.units else "N",
+                "EC": "Y" if EVAP in self.units else "N",
+                "CG": "Y" if COOLER in self.units else "N",
+                "RA": "N",
+                "RH": "N",
+                "RC": "N",
+            },
+            "OSS": {"MD": MODES[self.units[0]], "ST": "N", "DY": "MON", "TM": "12:00"},
+            "FLT": {"AV": "N", "GP": "N", "UT": "N", "TP": "N"},
+        }
+        self.unit_status = {unit: self._initial_unit(unit) for unit in self.units}
+
+    def _initial_unit(self, unit: str) -> dict:
+        """Return the status of a unit which is switched off."""
+        config = {f"Z{zone}IS": "Y" if zone in self.zones else "N" for zone in "ABCDU"}
+        if unit == EVAP:
+            return {
+                "CFG": config,
+                "GSO": {"SW": "F", "OP": "M", "FS": "N", "FL": "08", "PS": "N", "SP": "19"}
+                | {f"Z{zone}UE": "Y" for zone in self.zones},
+                "GSS": {"PW": "N", "BY": "N", "PO": "N", "FO": "N"}
+                | {f"Z{zone}AE": "N" for zone in self.zones},
+            }
+        status = {
+            "CFG": config,
+            "OOP": {"ST": "F", "FL": "08"},
+            "GSO": {"OP": "M", "SP": "22", "AO": "N"},
+            "GSS": {"HC": "N", "CC": "N", "GV": "N", "CP": "N", "FS": "N", "PH": "N",
+                    "AT": "W", "AZ": "N"},
+        }
+        for zone in self.zones:
+            status[f"Z{zone}O"] = {"UE": "Y", "SP": "21", "OP": "M", "AO": "N"}
+            status[f"Z{zone}S"] = {"AE": "N", "MT": "999", "FS": "N", "GV": "N",
+                                   "CP": "N", "PH": "N", "AT": "W", "AZ": "N"}
+        return status
+
+    @property
+    def active_unit(self) -> str:
+        """Return the id of the unit selected by the system mode."""
+        mode = self.system["OSS"]["MD"]
+        for unit, unit_mode in MODES.items():
+            if unit_mode == mode and unit in self.unit_status:
+                return unit
+        return self.units[0]
+
+    def apply(self, command: dict) -> None:
+        """Store the values written by a command."""
+        for group, values in command.items():
+            if group == "SYST":
+                if values.get("STM", {}).get("SV") == "Y":
+                    self.system.pop("STM", None)
+                    continue
+                _merge(self.system, values)
+            elif group in self.unit_status:
+                _merge(self.unit_status[group], values)
+            else:
+                _LOGGER.warning("Ignoring command for missing unit %s", group)
+        self.tick(0)
+
+    def tick(self, seconds: float) -> None:
+        """Move the room temperatures and update the flags derived from them."""
+        unit = self.active_unit
+        status = self.unit_status[unit]
+        if unit == EVAP:
+            running = status["GSO"]["SW"] == "N"
+            status["GSS"]["FO"] = "Y" if running else "N"
+            status["GSS"]["PO"] = "Y" if running and status["GSO"]["PS"] == "N" else "N"
+            self._drift(seconds, {zone: 17.0 if running else AMBIENT for zone in self.zones})
+            return
+        running = status["OOP"]["ST"] == "N"
+        heating = unit == HEATER
+        targets = {}
+        for zone in self.zones:
+            zone_on = (
+                int(status[f"Z{zone}O"]["SP"]) > 7
+                if self.multi_set_point
+                else status[f"Z{zone}O"]["UE"] == "Y"
+            )
+            set_point = int(
+                status[f"Z{zone}O"]["SP"] if self.multi_set_point else status["GSO"]["SP"]
+            )
+            calling = running and zone_on and (
+                self.temperatures[zone] < set_point
+                if heating
+                else self.temperatures[zone] > set_point
+            )
+            targets[zone] = set_point if calling else AMBIENT
+            zone_status = status[f"Z{zone}S"]
+            zone_status["AE"] = "Y" if calling else "N"
+            zone_status["FS"] = "Y" if calling or status["OOP"]["ST"] == "Z" else "N"
+            zone_status["GV" if heating else "CP"] = "Y" if calling else "N"
+        calling = any(status[f"Z{zone}S"]["AE"] == "Y" for zone in self.zones) or (
+            running and not self.zones
+        )
+        gss = status["GSS"]
+        gss["HC" if heating else "CC"] = "Y" if calling else "N"
+        gss["GV" if heating else "CP"] = "Y" if calling else "N"
+        gss["FS"] = "Y" if calling or status["OOP"]["ST"] == "Z" else "N"
+        self._drift(seconds, targets)
+
+    def _drift(self, seconds: float, targets: dict[str, float]) -> None:
+        """Move every zone temperature 0.1 degrees per second towards its target."""
+        for zone, target in targets.items():
+            step = min(abs(target - self.temperatures[zone]), 0.1 * seconds)
+            if target < self.temperatures[zone]:
+                step = -step
+            self.temperatures[zone] = round(self.temperatures[zone] + step, 1)
+            if (zone_status := self.unit_status[self.active_unit].get(f"Z{zone}S")) is not None:
+                zone_status["MT"] = str(int(self.temperatures[zone] * 10))
+
+    def frame(self) -> list[dict]:
+        """Return the status as sent by the module."""
+        unit = self.active_unit
+        return [
+            {"SYST": copy.deepcopy(self.system)},
+            {unit: copy.deepcopy(self.unit_status[unit])},
+        ]
+
+
+class RinnaiEmulator:
+    """TCP server speaking the module protocol for one emulated controller.
+
+    ``on_frame`` is called with the sequence number and the send time
+    (``time.monotonic``) of every frame and ``on_command`` with the
+    sequence number, the command and its receive time, benchmarks use
+    them to measure frame to state latency and command round trips.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(
+        self,
+        controller: EmulatedController | None = None,
+        host: str = "127.0.0.1",
+        port: int = MODULE_PORT,
+        interval: float = 1.0,
+        response_delay: float = 0.0,
+        *,
+        broadcast: bool = True,
+        on_frame: Callable[[int, float], None] | None = None,
+        on_command: Callable[[int, Any, float], None] | None = None,
+    ) -> None:
+        self.controller = controller or EmulatedController()
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.response_delay = response_delay
+        self.broadcast = broadcast
+        self.on_frame = on_frame
+        self.on_command = on_command
+        self.frames_sent = 0
+        self.commands_received = 0
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def __aenter__(self) -> RinnaiEmulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Listen for connections and start the broadcasts."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.broadcast:
+            self._create_task(self._broadcast())
+        _LOGGER.info("Emulating a Rinnai module on %s:%s", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Close all connections and stop serving."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    def drop_connections(self) -> None:
+        """Close the open connections, the client is expected to reconnect."""
+        for writer in list(self._writers):
+            writer.close()
+
+    def _create_task(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _broadcast(self) -> None:
+        """Announce the module the way it does on the local network."""
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, local_addr=(self.host, 0)
+        )
+        try:
+            while True:
+                transport.sendto(BROADCAST_MESSAGE, (self.host, BROADCAST_PORT))
+                await asyncio.sleep(1)
+        finally:
+            transport.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection until it closes."""
+        self._writers.add(writer)
+        state = {"sequence": 0}
+        writer.write(HELLO)
+        self._create_task(self._push_frames(writer, state))
+        buffer = b""
+        try:
+            while data := await reader.read(8192):
+                buffer += data
+                buffer = await self._handle_commands(buffer, writer, state)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle_commands(
+        self, buffer: bytes, writer: asyncio.StreamWriter, state: dict
+    ) -> bytes:
+        """Apply and answer the complete commands in the buffer, return the rest."""
+        decoder = json.JSONDecoder()
+        while match := _COMMAND.match(buffer):
+            rest = buffer[match.end() :]
+            if rest.startswith(b"NA"):
+                command, buffer = None, rest[2:]
+            else:
+                text = rest.decode(errors="replace")
+                try:
+                    command, end = decoder.raw_decode(text)
+                except ValueError:
+                    # incomplete command, wait for more data
+                    break
+                buffer = text[end:].encode()
+            sequence = int(match.group(1))
+            state["sequence"] = sequence
+            if command is not None:
+                self.commands_received += 1
+                if self.on_command is not None:
+                    self.on_command(sequence, command, time.monotonic())
+                self.controller.apply(command)
+            if self.response_delay:
+                await asyncio.sleep(self.response_delay)
+            self._send_frame(writer, sequence)
+        if buffer and not buffer.startswith(b"N"):
+            _LOGGER.warning("Discarding unparsable data: %s", buffer)
+            buffer = b""
+        return buffer
+
+    async def _push_frames(self, writer: asyncio.StreamWriter, state: dict) -> None:
+        """Send the status every interval like the module does."""
+        last = time.monotonic()
+        while not writer.is_closing():
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.controller.tick(now - last)
+            last = now
+            self._send_frame(writer, state["sequence"])
+
+    def _send_frame(self, writer: asyncio.StreamWriter, sequence: int) -> None:
+        if writer.is_closing():
+            return
+        payload = json.dumps(self.controller.frame(), separators=(",", ":"))
+        writer.write(f"N{sequence:06d}{payload}".encode())
+        self.frames_sent += 1
+        if self.on_frame is not None:
+            self.on_frame(sequence, time.monotonic())
+
+
+def _merge(target: dict, values: dict) -> None:
+    """Deep merge written values into the stored status."""
+    for key, value in values.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def main() -> None:
+    """Run the emulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=MODULE_PORT)
+    parser.add_argument(
+        "--units",
+        default="heater",
+        help="comma separated units installed: heater, cooler, evap",
+    )
+    parser.add_argument("--zones", type=int, default=2, help="number of zones, 0 to 4")
+    parser.add_argument("--common", action="store_true", help="add the common zone")
+    parser.add_argument("--multi-set-point", action="store_true")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between frames")
+    parser.add_argument(
+        "--response-delay", type=float, default=0.0, help="seconds before answering a command"
+    )
+    parser.add_argument("--no-broadcast", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    controller = EmulatedController(
+        [UNITS[unit.strip()] for unit in args.units.split(",")],
+        args.zones,
+        args.common,
+        args.multi_set_point,
+    )
+
+    async def serve() -> None:
+        async with RinnaiEmulator(
+            controller,
+            args.host,
+            args.port,
+            args.interval,
+            args.response_delay,
+            broadcast=not args.no_broadcast,
+        ):
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()